@@ -0,0 +1,126 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measure the time of loading xrally_docker plugins.
+
+xrally_docker is loaded at every invocation of rally CLI, so plugin modules
+should not import heavy dependencies (the docker SDK and its transports) at
+import time. They are imported only when a client is actually built.
+
+The script compares the time of importing the base Rally modules with the
+time of importing them together with all modules of xrally_docker, each in
+a fresh interpreter, and fails if any of the heavy modules is imported by
+xrally_docker. Some of them may be imported by Rally itself (e.g. requests
+by old jsonschema), such modules are not reported.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+
+HEAVY_MODULES = ("docker", "requests", "urllib3", "websocket", "paramiko")
+
+RALLY_MODULES = ("rally.common.broker", "rally.env.platform",
+                 "rally.task.atomic", "rally.task.context",
+                 "rally.task.scenario", "rally.task.service",
+                 "rally.task.validation")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))
+
+SCRIPT = """
+import json
+import sys
+import time
+
+started_at = time.time()
+for name in %(rally)r:
+    __import__(name)
+
+if %(plugins)r:
+    from rally.common import cfg
+    from xrally_docker.common import opts
+
+    for group, group_opts in opts.list_opts().items():
+        cfg.CONF.register_opts(group_opts, group=group)
+    for name in %(plugins)r:
+        __import__(name)
+
+print(json.dumps({
+    "duration": time.time() - started_at,
+    "heavy": sorted(m for m in %(heavy)r if m in sys.modules)}))
+"""
+
+
+def list_plugin_modules():
+    modules = []
+    package_path = os.path.join(ROOT, "xrally_docker")
+    for path, dirs, files in os.walk(package_path):
+        dirs.sort()
+        for name in sorted(files):
+            if not name.endswith(".py"):
+                continue
+            module = os.path.relpath(os.path.join(path, name[:-3]), ROOT)
+            module = module.replace(os.sep, ".")
+            if module.endswith(".__init__"):
+                module = module[:-len(".__init__")]
+            modules.append(module)
+    return modules
+
+
+def measure(plugins):
+    script = SCRIPT % {"rally": RALLY_MODULES, "plugins": plugins,
+                       "heavy": HEAVY_MODULES}
+    output = subprocess.check_output([sys.executable, "-c", script],
+                                     cwd=ROOT)
+    return json.loads(output.decode("utf-8").strip().splitlines()[-1])
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def main(args):
+    parser = argparse.ArgumentParser(args[0])
+    parser.add_argument("--runs", metavar="<number>", type=int, default=5,
+                        help="A number of measurements. Defaults to 5")
+    args = parser.parse_args(args[1:])
+
+    plugins = list_plugin_modules()
+    base, full, heavy = [], [], set()
+    for i in range(args.runs):
+        base_result = measure([])
+        base.append(base_result["duration"])
+        result = measure(plugins)
+        full.append(result["duration"])
+        heavy.update(set(result["heavy"]) - set(base_result["heavy"]))
+
+    base, full = median(base), median(full)
+    print("Rally modules:               %.3f s" % base)
+    print("Rally and xrally_docker:     %.3f s" % full)
+    print("xrally_docker overhead:      %.3f s (%s modules)"
+          % (full - base, len(plugins)))
+    if heavy:
+        print("Heavy modules are imported at load of plugins: %s"
+              % ", ".join(sorted(heavy)))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
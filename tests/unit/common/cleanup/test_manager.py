@@ -42,6 +42,22 @@ class SeekAndDestroyTestCase(test.TestCase):
         # NOTE(boris-42): No logs and no exceptions means no bugs!
         self.assertEqual(0, mock_log.call_count)
 
+    @mock.patch("%s.LOG" % BASE)
+    def test__delete_single_resource_names(self, mock_log):
+        for names, expected in ((["foo", "bar"], "foo; bar"),
+                                ("foo:bar", "foo:bar")):
+            mock_log.reset_mock()
+            mock_resource = mock.MagicMock(_max_attempts=1, _timeout=10,
+                                           _interval=0, _name="image")
+            mock_resource.name.return_value = names
+            mock_resource.id.return_value = "foo-id"
+
+            manager.SeekAndDestroy(None, None)._delete_single_resource(
+                mock_resource)
+
+            mock_log.debug.assert_called_once_with(
+                "Deleting docker.image object %s (foo-id)" % expected)
+
     @mock.patch("%s.LOG" % BASE)
     def test__delete_single_resource_timeout(self, mock_log):
 
@@ -87,6 +103,20 @@ class SeekAndDestroyTestCase(test.TestCase):
                          mock_mgr.list.call_args_list)
         self.assertEqual(queue, [1, 2, 3])
 
+    def test__publisher_with_raw_resources(self):
+        mock_mgr = mock.MagicMock()
+        client = mock.MagicMock()
+        publish = manager.SeekAndDestroy(
+            mock_mgr, client, raw_resources=["a", "b"])._publisher
+
+        queue = []
+        publish(queue)
+
+        self.assertFalse(mock_mgr.list.called)
+        self.assertEqual([mock.call("a", client), mock.call("b", client)],
+                         mock_mgr.call_args_list)
+        self.assertEqual([mock_mgr.return_value] * 2, queue)
+
     @mock.patch("rally.common.utils.name_matches_object")
     @mock.patch("%s.SeekAndDestroy._delete_single_resource" % BASE)
     def test__consumer(self, mock__delete_single_resource,
@@ -169,10 +199,35 @@ class ManagerHelpersTestCase(test.TestCase):
         mock_seek_and_destroy.assert_has_calls([
             mock.call(mock_find_resource_managers.return_value[0],
                       mock_docker.return_value,
-                      resource_classes=[A], owner_id="task_id"),
+                      resource_classes=[A], owner_id="task_id",
+                      raw_resources=None),
             mock.call().exterminate(),
             mock.call(mock_find_resource_managers.return_value[1],
                       mock_docker.return_value,
-                      resource_classes=[A], owner_id="task_id"),
+                      resource_classes=[A], owner_id="task_id",
+                      raw_resources=None),
             mock.call().exterminate()
         ])
+
+    @mock.patch("%s.service.Docker" % BASE)
+    @mock.patch("%s.SeekAndDestroy" % BASE)
+    @mock.patch("%s.find_resource_managers" % BASE)
+    def test_cleanup_multiple_hosts(self, mock_find_resource_managers,
+                                    mock_seek_and_destroy, mock_docker):
+        network_mgr = mock.MagicMock(_name="network")
+        image_mgr = mock.MagicMock(_name="image")
+        mock_find_resource_managers.return_value = [network_mgr, image_mgr]
+        hosts = [{"host": "tcp://a"}, {"host": "tcp://b"}]
+
+        manager.cleanup(names=["network", "image"],
+                        spec={"host": "tcp://a", "hosts": hosts},
+                        owner_id="task_id",
+                        raw_resources={"network": ["net"]})
+
+        self.assertEqual([mock.call(h) for h in hosts],
+                         mock_docker.call_args_list)
+        # known resources are created at the first host only
+        self.assertEqual(
+            [(network_mgr, ["net"]), (image_mgr, None), (image_mgr, None)],
+            [(c[0][0], c[1]["raw_resources"])
+             for c in mock_seek_and_destroy.call_args_list])
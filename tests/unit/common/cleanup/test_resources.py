@@ -66,9 +66,47 @@ class ResourceManagerTestCase(test.TestCase):
         client.delete_foo.assert_called_once_with("foo")
 
 
-class ImageTestCase(object):
+class ImageTestCase(test.TestCase):
+    def test_list(self):
+        client = mock.MagicMock()
+        client.list_images.return_value = [
+            {"Id": "foo", "RepoTags": ["foo:bar", "localhost:5000/xxx:yyy"]},
+            {"Id": "bar", "RepoTags": []}]
+
+        self.assertEqual(
+            ["foo:bar", "localhost:5000/xxx:yyy"],
+            [r.raw_resource for r in resources.Image.list(client)])
+        client.list_images.assert_called_once_with(summary=True)
+
+    def test_attributes(self):
+        res = resources.Image("localhost:5000/xxx:yyy", None)
+        self.assertEqual("yyy", res.name())
+        self.assertEqual("localhost:5000/xxx:yyy", res.id())
+
+
+class ContainerTestCase(test.TestCase):
     def test_name(self):
-        res = {"RepoTags": ["foo:bar", "xxx:yyy"]}
+        res = {"Name": "/foo"}
+        self.assertEqual("foo", resources.Container(res, None).name())
+
+
+class VolumeTestCase(test.TestCase):
+    def test_list(self):
+        client = mock.MagicMock()
+        client.list_volumes.return_value = [{"Name": "foo"}]
+
         self.assertEqual(
-            ["bar", "yyy"],
-            resources.Image(res, None).name())
+            [{"Name": "foo"}],
+            [r.raw_resource for r in resources.Volume.list(client)])
+        client.list_volumes.assert_called_once_with(
+            filters={"label": "org.xrally.owner"})
+
+    def test_attributes(self):
+        res = resources.Volume(
+            {"Name": "foo", "Labels": {"org.xrally.owner": "rally-xxx"}},
+            None)
+        self.assertEqual("foo", res.id())
+        self.assertEqual("rally-xxx", res.name())
+
+        res = resources.Volume({"Name": "foo", "Labels": None}, None)
+        self.assertEqual("", res.name())
@@ -0,0 +1,52 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import shutil
+import tempfile
+
+from tests.unit import test
+from xrally_docker.common import build_context
+
+
+class GenerateTestCase(test.TestCase):
+
+    def setUp(self):
+        super(GenerateTestCase, self).setUp()
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+
+    def test_generate(self):
+        build_context.generate(self.path, layers_count=2, layer_size=10)
+
+        with open(os.path.join(self.path, "Dockerfile")) as f:
+            self.assertEqual("FROM scratch\nCOPY layer-0 /layer-0\n"
+                             "COPY layer-1 /layer-1\n", f.read())
+        for name in ("layer-0", "layer-1"):
+            self.assertEqual(
+                10, os.path.getsize(os.path.join(self.path, name)))
+
+    def test_generate_with_several_files_per_layer(self):
+        build_context.generate(self.path, layers_count=1, layer_size=10,
+                               files_per_layer=3, compressibility=0.5)
+
+        layer_path = os.path.join(self.path, "layer-0")
+        self.assertEqual(["file-0", "file-1", "file-2"],
+                         sorted(os.listdir(layer_path)))
+        self.assertEqual(
+            [3, 3, 4],
+            [os.path.getsize(os.path.join(layer_path, "file-%s" % i))
+             for i in range(3)])
+        with open(os.path.join(layer_path, "file-2"), "rb") as f:
+            self.assertEqual(b"\0\0", f.read()[2:])
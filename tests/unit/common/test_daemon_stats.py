@@ -0,0 +1,184 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import os
+import shutil
+import tempfile
+
+import mock
+
+from tests.unit import test
+from xrally_docker.common import daemon_stats
+
+
+class DaemonStatsTestCase(test.TestCase):
+
+    def setUp(self):
+        super(DaemonStatsTestCase, self).setUp()
+        self.proc = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.proc)
+        mock.patch.object(daemon_stats, "PROC_PATH", self.proc).start()
+        mock.patch.object(daemon_stats, "_READ_SAMPLES", {}).start()
+
+    def _make_process(self, pid, comm, utime=0, stime=0, rss=0, fds=0):
+        path = os.path.join(self.proc, str(pid))
+        os.makedirs(os.path.join(path, "fd"))
+        with open(os.path.join(path, "comm"), "w") as f:
+            f.write("%s\n" % comm)
+        with open(os.path.join(path, "stat"), "w") as f:
+            f.write("%s (%s x) S %s %s %s\n"
+                    % (pid, comm, " ".join(["0"] * 10), utime, stime))
+        with open(os.path.join(path, "status"), "w") as f:
+            f.write("Name:\t%s\nVmRSS:\t%s kB\n" % (comm, rss))
+        for i in range(fds):
+            open(os.path.join(path, "fd", str(i)), "w").close()
+
+    def test_is_local(self):
+        self.assertTrue(daemon_stats.is_local({}))
+        self.assertTrue(daemon_stats.is_local(
+            {"host": "unix:///var/run/docker.sock"}))
+        self.assertFalse(daemon_stats.is_local(
+            {"host": "tcp://example.com:2376"}))
+
+    def test_get_memory_usage(self):
+        with open(os.path.join(self.proc, "meminfo"), "w") as f:
+            f.write("MemTotal:        4096 kB\nMemFree:         1024 kB\n"
+                    "MemAvailable:    3072 kB\nBuffers:          512 kB\n")
+
+        self.assertEqual((1048576, 4194304), daemon_stats.get_memory_usage())
+
+        with open(os.path.join(self.proc, "meminfo"), "w") as f:
+            f.write("MemTotal:        4096 kB\nMemFree:         1024 kB\n")
+
+        self.assertEqual((3145728, 4194304), daemon_stats.get_memory_usage())
+
+    def test_find_processes(self):
+        self._make_process(1, "init")
+        self._make_process(10, "dockerd")
+        self._make_process(11, "containerd")
+        os.makedirs(os.path.join(self.proc, "self"))
+
+        self.assertEqual(
+            {"dockerd": [10], "containerd": [11], "foo": []},
+            daemon_stats.find_processes(["dockerd", "containerd", "foo"]))
+
+    @mock.patch("xrally_docker.common.daemon_stats.os.sysconf",
+                return_value=100)
+    def test_sample_process(self, mock_sysconf):
+        self._make_process(10, "dockerd", utime=150, stime=50, rss=2048,
+                           fds=3)
+
+        self.assertEqual({"cpu_time": 2.0, "rss": 2048 * 1024, "fds": 3},
+                         daemon_stats.sample_process(10))
+
+    @mock.patch("requests.get")
+    def test_get_goroutines(self, mock_get):
+        mock_get.return_value.text = ("# HELP go_goroutines ...\n"
+                                      "go_goroutines 42\n")
+        self.assertEqual(42, daemon_stats.get_goroutines("http://foo"))
+        mock_get.assert_called_once_with("http://foo", timeout=5)
+
+        mock_get.return_value.text = ""
+        self.assertIsNone(daemon_stats.get_goroutines("http://foo"))
+
+    @mock.patch("xrally_docker.common.daemon_stats.get_goroutines",
+                return_value=7)
+    @mock.patch("xrally_docker.common.daemon_stats.sample_process")
+    def test_take_snapshot(self, mock_sample_process, mock_get_goroutines):
+        mock_sample_process.side_effect = [
+            {"cpu_time": 1, "rss": 10, "fds": 3},
+            {"cpu_time": 2, "rss": 20, "fds": None},
+            IOError]
+
+        snapshot = daemon_stats.take_snapshot({"dockerd": [1, 2, 3]},
+                                              metrics_url="http://foo")
+
+        self.assertEqual(
+            {"dockerd": {"cpu_time": 3, "rss": 30, "fds": 3}},
+            snapshot["processes"])
+        self.assertEqual(7, snapshot["goroutines"])
+        mock_get_goroutines.assert_called_once_with("http://foo")
+
+    @mock.patch("xrally_docker.common.daemon_stats.take_snapshot")
+    def test_sampler(self, mock_take_snapshot):
+        mock_take_snapshot.side_effect = [
+            {"timestamp": 0,
+             "processes": {"dockerd": {"cpu_time": 1, "rss": 0,
+                                       "fds": 1}},
+             "goroutines": None},
+            {"timestamp": 10,
+             "processes": {"dockerd": {"cpu_time": 6, "rss": 1048576,
+                                       "fds": 5}},
+             "goroutines": 30}]
+        path = os.path.join(self.proc, "samples.json")
+        sampler = daemon_stats.Sampler({"dockerd": [1]}, path,
+                                       metrics_url="http://foo")
+        sampler._stopped = mock.Mock()
+        sampler._stopped.wait.side_effect = [False, True]
+
+        sampler.start()
+        samples = sampler.stop()
+
+        mock_take_snapshot.assert_called_with({"dockerd": [1]}, "http://foo")
+        sampler._stopped.wait.assert_called_with(1.0)
+        expected = [{"timestamp": 10,
+                     "processes": {"dockerd": {"cpu": 50.0, "rss": 1048576,
+                                               "fds": 5}},
+                     "goroutines": 30}]
+        self.assertEqual(expected, samples)
+        with open(path) as f:
+            self.assertEqual(expected, [json.loads(line) for line in f])
+
+    def test_read_samples(self):
+        path = os.path.join(self.proc, "samples.json")
+        with open(path, "w") as f:
+            for timestamp in (1, 2, 3):
+                f.write(json.dumps({"timestamp": timestamp}) + "\n")
+            f.write('{"timestamp": 4')
+
+        self.assertEqual([{"timestamp": 2}, {"timestamp": 3}],
+                         daemon_stats.read_samples(path, 1.5, 5))
+        # the period is shorter than the interval of the sampler
+        self.assertEqual([{"timestamp": 2}],
+                         daemon_stats.read_samples(path, 2.1, 2.9))
+        self.assertEqual([], daemon_stats.read_samples(path, 0, 0.5))
+
+        # the last sample is written completely
+        with open(path, "a") as f:
+            f.write("}\n")
+        self.assertEqual([{"timestamp": 4}],
+                         daemon_stats.read_samples(path, 3.5, 5))
+
+    def test_make_output(self):
+        samples = [
+            {"timestamp": 10,
+             "processes": {"dockerd": {"cpu": 50.0, "rss": 1048576,
+                                       "fds": 5}},
+             "goroutines": 30},
+            {"timestamp": 20,
+             "processes": {"dockerd": {"cpu": 10.0, "rss": 2097152,
+                                       "fds": None}},
+             "goroutines": None}]
+
+        outputs = daemon_stats.make_output(samples)
+
+        self.assertEqual(
+            [("Docker daemon CPU usage", [["dockerd", 30.0]]),
+             ("Docker daemon memory usage", [["dockerd", 2.0]]),
+             ("Docker daemon open file descriptors", [["dockerd", 5]]),
+             ("Docker daemon goroutines", [["goroutines", 30]])],
+            [(o["title"], o["data"]) for o in outputs])
+
+        self.assertEqual([], daemon_stats.make_output([]))
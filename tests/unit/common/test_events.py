@@ -0,0 +1,111 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+
+import mock
+
+from tests.unit import test
+from xrally_docker.common import events
+
+
+def _event(etype, action, actor_id, timestamp, name=None):
+    attributes = {"name": name} if name else {}
+    return {"Type": etype, "Action": action, "timeNano": timestamp * 10 ** 9,
+            "Actor": {"ID": actor_id, "Attributes": attributes}}
+
+
+class EventsTestCase(test.TestCase):
+
+    def test_get_actor_name(self):
+        self.assertEqual(
+            "foo", events.get_actor_name(_event("container", "create", "id",
+                                                1, name="foo")))
+        self.assertEqual(
+            "vol", events.get_actor_name(_event("volume", "create", "vol", 1)))
+        self.assertIsNone(events.get_actor_name({}))
+
+    def test_get_timestamp(self):
+        self.assertEqual(1.5, events.get_timestamp({"timeNano": 1500000000}))
+        self.assertEqual(2.0, events.get_timestamp({"time": 2}))
+
+    def test_matches_names(self):
+        names = {"foo", "bar"}
+        self.assertTrue(events.matches_names(
+            _event("container", "create", "id", 1, name="foo"), names))
+        self.assertTrue(events.matches_names(
+            _event("image", "tag", "sha256:1", 1, name="busybox:bar"),
+            names))
+        self.assertFalse(events.matches_names(
+            _event("container", "create", "id", 1, name="baz"), names))
+
+    def test_get_phases(self):
+        recorded = [
+            _event("container", "create", "c1", 1),
+            _event("container", "start", "c1", 1.5),
+            _event("container", "exec_start: sh", "c1", 1.6),
+            _event("container", "die", "c1", 3),
+            _event("container", "destroy", "c1", 3.25),
+            _event("container", "create", "c2", 2),
+            _event("container", "start", "c2", 4),
+            _event("network", "create", "n1", 1),
+            _event("network", "destroy", "n1", 2)]
+
+        self.assertEqual(
+            [("container create-start", [0.5, 2]),
+             ("container start-die", [1.5]),
+             ("container die-destroy", [0.25]),
+             ("network create-destroy", [1])],
+            events.get_phases(recorded))
+
+
+class RecorderTestCase(test.TestCase):
+
+    def test_record(self):
+        client = mock.MagicMock()
+        stopped = threading.Event()
+        recorded = [_event("container", "create", "id", 1, name="foo"),
+                    _event("container", "create", "id", 1, name="bar")]
+
+        def stream():
+            for event in recorded:
+                yield event
+            stopped.wait(5)
+
+        client.stream_events.return_value = mock.MagicMock(
+            __iter__=lambda s: stream(), close=lambda: stopped.set())
+        recorder = events.Recorder(
+            client, types=["container"],
+            matcher=lambda e: events.get_actor_name(e) == "foo")
+
+        recorder.start()
+        self.assertEqual(recorded[:1], recorder.stop())
+
+        client.stream_events.assert_called_once_with(
+            filters={"type": ["container"]})
+        self.assertFalse(recorder._thread.is_alive())
+
+    def test_record_interrupted(self):
+        client = mock.MagicMock()
+        client.stream_events.return_value = mock.MagicMock(
+            __iter__=mock.Mock(side_effect=Exception("oops")))
+        recorder = events.Recorder(client)
+
+        recorder.start()
+        recorder._thread.join()
+
+        self.assertEqual([], recorder.stop())
+
+    def test_stop_not_started(self):
+        self.assertEqual([], events.Recorder(mock.MagicMock()).stop())
@@ -0,0 +1,76 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+import time
+
+from tests.unit import test
+from xrally_docker.common import open_loop
+
+
+class OpenLoopTestCase(test.TestCase):
+
+    def test_run(self):
+        called = []
+
+        def func(index):
+            called.append(index)
+            if index == 1:
+                raise Exception("oops")
+
+        records = open_loop.run(func, rate=100, requests_count=3)
+
+        self.assertEqual([0, 1, 2], sorted(called))
+        self.assertEqual([None, "oops", None],
+                         [r["error"] and str(r["error"]) for r in records])
+        for i, record in enumerate(records):
+            self.assertAlmostEqual(
+                0.01 * i, record["intended"] - records[0]["intended"],
+                places=6)
+            self.assertLessEqual(record["intended"], record["started"])
+            self.assertLessEqual(record["started"], record["finished"])
+
+    def test_run_does_not_wait_for_completion(self):
+        event = threading.Event()
+
+        def func(index):
+            if index == 0:
+                event.wait(1)
+            else:
+                event.set()
+
+        records = open_loop.run(func, rate=100, requests_count=2)
+
+        # the second request is started while the first one is running
+        self.assertLess(records[1]["finished"], records[0]["finished"])
+
+    def test_run_with_max_outstanding(self):
+        records = open_loop.run(lambda i: time.sleep(0.05), rate=1000,
+                                requests_count=3, max_outstanding=1)
+
+        # requests wait for a free worker, it is a part of corrected latency
+        stats = open_loop.summarize(records)
+        self.assertGreater(stats["lag"][-1], 0.09)
+        self.assertGreater(stats["corrected"][-1], stats["service"][-1])
+
+    def test_summarize(self):
+        error = Exception("oops")
+        records = [
+            {"intended": 0, "started": 1, "finished": 3, "error": None},
+            {"intended": 1, "started": 1, "finished": 2, "error": None},
+            {"intended": 2, "started": 4, "finished": 5, "error": error}]
+
+        self.assertEqual({"service": [1, 2], "corrected": [1, 3],
+                          "lag": [0, 1, 2], "errors": [error]},
+                         open_loop.summarize(records))
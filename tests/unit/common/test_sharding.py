@@ -0,0 +1,58 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from tests.unit import test
+from xrally_docker.common import sharding
+
+
+class HostRouterTestCase(test.TestCase):
+
+    def setUp(self):
+        super(HostRouterTestCase, self).setUp()
+        self.router = sharding.HostRouter()
+
+    def test_select_round_robin(self):
+        self.assertEqual(
+            [0, 1, 2, 0],
+            [self.router.select(3, "round_robin", i) for i in range(1, 5)])
+
+    def test_select_hash(self):
+        selected = [self.router.select(3, "hash", i) for i in range(1, 100)]
+        self.assertEqual(
+            selected,
+            [self.router.select(3, "hash", i) for i in range(1, 100)])
+        self.assertEqual({0, 1, 2}, set(selected))
+
+    def test_select_least_latency(self):
+        fast = [{"started_at": 0, "finished_at": 1}]
+        slow = [{"started_at": 0, "finished_at": 5}]
+        running = [{"started_at": 0}]
+
+        # hosts without observations are selected first
+        self.assertEqual(0, self.router.select(2, "least_latency", 1))
+        self.router.track(0, slow)
+        self.router.track(1, running)
+        self.assertEqual(1, self.router.select(2, "least_latency", 2))
+
+        running[0]["finished_at"] = 10
+        self.router.track(1, fast)
+        self.assertEqual(0, self.router.select(2, "least_latency", 3))
+        self.assertEqual(5, self.router.get_latency(0))
+        # 10 is observed first, then 1
+        self.assertAlmostEqual(0.3 * 1 + 0.7 * 10,
+                               self.router.get_latency(1))
+
+        # new actions of tracked iterations are taken into account
+        slow.append({"started_at": 0, "finished_at": 20})
+        self.assertEqual(1, self.router.select(2, "least_latency", 4))
@@ -0,0 +1,32 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from tests.unit import test
+from xrally_docker.common import stats
+
+
+class StatsTestCase(test.TestCase):
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(50, stats.percentile(values, 50))
+        self.assertEqual(99, stats.percentile(values, 99))
+        self.assertEqual(1, stats.percentile(values, 0))
+        self.assertEqual(7, stats.percentile([7], 99))
+        self.assertEqual(100, stats.percentile(values, 100))
+
+    def test_percentile_of_odd_number_of_values(self):
+        self.assertEqual(3, stats.percentile([1, 2, 3, 4, 5], 50))
+        self.assertEqual(5, stats.percentile([1, 2, 3, 4, 5], 99))
+        self.assertEqual(29, stats.percentile(list(range(1, 31)), 95))
@@ -14,6 +14,8 @@
 
 import os
 
+import mock
+
 from tests.unit import test
 from xrally_docker.env.platforms import existing
 
@@ -43,3 +45,114 @@ class DockerPlatformTestCase(test.TestCase):
             existing.Docker.create_spec_from_sys_environ(
                 {"DOCKER_HOST": "localhost",
                  "DOCKER_TLS_VERIFY": True}))
+
+    def setUp(self):
+        super(DockerPlatformTestCase, self).setUp()
+        p_docker = mock.patch(
+            "xrally_docker.env.platforms.existing.service.Docker")
+        self.mock_docker = p_docker.start()
+        self.client = self.mock_docker.return_value
+        self.daemon = {"Driver": "overlay2", "NCPU": 4}
+        self.client.get_daemon_info.return_value = self.daemon
+
+    def test_create(self):
+        self.assertEqual(
+            ({"host": "https://foo", "tls_verify": True, "cert_path": "/foo",
+              "daemon": self.daemon},
+             {}),
+            existing.Docker({"host": "tcp://foo", "tls_verify": True,
+                             "cert_path": "/foo"}).create())
+        self.mock_docker.assert_called_once_with(
+            {"host": "https://foo", "tls_verify": True, "cert_path": "/foo",
+             "daemon": self.daemon})
+
+    def test_create_with_unavailable_daemon(self):
+        self.client.get_daemon_info.side_effect = Exception("oops")
+
+        platform_data, plugin_data = existing.Docker({}).create()
+
+        self.assertEqual({"host": None, "tls_verify": None,
+                          "cert_path": None, "daemon": None},
+                         platform_data)
+
+    def test_create_with_transport_options(self):
+        self.assertEqual(
+            ({"host": "unix:///run/docker.sock", "tls_verify": None,
+              "cert_path": None, "timeout": 30, "max_pool_size": 100,
+              "keep_alive": False, "socket_send_buffer": 1024,
+              "daemon": self.daemon},
+             {}),
+            existing.Docker({"unix_socket": "/run/docker.sock",
+                             "timeout": 30, "max_pool_size": 100,
+                             "keep_alive": False,
+                             "socket_send_buffer": 1024}).create())
+
+    def test_create_with_several_hosts(self):
+        platform_data, plugin_data = existing.Docker(
+            {"hosts": [{"host": "tcp://a"},
+                       {"host": "tcp://b", "cert_path": "/b"}],
+             "sharding": "least_latency", "max_pool_size": 50}).create()
+
+        hosts = [{"host": "tcp://a", "tls_verify": None, "cert_path": None,
+                  "max_pool_size": 50, "daemon": self.daemon},
+                 {"host": "https://b", "tls_verify": None,
+                  "cert_path": "/b", "max_pool_size": 50,
+                  "daemon": self.daemon}]
+        self.assertEqual(
+            {"host": "tcp://a", "tls_verify": None, "cert_path": None,
+             "max_pool_size": 50, "daemon": self.daemon, "hosts": hosts,
+             "sharding": "least_latency"},
+            platform_data)
+
+    @mock.patch("xrally_docker.env.platforms.existing.rutils.Timer")
+    def test_check_health(self, mock_timer):
+        durations = [0.001 * i for i in range(20, 0, -1)]
+        mock_timer.return_value.__enter__.return_value.duration.side_effect = (
+            durations)
+        platform = existing.Docker({"health_check_pings": 20},
+                                   platform_data={"host": "tcp://a"})
+
+        self.assertEqual(
+            {"available": True,
+             "message": "Round-trip latency: min 1.00 ms, median 10.00 ms, "
+                        "p99 20.00 ms."},
+            platform.check_health())
+        self.assertEqual(20, self.client.ping.call_count)
+
+    def test_check_health_with_several_hosts(self):
+        hosts = [{"host": "tcp://a"}, {"host": "tcp://b"}]
+        platform = existing.Docker(
+            {}, platform_data={"host": "tcp://a", "hosts": hosts})
+        result = platform.check_health()
+        self.assertTrue(result["available"])
+        self.assertEqual(2, result["message"].count("Round-trip latency"))
+        self.assertTrue(result["message"].startswith("tcp://a: "))
+        self.assertEqual([mock.call(h) for h in hosts],
+                         self.mock_docker.call_args_list)
+        self.assertEqual(10, self.client.ping.call_count)
+
+        self.client.ping.side_effect = [None] * 5 + [Exception]
+        result = platform.check_health()
+        self.assertFalse(result["available"])
+        self.assertEqual("Docker host tcp://b is not available",
+                         result["message"])
+
+    def test_info(self):
+        platform = existing.Docker({"health_check_pings": 1},
+                                   platform_data={"host": "tcp://a"})
+
+        info = platform.info()["info"]
+
+        self.assertEqual(self.client.get_info.return_value, info["version"])
+        self.assertEqual(self.daemon, info["daemon"])
+        self.assertEqual(["median", "min", "p99"], sorted(info["latency"]))
+
+    def test_info_with_several_hosts(self):
+        hosts = [{"host": "tcp://a"}, {"host": "tcp://b"}]
+        platform = existing.Docker(
+            {}, platform_data={"host": "tcp://a", "hosts": hosts})
+
+        info = platform.info()["info"]
+
+        self.assertEqual(["tcp://a", "tcp://b"], sorted(info))
+        self.assertEqual(self.daemon, info["tcp://b"]["daemon"])
@@ -0,0 +1,94 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import tempfile
+
+import docker
+import mock
+
+from tests.unit import test
+from xrally_docker.task.contexts import daemon_monitor
+
+
+BASE = "xrally_docker.task.contexts.daemon_monitor"
+
+
+class DaemonMonitorContextTestCase(test.TestCase):
+
+    def setUp(self):
+        super(DaemonMonitorContextTestCase, self).setUp()
+        self.ctx = {
+            "env": {"platforms": {"docker": {}}},
+            "owner_id": "foo-bar",
+            "config": {"daemon_monitor@docker": {
+                "processes": ["dockerd", "containerd"]}}
+        }
+        with mock.patch.object(docker, "DockerClient"):
+            self.ctx_obj = daemon_monitor.DaemonMonitorContext(self.ctx)
+
+    @mock.patch("%s.daemon_stats" % BASE)
+    def test_setup(self, mock_daemon_stats):
+        mock_daemon_stats.is_local.return_value = True
+        mock_daemon_stats.find_processes.return_value = {
+            "dockerd": [1], "containerd": []}
+
+        self.ctx_obj.setup()
+        path = self.ctx["docker"]["daemon_monitor"]["path"]
+        self.addCleanup(os.remove, path)
+
+        mock_daemon_stats.find_processes.assert_called_once_with(
+            ["dockerd", "containerd"])
+        mock_daemon_stats.Sampler.assert_called_once_with(
+            {"dockerd": [1]}, path, metrics_url=None, interval=1)
+        mock_daemon_stats.Sampler.return_value.start.assert_called_once_with()
+        self.assertTrue(os.path.isfile(path))
+
+    @mock.patch("%s.daemon_stats" % BASE)
+    def test_setup_remote_daemon(self, mock_daemon_stats):
+        mock_daemon_stats.is_local.return_value = False
+        self.ctx["config"]["daemon_monitor@docker"].update(
+            {"metrics_url": "http://foo", "interval": 5})
+        with mock.patch.object(docker, "DockerClient"):
+            ctx_obj = daemon_monitor.DaemonMonitorContext(self.ctx)
+
+        ctx_obj.setup()
+        path = self.ctx["docker"]["daemon_monitor"]["path"]
+        self.addCleanup(os.remove, path)
+
+        self.assertFalse(mock_daemon_stats.find_processes.called)
+        mock_daemon_stats.Sampler.assert_called_once_with(
+            {}, path, metrics_url="http://foo", interval=5)
+
+    @mock.patch("%s.LOG" % BASE)
+    def test_cleanup(self, mock_log):
+        # nothing to do
+        self.ctx_obj.cleanup()
+        self.assertFalse(mock_log.info.called)
+
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        self.ctx["docker"]["daemon_monitor"] = {"path": path}
+        self.ctx_obj._sampler = mock.Mock(
+            baseline={"processes": {"dockerd": {"rss": 1048576}}})
+        self.ctx_obj._sampler.stop.return_value = [
+            {"processes": {"dockerd": {"rss": 3145728}}}]
+
+        self.ctx_obj.cleanup()
+
+        self.ctx_obj._sampler.stop.assert_called_once_with()
+        self.assertFalse(os.path.exists(path))
+        mock_log.info.assert_called_with(
+            "Docker daemon process 'dockerd' RSS changed by 2.00 MiB "
+            "during the workload.")
@@ -0,0 +1,108 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import os
+import tempfile
+
+import docker
+import mock
+from rally import exceptions
+from rally.task import scenario as rally_scenario
+
+from tests.unit import test
+from xrally_docker import service
+from xrally_docker.task.contexts import events
+
+
+BASE = "xrally_docker.task.contexts.events"
+
+
+class EventsContextTestCase(test.TestCase):
+
+    def setUp(self):
+        super(EventsContextTestCase, self).setUp()
+        self.ctx = {
+            "env": {"platforms": {"docker": {}}},
+            "owner_id": "foo-bar",
+            "config": {"events@docker": {}}
+        }
+        with mock.patch.object(docker, "DockerClient"):
+            self.ctx_obj = events.EventsContext(self.ctx)
+        self.docker = mock.MagicMock()
+        self.ctx_obj.client = self.docker
+
+    @mock.patch("%s.events.Recorder" % BASE)
+    def test_setup(self, mock_recorder):
+        self.ctx_obj.setup()
+
+        mock_recorder.assert_called_once_with(
+            self.docker, types=["container", "image", "network", "volume"],
+            matcher=self.ctx_obj._is_owned)
+        mock_recorder.return_value.start.assert_called_once_with()
+        self.assertEqual(
+            {"types": ["container", "image", "network", "volume"]},
+            self.ctx["docker"]["events"])
+
+    @mock.patch("%s.events.Recorder" % BASE)
+    def test_setup_fails(self, mock_recorder):
+        mock_recorder.return_value.start.side_effect = Exception("oops")
+
+        self.assertRaises(exceptions.ContextSetupFailure, self.ctx_obj.setup)
+        self.assertNotIn("events", self.ctx["docker"])
+
+    def test__is_owned(self):
+        name = rally_scenario.Scenario(
+            {"owner_id": "foo-bar"}).generate_random_name()
+        alien = rally_scenario.Scenario(
+            {"owner_id": "bar-baz"}).generate_random_name()
+
+        def event(name=None, labels=None):
+            attributes = dict(labels or {})
+            if name:
+                attributes["name"] = name
+            return {"Actor": {"ID": "id", "Attributes": attributes}}
+
+        self.assertTrue(self.ctx_obj._is_owned(event(name)))
+        self.assertTrue(self.ctx_obj._is_owned(event("busybox:%s" % name)))
+        self.assertTrue(self.ctx_obj._is_owned(
+            event(labels={service.OWNER_LABEL: name})))
+        self.assertFalse(self.ctx_obj._is_owned(
+            event(labels={service.OWNER_LABEL: alien})))
+        self.assertFalse(self.ctx_obj._is_owned(event(alien)))
+        self.assertFalse(self.ctx_obj._is_owned(event("busybox:latest")))
+
+    def test_cleanup(self):
+        recorded = [
+            {"Type": "container", "Action": "create", "timeNano": 10 ** 9,
+             "Actor": {"ID": "c1"}},
+            {"Type": "container", "Action": "start", "timeNano": 2 * 10 ** 9,
+             "Actor": {"ID": "c1"}}]
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        self.ctx["config"]["events@docker"]["path"] = path
+        with mock.patch.object(docker, "DockerClient"):
+            ctx_obj = events.EventsContext(self.ctx)
+        ctx_obj._recorder = mock.Mock()
+        ctx_obj._recorder.stop.return_value = recorded
+
+        ctx_obj.cleanup()
+
+        ctx_obj._recorder.stop.assert_called_once_with()
+        with open(path) as f:
+            self.assertEqual(recorded, json.load(f))
+
+    def test_cleanup_without_setup(self):
+        self.ctx_obj.cleanup()
@@ -43,6 +43,7 @@ class ImagesContextTestCase(test.TestCase):
         self.ctx_obj.setup()
 
         self.assertFalse(self.docker.pull_image.called)
+        self.docker.list_images.assert_called_once_with(summary=True)
         self.assertEqual(image_objs, self.ctx["docker"]["images"])
 
         # Case #2: Names are specified, so the new image should be pulled.
@@ -68,6 +69,46 @@ class ImagesContextTestCase(test.TestCase):
         expected_images.add(self.docker.pull_image.return_value)
         self.assertEqual(expected_images, set(self.ctx["docker"]["images"]))
 
+    def test_setup_with_tarballs(self):
+        self.ctx_obj.config = {"names": [], "tarballs": ["/foo.tar"]}
+        self.docker.load_image.return_value = ["foo:bar", "sha256:abcd"]
+
+        self.ctx_obj.setup()
+
+        self.docker.load_image.assert_called_once_with("/foo.tar")
+        self.docker.tag_image.assert_called_once_with("foo:bar")
+        self.docker.get_image.assert_called_once_with("sha256:abcd")
+        self.assertFalse(self.docker.pull_image.called)
+        self.assertFalse(self.docker.list_images.called)
+        self.assertEqual([self.docker.tag_image.return_value,
+                          self.docker.get_image.return_value],
+                         self.ctx["docker"]["images"])
+
+    @mock.patch("xrally_docker.task.contexts.images.service.Docker")
+    def test_setup_with_several_hosts(self, mock_docker):
+        self.ctx["env"]["platforms"]["docker"] = {
+            "host": "tcp://foo",
+            "hosts": [{"host": "tcp://foo"}, {"host": "tcp://bar"}]}
+        self.ctx_obj.config = {"names": ["foo"], "existing": True}
+        self.docker.pull_image.return_value = {
+            "RepoTags": ["foo:latest", "foo:rally-1"]}
+        self.docker.list_images.return_value = [
+            {"RepoTags": ["bar:latest", "baz:latest"]}]
+        other = mock_docker.return_value
+        other.pull_image.return_value = {
+            "RepoTags": ["foo:latest", "foo:rally-2"]}
+        other.list_images.return_value = [{"RepoTags": ["baz:latest"]}]
+
+        self.ctx_obj.setup()
+
+        mock_docker.assert_called_once_with(
+            {"host": "tcp://bar"}, atomic_inst=mock.ANY,
+            name_generator=self.ctx_obj.generate_random_name)
+        other.pull_image.assert_called_once_with("foo")
+        self.assertEqual([{"RepoTags": ["foo:latest"]},
+                          {"RepoTags": ["baz:latest"]}],
+                         self.ctx["docker"]["images"])
+
     @mock.patch("xrally_docker.task.contexts.images.manager")
     def test_cleanup(self, mock_manager):
         self.ctx_obj.cleanup()
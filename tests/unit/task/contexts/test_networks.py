@@ -14,6 +14,7 @@
 
 import docker
 import mock
+from rally import exceptions
 
 from tests.unit import test
 from xrally_docker.task.contexts import networks
@@ -42,13 +43,102 @@ class NetworksContextTestCase(test.TestCase):
 
         self.docker.create_network.assert_called_once_with()
 
+    def test_setup_with_several_networks(self):
+        self.ctx["config"]["networks@docker"] = [
+            {"count": 3, "driver": "bridge"},
+            {"ipam": {"Driver": "default"}}]
+        with mock.patch.object(docker, "DockerClient"):
+            ctx_obj = networks.NetworksContext(self.ctx)
+        ctx_obj.client = self.docker
+        self.docker.create_network.side_effect = [
+            {"Id": "1"}, {"Id": "2"}, {"Id": "3"}, {"Id": "4"}]
+
+        ctx_obj.setup()
+
+        self.assertEqual(
+            ["1", "2", "3", "4"],
+            sorted(n["Id"] for n in self.ctx["docker"]["networks"]))
+        self.assertEqual(
+            [mock.call(driver="bridge")] * 3 + [
+                mock.call(ipam={"Driver": "default", "Options": {}})],
+            sorted(self.docker.create_network.call_args_list,
+                   key=lambda c: "ipam" in c[1]))
+
+    def test_setup_fails(self):
+        self.ctx["config"]["networks@docker"] = {"count": 2}
+        with mock.patch.object(docker, "DockerClient"):
+            ctx_obj = networks.NetworksContext(self.ctx)
+        ctx_obj.client = self.docker
+        self.docker.create_network.side_effect = [{"Id": "1"},
+                                                  Exception("oops")]
+
+        self.assertRaises(exceptions.ContextSetupFailure, ctx_obj.setup)
+        # created networks should be saved for the cleanup
+        self.assertEqual([{"Id": "1"}], self.ctx["docker"]["networks"])
+
+    def test_setup_with_subnet_pools(self):
+        self.ctx["config"]["networks@docker"] = [
+            {"count": 2,
+             "subnet_pools": [{"cidr": "10.0.0.0/16", "prefixlen": 24},
+                              {"cidr": "fd00::/48", "prefixlen": 64}]},
+            {"ipam": {"Driver": "foo"},
+             "subnet_pools": [{"cidr": "10.0.0.0/16", "prefixlen": 24}]}]
+        with mock.patch.object(docker, "DockerClient"):
+            ctx_obj = networks.NetworksContext(self.ctx)
+        ctx_obj.client = self.docker
+        self.docker.list_networks.return_value = [
+            {"IPAM": {"Config": [{"Subnet": "10.0.1.0/24"}]}},
+            {"IPAM": None}]
+
+        ctx_obj.setup()
+
+        self.docker.list_networks.assert_called_once_with()
+        self.assertEqual(
+            sorted([
+                mock.call(enable_ipv6=True, ipam={
+                    "Driver": "default", "Options": {},
+                    "Config": [{"subnet": "10.0.0.0/24"},
+                               {"subnet": "fd00::/64"}]}),
+                mock.call(enable_ipv6=True, ipam={
+                    "Driver": "default", "Options": {},
+                    "Config": [{"subnet": "10.0.2.0/24"},
+                               {"subnet": "fd00:0:0:1::/64"}]}),
+                mock.call(ipam={
+                    "Driver": "foo", "Options": {},
+                    "Config": [{"subnet": "10.0.3.0/24"}]})], key=str),
+            sorted(self.docker.create_network.call_args_list, key=str))
+
+    def test_setup_with_exhausted_subnet_pool(self):
+        self.ctx["config"]["networks@docker"] = {
+            "count": 3,
+            "subnet_pools": [{"cidr": "10.0.0.0/23", "prefixlen": 24}]}
+        with mock.patch.object(docker, "DockerClient"):
+            ctx_obj = networks.NetworksContext(self.ctx)
+        ctx_obj.client = self.docker
+        self.docker.list_networks.return_value = []
+
+        self.assertRaises(exceptions.ContextSetupFailure, ctx_obj.setup)
+        self.assertFalse(self.docker.create_network.called)
+
+    def test_setup_with_wrong_prefixlen(self):
+        self.ctx["config"]["networks@docker"] = {
+            "subnet_pools": [{"cidr": "10.0.0.0/16", "prefixlen": 8}]}
+        with mock.patch.object(docker, "DockerClient"):
+            ctx_obj = networks.NetworksContext(self.ctx)
+        ctx_obj.client = self.docker
+        self.docker.list_networks.return_value = []
+
+        self.assertRaises(exceptions.ContextSetupFailure, ctx_obj.setup)
+
     @mock.patch("xrally_docker.task.contexts.networks.manager")
     def test_cleanup(self, mock_manager):
+        self.ctx["docker"]["networks"] = [{"Id": "1"}]
         self.ctx_obj.cleanup()
 
         mock_manager.cleanup.assert_called_once_with(
             names=["network"],
             spec=self.ctx["env"]["platforms"]["docker"],
             superclass=networks.NetworksContext,
-            owner_id=self.owner_id
+            owner_id=self.owner_id,
+            raw_resources={"network": [{"Id": "1"}]}
         )
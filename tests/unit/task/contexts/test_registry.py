@@ -0,0 +1,112 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import docker
+import mock
+
+from rally import exceptions
+from tests.unit import test
+from xrally_docker.task.contexts import registry
+
+
+BASE = "xrally_docker.task.contexts.registry"
+
+
+class RegistryContextTestCase(test.TestCase):
+
+    def setUp(self):
+        super(RegistryContextTestCase, self).setUp()
+        self.ctx = {
+            "env": {"platforms": {"docker": {}}},
+            "owner_id": "foo-bar",
+            "config": {"registry@docker": {
+                "port": 5001,
+                "images": ["busybox", "foo/bar:baz"],
+                "generated": {"count": 1, "layer_size": 10}}}
+        }
+        with mock.patch.object(docker, "DockerClient"):
+            self.ctx_obj = registry.RegistryContext(self.ctx)
+        self.dclient = mock.MagicMock()
+        self.ctx_obj.client = self.dclient
+        self.ctx_obj.generate_random_name = mock.MagicMock(
+            return_value="rally")
+        self.dclient.run_container.return_value.id = "r-id"
+        self.dclient.get_container.return_value = {"State": {"Running": True}}
+        self.dclient.build_image.return_value = {
+            "RepoTags": ["localhost:5001/xrally-generated-0:latest"]}
+
+    @mock.patch("%s.rutils.interruptable_sleep" % BASE)
+    def test_setup(self, mock_interruptable_sleep):
+        # the registry is not ready for the first push
+        self.dclient.push_image.side_effect = [Exception, None, None, None]
+
+        self.ctx_obj.setup()
+
+        self.dclient.run_container.assert_called_once_with(
+            image_name="registry:2", detach=True, remove=False,
+            ports={"5000/tcp": 5001})
+        self.assertEqual(
+            [mock.call("busybox:latest", tags=["rally"],
+                       repository="localhost:5001/busybox"),
+             mock.call("foo/bar:baz", tags=["rally"],
+                       repository="localhost:5001/foo/bar")],
+            self.dclient.tag_image.call_args_list)
+        self.assertEqual(
+            [mock.call("localhost:5001/busybox:rally"),
+             mock.call("localhost:5001/busybox:rally"),
+             mock.call("localhost:5001/foo/bar:rally"),
+             mock.call("localhost:5001/xrally-generated-0:latest")],
+            self.dclient.push_image.call_args_list)
+        mock_interruptable_sleep.assert_called_once_with(1)
+        self.assertEqual(
+            "localhost:5001/xrally-generated-0",
+            self.dclient.build_image.call_args[1]["repository"])
+        self.assertEqual(
+            [mock.call("localhost:5001/busybox:rally"),
+             mock.call("localhost:5001/foo/bar:rally"),
+             mock.call("localhost:5001/xrally-generated-0:latest")],
+            self.dclient.delete_image.call_args_list)
+        self.assertEqual(
+            {"address": "localhost:5001",
+             "container": "r-id",
+             "images": {
+                 "busybox:latest": "localhost:5001/busybox:rally",
+                 "foo/bar:baz": "localhost:5001/foo/bar:rally",
+                 "xrally-generated-0:latest":
+                     "localhost:5001/xrally-generated-0:latest"}},
+            self.ctx["docker"]["registry"])
+
+    @mock.patch("%s.rutils.interruptable_sleep" % BASE)
+    @mock.patch("%s.time.time" % BASE)
+    def test_setup_registry_is_not_started(self, mock_time,
+                                           mock_interruptable_sleep):
+        mock_time.side_effect = [0, 10, 70]
+        self.dclient.get_container.return_value = {
+            "State": {"Running": False}}
+
+        self.assertRaises(exceptions.ContextSetupFailure,
+                          self.ctx_obj.setup)
+        self.assertFalse(self.dclient.push_image.called)
+
+    @mock.patch("%s.manager.cleanup" % BASE)
+    def test_cleanup(self, mock_cleanup):
+        self.ctx["docker"] = {"registry": {"container": "r-id"}}
+
+        self.ctx_obj.cleanup()
+
+        self.dclient.delete_container.assert_called_once_with(
+            "r-id", volumes=True)
+        mock_cleanup.assert_called_once_with(
+            names=["image"], spec={}, superclass=registry.RegistryContext,
+            owner_id="foo-bar")
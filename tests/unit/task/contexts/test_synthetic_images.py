@@ -0,0 +1,85 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+
+import docker
+import mock
+
+from tests.unit import test
+from xrally_docker.task.contexts import synthetic_images
+
+
+BASE = "xrally_docker.task.contexts.synthetic_images"
+
+
+class SyntheticImagesContextTestCase(test.TestCase):
+
+    def setUp(self):
+        super(SyntheticImagesContextTestCase, self).setUp()
+        self.ctx = {
+            "env": {"platforms": {"docker": {}}},
+            "owner_id": "foo-bar",
+            "docker": {"images": [{"RepoTags": ["foo:latest"]}]},
+            "config": {"synthetic_images@docker": [
+                {"layers_count": 2, "layer_size": 10},
+                {"base_image": "busybox", "files_per_layer": 2,
+                 "compressibility": 0.9}]}
+        }
+        with mock.patch.object(docker, "DockerClient"):
+            self.ctx_obj = synthetic_images.SyntheticImagesContext(self.ctx)
+        self.dclient = mock.MagicMock()
+        self.ctx_obj.client = self.dclient
+
+    @mock.patch("%s.build_context.generate" % BASE)
+    def test_setup(self, mock_generate):
+        paths = []
+
+        def build_image(path, repository):
+            paths.append(path)
+            self.assertTrue(os.path.exists(path))
+            return {"RepoTags": ["%s:rally" % repository]}
+
+        self.dclient.build_image.side_effect = build_image
+
+        self.ctx_obj.setup()
+
+        self.assertEqual(
+            [mock.call(paths[0], base_image="scratch", layers_count=2,
+                       layer_size=10, files_per_layer=1,
+                       compressibility=0.0),
+             mock.call(paths[1], base_image="busybox", layers_count=1,
+                       layer_size=1048576, files_per_layer=2,
+                       compressibility=0.9)],
+            mock_generate.call_args_list)
+        # generated contexts should be removed
+        self.assertFalse([p for p in paths if os.path.exists(p)])
+        self.assertEqual(
+            [{"RepoTags": ["foo:latest"]},
+             {"RepoTags": ["xrally-synthetic-0:rally"]},
+             {"RepoTags": ["xrally-synthetic-1:rally"]}],
+            self.ctx["docker"]["images"])
+        self.assertEqual(
+            {"xrally-synthetic-0:latest": "xrally-synthetic-0:rally",
+             "xrally-synthetic-1:latest": "xrally-synthetic-1:rally"},
+            self.ctx["docker"]["synthetic_images"])
+
+    @mock.patch("%s.manager.cleanup" % BASE)
+    def test_cleanup(self, mock_cleanup):
+        self.ctx_obj.cleanup()
+
+        mock_cleanup.assert_called_once_with(
+            names=["image"], spec={},
+            superclass=synthetic_images.SyntheticImagesContext,
+            owner_id="foo-bar")
@@ -0,0 +1,68 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import docker
+import mock
+from rally import exceptions
+
+from tests.unit import test
+from xrally_docker.task.contexts import volumes
+
+
+class VolumesContextTestCase(test.TestCase):
+
+    def setUp(self):
+        super(VolumesContextTestCase, self).setUp()
+        self.ctx = {
+            "env": {"platforms": {"docker": {}}},
+            "owner_id": "foo-bar",
+            "config": {"volumes@docker": {"count": 3, "driver": "local"}}
+        }
+        with mock.patch.object(docker, "DockerClient"):
+            self.ctx_obj = volumes.VolumesContext(self.ctx)
+        self.docker = mock.MagicMock()
+        self.ctx_obj.client = self.docker
+
+    def test_setup(self):
+        self.docker.create_volume.side_effect = [
+            {"Name": "1"}, {"Name": "2"}, {"Name": "3"}]
+
+        self.ctx_obj.setup()
+
+        self.assertEqual(
+            ["1", "2", "3"],
+            sorted(v["Name"] for v in self.ctx["docker"]["volumes"]))
+        self.assertEqual(
+            [mock.call(driver="local", driver_opts=None, labels=None)] * 3,
+            self.docker.create_volume.call_args_list)
+
+    def test_setup_fails(self):
+        self.docker.create_volume.side_effect = [
+            {"Name": "1"}, Exception("oops"), {"Name": "3"}]
+
+        self.assertRaises(exceptions.ContextSetupFailure, self.ctx_obj.setup)
+        # created volumes should be saved for the cleanup
+        self.assertEqual(
+            ["1", "3"],
+            sorted(v["Name"] for v in self.ctx["docker"]["volumes"]))
+
+    @mock.patch("xrally_docker.task.contexts.volumes.manager.cleanup")
+    def test_cleanup(self, mock_cleanup):
+        self.ctx["docker"] = {"volumes": [{"Name": "1"}]}
+
+        self.ctx_obj.cleanup()
+
+        mock_cleanup.assert_called_once_with(
+            names=["volume"], spec={}, superclass=volumes.VolumesContext,
+            owner_id="foo-bar", raw_resources={"volume": [{"Name": "1"}]})
@@ -12,7 +12,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
+import os
+import tarfile
+
 import mock
+from rally import exceptions
 
 from tests.unit import test
 from xrally_docker.task.scenarios import container
@@ -36,3 +41,240 @@ class RunContainerTestCase(test.TestCase):
             image_name="foo:latest",
             command=command
         )
+
+
+class FilesystemIOTestCase(test.TestCase):
+
+    def setUp(self):
+        super(FilesystemIOTestCase, self).setUp()
+        self.dclient = mock.MagicMock()
+        self.dclient.create_volume.return_value = {"Name": "vol"}
+        stats = {"bw_bytes": 1048576, "bw": 1024, "iops": 256,
+                 "clat_ns": {"percentile": {"50.000000": 1000000,
+                                            "95.000000": 2000000,
+                                            "99.000000": 3000000,
+                                            "99.900000": 4000000}}}
+        self.dclient.run_container.return_value = (
+            b"fio: some warning\n" + json.dumps(
+                {"jobs": [{"read": stats, "write": stats}]}).encode("utf-8"))
+        self.scenario = container.FilesystemIO(
+            {"docker": {"images": [{"RepoTags": ["fio:latest"]}]}})
+        self.scenario.client = self.dclient
+        self.scenario.generate_random_name = mock.MagicMock(
+            return_value="foo")
+
+    def test_run_volume(self):
+        self.scenario.run("fio", target="volume", rw="randread",
+                          block_size=8192, file_size=1024)
+
+        self.dclient.run_container.assert_called_once_with(
+            image_name="fio:latest",
+            command=["--name=xrally", "--directory=/xrally-io",
+                     "--filename=foo", "--rw=randread", "--bs=8192",
+                     "--size=1024", "--direct=0", "--ioengine=psync",
+                     "--unlink=1", "--output-format=json"],
+            volumes={"vol": {"bind": "/xrally-io", "mode": "rw"}},
+            tmpfs=None, entrypoint="fio")
+        self.dclient.delete_volume.assert_called_once_with("vol")
+
+        additive = self.scenario._output["additive"]
+        self.assertEqual(
+            [[["volume randread", 1.0]],
+             [["volume randread", 256]],
+             [["p50", 1.0], ["p95", 2.0], ["p99", 3.0], ["p99.9", 4.0]]],
+            [o["data"] for o in additive])
+
+    def test_run_tmpfs(self):
+        self.scenario.run("fio", target="tmpfs", file_size=1024)
+
+        kwargs = self.dclient.run_container.call_args[1]
+        self.assertEqual({"/xrally-io": "size=1049600"}, kwargs["tmpfs"])
+        self.assertIsNone(kwargs["volumes"])
+        self.assertFalse(self.dclient.create_volume.called)
+
+    def test_run_bind(self):
+        self.assertRaises(exceptions.InvalidArgumentsException,
+                          self.scenario.run, "fio", target="bind")
+
+        self.scenario.run("fio", target="bind", bind_path="/tmp")
+
+        self.assertEqual(
+            {"/tmp": {"bind": "/xrally-io", "mode": "rw"}},
+            self.dclient.run_container.call_args[1]["volumes"])
+
+    def test_run_with_old_fio(self):
+        self.dclient.run_container.return_value = json.dumps(
+            {"jobs": [{"write": {"bw": 1024, "iops": 256,
+                                 "clat": {"percentile": {
+                                     "50.000000": 1000}}}}]})
+
+        self.scenario.run("fio")
+
+        self.assertEqual(
+            [[["overlay write", 1.0]], [["overlay write", 256]],
+             [["p50", 1.0]]],
+            [o["data"] for o in self.scenario._output["additive"]])
+
+
+class CopyFilesTestCase(test.TestCase):
+
+    def test_run(self):
+        dclient = mock.MagicMock()
+        dclient.run_container.return_value.id = "c-id"
+        tarballs = []
+
+        def put_archive(container_id, path, tarball):
+            tarballs.append(tarball)
+            with tarfile.open(tarball) as tar:
+                self.assertEqual(
+                    ["foo", "foo/file-0", "foo/file-1"],
+                    sorted(tar.getnames()))
+                self.assertEqual(10, tar.getmember("foo/file-1").size)
+            return 2048
+
+        dclient.put_archive.side_effect = put_archive
+        dclient.get_archive.return_value = 2048
+        scenario = container.CopyFiles(
+            {"docker": {"images": [{"RepoTags": ["foo:latest"]}]}})
+        scenario.client = dclient
+        scenario.generate_random_name = mock.MagicMock(return_value="foo")
+
+        scenario.run("foo", files_count=2, file_size=10, path="/tmp/")
+
+        dclient.run_container.assert_called_once_with(
+            image_name="foo:latest", command="sleep 3600", detach=True,
+            remove=False)
+        self.assertEqual("/tmp/", dclient.put_archive.call_args[1]["path"])
+        self.assertEqual("/tmp/foo",
+                         dclient.get_archive.call_args[1]["path"])
+        dclient.delete_container.assert_called_once_with("c-id")
+        # temporary files should be removed
+        self.assertFalse(os.path.exists(tarballs[0]))
+        self.assertEqual(
+            [["upload", "download"], ["upload", "download"]],
+            [[d[0] for d in o["data"]]
+             for o in scenario._output["additive"]])
+
+
+class ContainerDensityTestCase(test.TestCase):
+
+    def setUp(self):
+        super(ContainerDensityTestCase, self).setUp()
+        self.dclient = mock.MagicMock()
+        self.started = []
+
+        def start_containers(image_name, count, command, concurrency):
+            ids = ["c%s" % (len(self.started) + i) for i in range(count)]
+            self.started.extend(ids)
+            return ids, [0.1] * count, []
+
+        self.dclient.start_containers.side_effect = start_containers
+        self.dclient.probe_container_requests.return_value = {
+            "list": [0.3, 0.1, 0.2], "inspect": [0.05]}
+        self.scenario = container.ContainerDensity(
+            {"docker": {"images": [{"RepoTags": ["foo:latest"]}]}})
+        self.scenario.client = self.dclient
+        self.daemon_stats = mock.patch(
+            "%s.daemon_stats" % container.__name__).start()
+        self.daemon_stats.is_local.return_value = False
+
+    def _get_output(self, title):
+        for kind in ("additive", "complete"):
+            for output in self.scenario._output[kind]:
+                if output["title"] == title:
+                    return output
+        return None
+
+    def test_run(self):
+        self.daemon_stats.is_local.return_value = True
+        self.daemon_stats.get_memory_usage.return_value = (1048576, 4194304)
+
+        self.scenario.run("foo", max_containers=25, step_size=10,
+                          concurrency=2, command="sleep 10",
+                          requests_count=3)
+
+        self.assertEqual(
+            [mock.call("foo:latest", count=c, command="sleep 10",
+                       concurrency=2) for c in (10, 10, 5)],
+            self.dclient.start_containers.call_args_list)
+        self.assertEqual(
+            [mock.call(c, requests_count=3) for c in ("c9", "c19", "c24")],
+            self.dclient.probe_container_requests.call_args_list)
+        self.dclient.delete_containers.assert_called_once_with(
+            self.started, concurrency=2)
+
+        self.assertEqual([["containers", 25]],
+                         self._get_output("Container density")["data"])
+        self.assertEqual(
+            [["create", [[10, 0.1], [20, 0.1], [25, 0.1]]],
+             ["list", [[10, 0.2], [20, 0.2], [25, 0.2]]],
+             ["inspect", [[10, 0.05], [20, 0.05], [25, 0.05]]]],
+            self._get_output("Latency by the number of containers")["data"])
+        self.assertEqual(
+            [["used", [[10, 1.0], [20, 1.0], [25, 1.0]]]],
+            self._get_output("Host memory usage by the number of "
+                             "containers")["data"])
+        self.assertEqual(
+            ["Stopped at 25 containers: the limit of 25 containers is "
+             "reached."],
+            self._get_output("Container density limit")["data"])
+
+    def test_run_stops_at_latency_growth(self):
+        self.dclient.probe_container_requests.side_effect = [
+            {"list": [0.1], "inspect": [0.1]},
+            {"list": [0.15], "inspect": [0.1]},
+            {"list": [0.3], "inspect": [0.1]}]
+
+        self.scenario.run("foo", max_containers=100, step_size=10,
+                          max_latency_growth=2)
+
+        self.assertEqual(3, self.dclient.start_containers.call_count)
+        self.dclient.delete_containers.assert_called_once_with(
+            self.started, concurrency=10)
+        self.assertEqual(
+            ["Stopped at 30 containers: list latency 0.300s exceeds 2 times "
+             "the latency of the first step (0.100s)."],
+            self._get_output("Container density limit")["data"])
+        self.assertIsNone(self._get_output(
+            "Host memory usage by the number of containers"))
+
+    def test_run_stops_at_max_latency(self):
+        self.scenario.run("foo", step_size=10, max_latency=0.1)
+
+        self.assertEqual(
+            ["Stopped at 10 containers: list latency 0.200s exceeds "
+             "0.100s."],
+            self._get_output("Container density limit")["data"])
+
+    def test_run_stops_at_memory_usage(self):
+        self.daemon_stats.is_local.return_value = True
+        self.daemon_stats.get_memory_usage.side_effect = [(40, 100),
+                                                          (60, 100)]
+
+        self.scenario.run("foo", step_size=10, max_memory_usage=50)
+
+        self.assertEqual(
+            ["Stopped at 20 containers: host memory usage exceeds 50%."],
+            self._get_output("Container density limit")["data"])
+
+    def test_run_stops_when_containers_fail_to_start(self):
+        self.dclient.start_containers.side_effect = [
+            (["c1", "c2"], [0.1, 0.1], []),
+            (["c3"], [0.1], [Exception("oops")])]
+
+        self.scenario.run("foo", step_size=2)
+
+        self.dclient.delete_containers.assert_called_once_with(
+            ["c1", "c2", "c3"], concurrency=2)
+        self.assertEqual(
+            ["Stopped at 2 containers: containers failed to start: oops."],
+            self._get_output("Container density limit")["data"])
+
+    def test_run_fails_at_first_step(self):
+        self.dclient.start_containers.side_effect = [
+            (["c1"], [0.1], [Exception("oops")])]
+
+        self.assertRaises(Exception, self.scenario.run, "foo", step_size=2)
+        self.dclient.delete_containers.assert_called_once_with(
+            ["c1"], concurrency=2)
+        self.assertEqual([], self.scenario._output["complete"])
@@ -0,0 +1,51 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from tests.unit import test
+from xrally_docker.task.scenarios import daemon
+
+
+class FanOutAPICallsTestCase(test.TestCase):
+
+    def setUp(self):
+        super(FanOutAPICallsTestCase, self).setUp()
+        self.dclient = mock.MagicMock()
+        self.scenario = daemon.FanOutAPICalls({"docker": {}})
+        self.scenario.client = self.dclient
+
+    def test_run(self):
+        self.dclient.fan_out.return_value = (
+            [0.1 * i for i in range(100, 0, -1)], [])
+
+        self.scenario.run("info", calls_count=100, concurrency=10)
+
+        self.dclient.fan_out.assert_called_once_with(
+            "info", calls_count=100, concurrency=10)
+        additive = self.scenario._output["additive"]
+        self.assertEqual(["info"], [d[0] for d in additive[0]["data"]])
+        self.assertEqual(
+            [["p50", 5.0], ["p95", 9.5], ["p99", 9.9], ["max", 10.0]],
+            [[k, round(v, 2)] for k, v in additive[1]["data"]])
+        self.assertEqual([["errors", 0]], additive[2]["data"])
+
+    def test_run_with_errors(self):
+        self.dclient.fan_out.return_value = ([], [Exception("oops")])
+
+        self.assertRaises(Exception, self.scenario.run)
+
+        additive = self.scenario._output["additive"]
+        self.assertEqual([["errors", 1]], additive[-1]["data"])
+        self.assertEqual(2, len(additive))
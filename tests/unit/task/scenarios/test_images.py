@@ -0,0 +1,216 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+
+import mock
+
+from tests.unit import test
+from xrally_docker.task.scenarios import images
+
+
+class PullImageTestCase(test.TestCase):
+
+    def test_run_with_registry(self):
+        dclient = mock.MagicMock()
+        scenario = images.PullImage(
+            {"owner_id": "foo-task",
+             "docker": {"registry": {"images": {
+                 "foo:latest": "localhost:5000/foo:rally"}}}})
+        rally_tag = scenario.generate_random_name()
+        dclient.pull_image.return_value = {
+            "Id": "foo-id", "Size": 1048576,
+            "RepoTags": ["localhost:5000/foo:rally",
+                         "localhost:5000/foo:%s" % rally_tag,
+                         "localhost:5000/foo:user-tag",
+                         "localhost:5000/bar:%s" % rally_tag]}
+        scenario.client = dclient
+
+        scenario.run("foo")
+
+        dclient.pull_image.assert_called_once_with(
+            "localhost:5000/foo:rally")
+        self.assertEqual(
+            [mock.call("localhost:5000/foo:rally"),
+             mock.call("localhost:5000/foo:%s" % rally_tag)],
+            dclient.delete_image.call_args_list)
+        output = scenario._output["additive"][0]
+        self.assertEqual("pull", output["data"][0][0])
+
+    def test_run_without_registry(self):
+        dclient = mock.MagicMock()
+        dclient.pull_image.return_value = {"Id": "foo-id", "Size": 1048576}
+        scenario = images.PullImage({"docker": {}})
+        scenario.client = dclient
+
+        scenario.run("localhost:5000/foo")
+
+        dclient.pull_image.assert_called_once_with(
+            "localhost:5000/foo:latest")
+        self.assertFalse(dclient.delete_image.called)
+
+    def test_run_without_deleting(self):
+        dclient = mock.MagicMock()
+        dclient.pull_image.return_value = {"Id": "foo-id", "Size": 1048576}
+        scenario = images.PullImage(
+            {"docker": {"registry": {"images": {}}}})
+        scenario.client = dclient
+
+        scenario.run("localhost:5000/foo", delete_image=False)
+
+        dclient.pull_image.assert_called_once_with(
+            "localhost:5000/foo:latest")
+        self.assertFalse(dclient.delete_image.called)
+
+
+class PushImageTestCase(test.TestCase):
+
+    def test_run(self):
+        dclient = mock.MagicMock()
+        dclient.build_image.return_value = {
+            "RepoTags": ["localhost:5000/xrally-push-0:foo"]}
+        dclient.push_images.return_value = [
+            {"name": "localhost:5000/xrally-push-0:foo", "duration": 2,
+             "size": 2097152,
+             "layers": [{"status": "pushed", "duration": 1},
+                        {"status": "pushed", "duration": 2}]},
+            {"name": "localhost:5000/xrally-push-1:bar", "duration": 1,
+             "size": 0,
+             "layers": [{"status": "exists", "duration": 1},
+                        {"status": "mounted", "duration": 0.5}]}]
+        scenario = images.PushImage(
+            {"docker": {"registry": {"address": "localhost:5000"}}})
+        scenario.client = dclient
+        scenario.generate_random_name = mock.MagicMock(return_value="bar")
+
+        scenario.run(images_count=2, concurrency=2, layers_count=2,
+                     layer_size=10)
+
+        self.assertEqual("localhost:5000/xrally-push-0",
+                         dclient.build_image.call_args[1]["repository"])
+        dclient.tag_image.assert_called_once_with(
+            "localhost:5000/xrally-push-0:foo", tags=["bar"],
+            repository="localhost:5000/xrally-push-1")
+        dclient.push_images.assert_called_once_with(
+            ["localhost:5000/xrally-push-0:foo",
+             "localhost:5000/xrally-push-1:bar"], concurrency=2)
+
+        additive = scenario._output["additive"]
+        self.assertEqual([["pushed", 2], ["exists", 1], ["mounted", 1]],
+                         additive[1]["data"])
+        self.assertEqual([["pushed", 1.5], ["exists", 1], ["mounted", 0.5]],
+                         additive[2]["data"])
+        self.assertEqual(
+            [["localhost:5000/xrally-push-0:foo", 2, 2.0, 2, 0, 0],
+             ["localhost:5000/xrally-push-1:bar", 1, 0.0, 0, 1, 1]],
+            scenario._output["complete"][0]["data"]["rows"])
+
+
+class BuildImageTestCase(test.TestCase):
+
+    def setUp(self):
+        super(BuildImageTestCase, self).setUp()
+        self.dclient = mock.MagicMock()
+        self.dclient.build_image.return_value = {
+            "Id": "foo",
+            "context_size": 1048576,
+            "context_upload_duration": 1,
+            "steps": [{"name": "Step 1/2", "duration": 1, "cached": False},
+                      {"name": "Step 2/2", "duration": 2, "cached": True}],
+            "output": ["foo", "bar"]}
+        self.scenario = images.BuildImage({"docker": {}})
+        self.scenario.client = self.dclient
+
+    def test_run_with_generated_context(self):
+        contexts = []
+
+        def build_image(path, **kwargs):
+            contexts.append(path)
+            with open(os.path.join(path, "Dockerfile")) as f:
+                self.assertEqual("FROM foo\nCOPY layer-0 /layer-0\n"
+                                 "COPY layer-1 /layer-1\n", f.read())
+            self.assertEqual(
+                10, os.path.getsize(os.path.join(path, "layer-1")))
+            return self.dclient.build_image.return_value
+
+        self.dclient.build_image.side_effect = build_image
+
+        self.scenario.run(base_image="foo", layers_count=2, layer_size=10)
+
+        self.dclient.build_image.assert_called_once_with(
+            contexts[0], dockerfile=None, nocache=True)
+        # generated context should be removed
+        self.assertFalse(os.path.exists(contexts[0]))
+
+        self.assertEqual(
+            [[["Step 1/2", 1], ["Step 2/2", 2]],
+             [["cache hits", 50.0]],
+             [["upload", 1]]],
+            [o["data"] for o in self.scenario._output["additive"]])
+        self.assertEqual(["foo", "bar"],
+                         self.scenario._output["complete"][0]["data"])
+
+    def test_run_warm(self):
+        self.scenario.run(context_path="/foo", dockerfile="Dockerfile.x",
+                          mode="warm")
+
+        self.assertEqual(
+            [mock.call("/foo", dockerfile="Dockerfile.x"),
+             mock.call("/foo", dockerfile="Dockerfile.x", nocache=False)],
+            self.dclient.build_image.call_args_list)
+        self.assertEqual(
+            ["prime_build_cache"],
+            [a["name"] for a in self.scenario.atomic_actions()])
+
+
+class SaveAndLoadImageTestCase(test.TestCase):
+
+    def test_run(self):
+        dclient = mock.MagicMock()
+        dclient.save_image.return_value = 1048576
+        paths = []
+
+        def load_image(path):
+            paths.append(path)
+            self.assertTrue(os.path.exists(path))
+
+        dclient.load_image.side_effect = load_image
+        scenario = images.SaveAndLoadImage(
+            {"docker": {"images": [{"RepoTags": ["foo:bar"]}]}})
+        scenario.client = dclient
+
+        scenario.run("foo:bar")
+
+        self.assertFalse(dclient.pull_image.called)
+        dclient.save_image.assert_called_once_with("foo:bar", path=paths[0])
+        self.assertFalse(dclient.delete_image.called)
+        self.assertFalse(os.path.exists(paths[0]))
+        output = scenario._output["additive"][0]
+        self.assertEqual(["save", "load"], [d[0] for d in output["data"]])
+
+    def test_run_with_synthetic_image(self):
+        dclient = mock.MagicMock()
+        dclient.save_image.return_value = 1048576
+        scenario = images.SaveAndLoadImage(
+            {"docker": {
+                "images": [{"RepoTags": ["xrally-synthetic-0:rally"]}],
+                "synthetic_images": {
+                    "xrally-synthetic-0:latest": "xrally-synthetic-0:rally"}}})
+        scenario.client = dclient
+
+        scenario.run("xrally-synthetic-0")
+
+        self.assertFalse(dclient.pull_image.called)
+        self.assertEqual("xrally-synthetic-0:rally",
+                         dclient.save_image.call_args[0][0])
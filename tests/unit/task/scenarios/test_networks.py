@@ -12,7 +12,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
+
 import mock
+from rally import exceptions
 
 from tests.unit import test
 from xrally_docker.task.scenarios import networks
@@ -91,3 +94,128 @@ class CreateAndDeleteNetworkTestCase(test.TestCase):
         dclient.delete_network.assert_called_once_with(
             net["Id"]
         )
+
+
+class ConnectAndDisconnectContainersTestCase(test.TestCase):
+
+    def test_run(self):
+        dclient = mock.MagicMock()
+        dclient.create_network.return_value = {"Id": "net-id"}
+        dclient.run_container.side_effect = [mock.Mock(id="c1"),
+                                             mock.Mock(id="c2")]
+        dclient.connect_containers_to_network.return_value = [("c1", 1),
+                                                              ("c2", 3)]
+        dclient.disconnect_containers_from_network.return_value = [
+            ("c2", 2), ("c1", 2)]
+
+        scenario = networks.ConnectAndDisconnectContainers(
+            {"docker": {"images": [{"RepoTags": ["foo:latest"]}]}})
+        scenario.client = dclient
+
+        scenario.run("foo", containers_count=2, concurrency=1)
+
+        self.assertFalse(dclient.pull_image.called)
+        dclient.create_network.assert_called_once_with(driver=None)
+        self.assertEqual(
+            [mock.call(image_name="foo:latest", command="sleep 3600",
+                       detach=True, remove=False)] * 2,
+            dclient.run_container.call_args_list)
+        dclient.connect_containers_to_network.assert_called_once_with(
+            "net-id", container_ids=["c1", "c2"], concurrency=1)
+        dclient.disconnect_containers_from_network.assert_called_once_with(
+            "net-id", container_ids=["c1", "c2"], concurrency=1)
+        self.assertEqual([mock.call("c1"), mock.call("c2")],
+                         dclient.delete_container.call_args_list)
+        dclient.delete_network.assert_called_once_with("net-id")
+
+        self.assertEqual(
+            [[["avg", 2], ["max", 3]], [["avg", 2], ["max", 2]]],
+            [o["data"] for o in scenario._output["additive"]])
+        self.assertEqual(
+            [[["connect", [[1, 1], [2, 3]]]],
+             [["disconnect", [[1, 2], [2, 2]]]]],
+            [o["data"] for o in scenario._output["complete"]])
+
+
+class NetworkThroughputTestCase(test.TestCase):
+
+    def setUp(self):
+        super(NetworkThroughputTestCase, self).setUp()
+        self.dclient = mock.MagicMock()
+        self.dclient.run_container.return_value.id = "server"
+        self.dclient.get_container_logs.side_effect = [
+            b"", b"Server listening on 5201\nServer listening on 5202\n"]
+        self.dclient.get_container.return_value = {
+            "NetworkSettings": {"Networks": {
+                "net": {"IPAddress": "10.0.0.2"}}}}
+        self.scenario = networks.NetworkThroughput(
+            {"docker": {"images": [{"RepoTags": ["iperf3:latest"]}],
+                        "networks": [{"Name": "net", "Driver": "bridge"}]}})
+        self.scenario.client = self.dclient
+
+    @mock.patch("xrally_docker.task.scenarios.networks.rutils")
+    def test_run_tcp(self, mock_rutils):
+        self.dclient.run_containers.return_value = [
+            json.dumps({"end": {
+                "sum_received": {"bits_per_second": 1000000},
+                "streams": [{"sender": {"mean_rtt": 1000}}]}}).encode(),
+            json.dumps({"end": {
+                "sum_received": {"bits_per_second": 3000000},
+                "streams": [{"sender": {"mean_rtt": 3000}}]}})]
+
+        self.scenario.run("iperf3", clients_count=2, duration=5)
+
+        self.assertEqual(
+            ["-c", "iperf3 -s -p 5201 & iperf3 -s -p 5202 & wait"],
+            self.dclient.run_container.call_args[1]["command"])
+        self.dclient.run_containers.assert_called_once_with(
+            "iperf3:latest",
+            commands=[["-c", "10.0.0.2", "-p", "5201", "-t", "5", "-J"],
+                      ["-c", "10.0.0.2", "-p", "5202", "-t", "5", "-J"]],
+            entrypoint="iperf3", network="net")
+        self.dclient.delete_container.assert_called_once_with("server")
+        self.assertEqual(
+            [[["net (bridge)", 4.0]], [["net (bridge)", 2.0]]],
+            [o["data"] for o in self.scenario._output["additive"]])
+
+    @mock.patch("xrally_docker.task.scenarios.networks.rutils")
+    def test_run_udp(self, mock_rutils):
+        self.dclient.get_container_logs.side_effect = [
+            b"Server listening on 5201\n"]
+        self.dclient.run_containers.return_value = [json.dumps({"end": {
+            "sum": {"bits_per_second": 1000000, "jitter_ms": 0.5,
+                    "lost_percent": 1}}})]
+
+        self.scenario.run("iperf3", protocol="udp", bandwidth="1G")
+
+        self.assertEqual(
+            ["-c", "10.0.0.2", "-p", "5201", "-t", "10", "-J", "-u", "-b",
+             "1G"],
+            self.dclient.run_containers.call_args[1]["commands"][0])
+        self.assertEqual(
+            [[["net (bridge)", 1.0]], [["net (bridge)", 0.5]],
+             [["net (bridge)", 1]]],
+            [o["data"] for o in self.scenario._output["additive"]])
+
+    @mock.patch("xrally_docker.task.scenarios.networks.rutils")
+    def test_run_client_fails(self, mock_rutils):
+        self.dclient.run_containers.return_value = [
+            json.dumps({"error": "unable to connect"}),
+            json.dumps({"error": "unable to connect"})]
+
+        self.assertRaises(exceptions.RallyException, self.scenario.run,
+                          "iperf3", clients_count=2)
+        self.dclient.delete_container.assert_called_once_with("server")
+
+    @mock.patch("xrally_docker.task.scenarios.networks.rutils")
+    @mock.patch("xrally_docker.task.scenarios.networks.time.time")
+    def test_run_server_is_not_started(self, mock_time, mock_rutils):
+        # the atomic action timer uses time.time as well
+        mock_time.side_effect = [0, 0, 100, 100]
+        self.dclient.get_container_logs.side_effect = None
+        self.dclient.get_container_logs.return_value = b""
+
+        self.assertRaises(exceptions.TimeoutException, self.scenario.run,
+                          "iperf3")
+        self.dclient.delete_container.assert_called_once_with("server")
+        self.assertFalse(self.dclient.run_containers.called)
@@ -0,0 +1,91 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from tests.unit import test
+from xrally_docker.task.scenarios import open_loop
+
+
+def _records(count, errors=()):
+    return [{"intended": i * 0.1, "started": i * 0.1 + 0.01,
+             "finished": i * 0.1 + 0.5,
+             "error": Exception("oops") if i in errors else None}
+            for i in range(count)]
+
+
+class OpenLoopCreateAndDeleteNetworkTestCase(test.TestCase):
+
+    def setUp(self):
+        super(OpenLoopCreateAndDeleteNetworkTestCase, self).setUp()
+        self.dclient = mock.MagicMock()
+        self.scenario = open_loop.OpenLoopCreateAndDeleteNetwork(
+            {"docker": {}})
+        self.scenario.client = self.dclient
+
+    def test_run(self):
+        self.dclient.run_open_loop.return_value = _records(10)
+
+        self.scenario.run(rate=10, requests_count=10, driver="bridge")
+
+        self.dclient.run_open_loop.assert_called_once_with(
+            "create_and_delete_network", rate=10, requests_count=10,
+            max_outstanding=None, driver="bridge", labels=None)
+        additive = self.scenario._output["additive"]
+        self.assertEqual(
+            ["Open-loop rate", "Corrected latency", "Service latency",
+             "Schedule lag", "Open-loop errors"],
+            [o["title"] for o in additive])
+        self.assertEqual([["target", 10], ["achieved", 10 / 1.4]],
+                         additive[0]["data"])
+        self.assertEqual(
+            [["p50", 0.5], ["p95", 0.5], ["p99", 0.5], ["max", 0.5]],
+            [[k, round(v, 2)] for k, v in additive[1]["data"]])
+        self.assertEqual([["errors", 0]], additive[-1]["data"])
+        complete = self.scenario._output["complete"][0]
+        self.assertEqual(["intended", "started"],
+                         [d[0] for d in complete["data"]])
+        self.assertEqual([2, 0.11], [round(v, 2)
+                                     for v in complete["data"][1][1][1]])
+
+    def test_run_with_errors(self):
+        self.dclient.run_open_loop.return_value = _records(2, errors=(0, 1))
+
+        self.assertRaises(Exception, self.scenario.run, rate=10,
+                          requests_count=2)
+
+        additive = self.scenario._output["additive"]
+        # no latency of successful operations
+        self.assertEqual(["Open-loop rate", "Schedule lag",
+                          "Open-loop errors"],
+                         [o["title"] for o in additive])
+        self.assertEqual([["errors", 2]], additive[-1]["data"])
+
+
+class OpenLoopRunContainerTestCase(test.TestCase):
+
+    def test_run(self):
+        dclient = mock.MagicMock()
+        dclient.run_open_loop.return_value = _records(3)
+        scenario = open_loop.OpenLoopRunContainer({"docker": {}})
+        scenario.client = dclient
+        scenario._ensure_image = mock.MagicMock()
+
+        scenario.run("busybox", rate=5, requests_count=3, max_outstanding=2,
+                     command="true")
+
+        scenario._ensure_image.assert_called_once_with("busybox")
+        dclient.run_open_loop.assert_called_once_with(
+            "run_container", rate=5, requests_count=3, max_outstanding=2,
+            image_name=scenario._ensure_image.return_value, command="true")
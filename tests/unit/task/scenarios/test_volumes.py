@@ -0,0 +1,64 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from tests.unit import test
+from xrally_docker.task.scenarios import volumes
+
+
+class ListVolumesTestCase(test.TestCase):
+
+    def test_list(self):
+        dclient = mock.MagicMock()
+        dclient.list_volumes.return_value = [
+            {"Name": "foo", "Driver": "local", "Mountpoint": "/foo"}]
+
+        scenario = volumes.ListVolumes({"docker": {}})
+        scenario.client = dclient
+
+        scenario.run(filters={"dangling": True})
+
+        dclient.list_volumes.assert_called_once_with(
+            filters={"dangling": True})
+        self.assertEqual([["foo", "local", "/foo"]],
+                         scenario._output["complete"][0]["data"]["rows"])
+
+    def test_list_empty(self):
+        dclient = mock.MagicMock()
+        dclient.list_volumes.return_value = []
+
+        scenario = volumes.ListVolumes({"docker": {}})
+        scenario.client = dclient
+
+        scenario.run()
+
+        self.assertEqual(["No volumes are available."],
+                         scenario._output["complete"][0]["data"])
+
+
+class CreateAndDeleteVolumeTestCase(test.TestCase):
+
+    def test_run(self):
+        dclient = mock.MagicMock()
+        dclient.create_volume.return_value = {"Name": "foo"}
+
+        scenario = volumes.CreateAndDeleteVolume({"docker": {}})
+        scenario.client = dclient
+
+        scenario.run(driver="local")
+
+        dclient.create_volume.assert_called_once_with(
+            driver="local", driver_opts=None, labels=None)
+        dclient.delete_volume.assert_called_once_with("foo")
@@ -0,0 +1,160 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from rally.task import sla as rally_sla
+
+from tests.unit import test
+from xrally_docker.task.sla import actions
+
+
+def _action(name, started_at, finished_at, children=None, failed=False):
+    action = {"name": name, "started_at": started_at,
+              "finished_at": finished_at, "children": children or []}
+    if failed:
+        action["failed"] = True
+    return action
+
+
+def _iteration(atomic_actions, error=None):
+    return {"atomic_actions": atomic_actions, "error": error or []}
+
+
+class MaxAtomicPercentileTestCase(test.TestCase):
+
+    def test_config_schema(self):
+        self.assertEqual([], rally_sla.SLA.validate(
+            "max_atomic_percentile@docker", None, None,
+            {"percentile": 99, "actions": {"docker.run": 1.5}}))
+        self.assertEqual(1, len(rally_sla.SLA.validate(
+            "max_atomic_percentile@docker", None, None, {"actions": {}})))
+
+    def test_add_iteration(self):
+        sla = actions.MaxAtomicPercentile(
+            {"percentile": 75, "actions": {"docker.get_image": 2.0}})
+
+        self.assertTrue(sla.add_iteration(_iteration([
+            _action("docker.tag_image", 0, 5,
+                    children=[_action("docker.get_image", 0, 1)])])))
+        self.assertTrue(sla.add_iteration(_iteration([
+            _action("docker.get_image", 0, 2)])))
+        # iterations with errors are skipped
+        self.assertTrue(sla.add_iteration(_iteration(
+            [_action("docker.get_image", 0, 10)], error=["Error"])))
+        self.assertFalse(sla.add_iteration(_iteration([
+            _action("docker.get_image", 0, 3),
+            _action("docker.get_image", 3, 6)])))
+
+        self.assertEqual([1, 2, 3, 3], sla.durations["docker.get_image"])
+        self.assertEqual(
+            "Percentile 75 of durations of atomic actions:\n"
+            "Action: 'docker.get_image'. 3.00s <= 2.00s\n"
+            "Status: Failed", sla.details())
+
+    def test_merge(self):
+        sla1 = actions.MaxAtomicPercentile(
+            {"actions": {"docker.run": 2.0, "docker.delete_container": 1}})
+        sla1.add_iteration(_iteration([_action("docker.run", 0, 1)]))
+        sla2 = actions.MaxAtomicPercentile(
+            {"actions": {"docker.run": 2.0, "docker.delete_container": 1}})
+        sla2.add_iteration(_iteration([_action("docker.run", 0, 3)]))
+
+        self.assertFalse(sla1.merge(sla2))
+        self.assertEqual([1, 3], sla1.durations["docker.run"])
+        self.assertEqual(
+            "Percentile 95 of durations of atomic actions:\n"
+            "Action: 'docker.delete_container'. n/a <= 1.00s\n"
+            "Action: 'docker.run'. 3.00s <= 2.00s\n"
+            "Status: Failed", sla1.details())
+
+
+class MinAtomicRateTestCase(test.TestCase):
+
+    def test_add_iteration(self):
+        sla = actions.MinAtomicRate({"min_iterations": 2,
+                                     "actions": {"docker.run": 2}})
+
+        # the rate is not checked until enough iterations are finished
+        self.assertTrue(sla.add_iteration(_iteration([
+            _action("docker.run", 10, 12)])))
+        self.assertIn("less than 2 iterations", sla.details())
+
+        self.assertFalse(sla.add_iteration(_iteration([
+            _action("docker.run_containers", 11, 13, children=[
+                _action("docker.run", 11, 12),
+                _action("docker.run", 11, 12.5)])])))
+        self.assertEqual(1.2, sla._get_rate("docker.run"))
+
+        # failed actions are not counted, but their time is
+        self.assertFalse(sla.add_iteration(_iteration([
+            _action("docker.run", 12, 14),
+            _action("docker.run", 12, 15, failed=True)], error=["Error"])))
+        self.assertEqual(0.8, sla._get_rate("docker.run"))
+        self.assertEqual("Rate of atomic actions:\n"
+                         "Action: 'docker.run'. 0.80 >= 2.00 per second\n"
+                         "Status: Failed", sla.details())
+
+    def test_merge(self):
+        sla1 = actions.MinAtomicRate({"min_iterations": 2,
+                                      "actions": {"docker.run": 0.5}})
+        sla1.add_iteration(_iteration([_action("docker.run", 2, 3)]))
+        sla2 = actions.MinAtomicRate({"min_iterations": 2,
+                                      "actions": {"docker.run": 0.5}})
+        sla2.add_iteration(_iteration([_action("docker.run", 0, 1)]))
+
+        self.assertTrue(sla1.merge(sla2))
+        self.assertEqual({"count": 2, "started": 0, "finished": 3},
+                         sla1.stats["docker.run"])
+
+    def test_details_without_actions(self):
+        sla = actions.MinAtomicRate({"min_iterations": 1,
+                                     "actions": {"docker.run": 1}})
+        self.assertFalse(sla.add_iteration(_iteration([])))
+        self.assertEqual("Rate of atomic actions:\n"
+                         "Action: 'docker.run'. n/a >= 1.00 per second\n"
+                         "Status: Failed", sla.details())
+
+
+class MaxCleanupDurationTestCase(test.TestCase):
+
+    def test_add_iteration(self):
+        sla = actions.MaxCleanupDuration(3.0)
+        self.assertEqual(
+            "Maximum cleanup duration of one iteration n/a <= 3.00s - Passed",
+            sla.details())
+
+        self.assertTrue(sla.add_iteration(_iteration([
+            _action("docker.run", 0, 10),
+            _action("docker.delete_container", 10, 11),
+            _action("docker.delete_network", 11, 13)])))
+        self.assertEqual(3, sla.max_duration)
+        self.assertTrue(sla.add_iteration(_iteration(
+            [_action("docker.delete_container", 0, 10)], error=["Error"])))
+        self.assertFalse(sla.add_iteration(_iteration([
+            _action("docker.delete_volume", 0, 4)])))
+        self.assertEqual("Maximum cleanup duration of one iteration "
+                         "4.00s <= 3.00s - Failed", sla.details())
+
+    def test_merge(self):
+        sla1 = actions.MaxCleanupDuration(3.0)
+        sla1.add_iteration(_iteration([
+            _action("docker.delete_image", 0, 2)]))
+        sla2 = actions.MaxCleanupDuration(3.0)
+
+        self.assertTrue(sla1.merge(sla2))
+        self.assertEqual(2, sla1.max_duration)
+
+        sla2.add_iteration(_iteration([
+            _action("docker.delete_image", 0, 5)]))
+        self.assertFalse(sla1.merge(sla2))
+        self.assertEqual(5, sla1.max_duration)
@@ -0,0 +1,67 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from tests.unit import test
+from xrally_docker.common import daemon_stats
+from xrally_docker.task.sla import daemon
+
+
+def _iteration(timestamp, rss):
+    return {"timestamp": timestamp,
+            "output": {"additive": [
+                {"title": "Docker daemon CPU usage",
+                 "data": [[name, 100] for name in rss]},
+                {"title": daemon_stats.MEMORY_USAGE_TITLE,
+                 "data": sorted(rss.items())}],
+                "complete": []}}
+
+
+class MaxDaemonRSSGrowthTestCase(test.TestCase):
+
+    def test_add_iteration(self):
+        sla = daemon.MaxDaemonRSSGrowth(10)
+
+        # iterations can be finished not in order of starting
+        self.assertTrue(sla.add_iteration(
+            _iteration(2, {"dockerd": 105, "containerd": 20})))
+        self.assertTrue(sla.add_iteration(
+            _iteration(1, {"dockerd": 100, "containerd": 20})))
+        self.assertFalse(sla.add_iteration(
+            _iteration(3, {"dockerd": 112.5, "containerd": 21})))
+        self.assertFalse(sla.add_iteration(
+            _iteration(4, {"dockerd": 90, "containerd": 21})))
+
+        self.assertEqual("Growth of RSS of Docker daemon processes:\n"
+                         "Process 'containerd'. 1.00 MiB <= 10.00 MiB\n"
+                         "Process 'dockerd'. 12.50 MiB <= 10.00 MiB\n"
+                         "Status: Failed", sla.details())
+
+    def test_add_iteration_without_samples(self):
+        sla = daemon.MaxDaemonRSSGrowth(10)
+
+        self.assertTrue(sla.add_iteration(
+            {"timestamp": 1, "output": {"additive": [], "complete": []}}))
+        self.assertEqual(
+            "RSS of Docker daemon processes is not sampled - Passed",
+            sla.details())
+
+    def test_merge(self):
+        sla1 = daemon.MaxDaemonRSSGrowth(10)
+        sla1.add_iteration(_iteration(3, {"dockerd": 105}))
+        sla2 = daemon.MaxDaemonRSSGrowth(10)
+        sla2.add_iteration(_iteration(1, {"dockerd": 100}))
+        sla2.add_iteration(_iteration(2, {"dockerd": 120}))
+
+        self.assertFalse(sla1.merge(sla2))
+        self.assertEqual({"dockerd": 20}, sla1._get_growth())
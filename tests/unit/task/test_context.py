@@ -0,0 +1,58 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import docker
+import mock
+from rally import exceptions
+
+from tests.unit import test
+from xrally_docker.task.contexts import volumes
+
+
+class BaseDockerContextTestCase(test.TestCase):
+
+    def setUp(self):
+        super(BaseDockerContextTestCase, self).setUp()
+        self.ctx = {"env": {"platforms": {"docker": {}}},
+                    "owner_id": "foo-bar",
+                    "config": {"volumes@docker": {}}}
+        # the base class is abstract, so one of contexts is used
+        with mock.patch.object(docker, "DockerClient"):
+            self.ctx_obj = volumes.VolumesContext(self.ctx)
+
+    def test__create_resources(self):
+        resources = []
+
+        self.ctx_obj._create_resources(lambda i: i * 2, [1, 2, 3],
+                                       resources=resources,
+                                       resource_name="foo", threads=2)
+
+        self.assertEqual([2, 4, 6], sorted(resources))
+
+    def test__create_resources_fails(self):
+        resources = []
+
+        def create(item):
+            if item % 2:
+                raise Exception("oops")
+            return item
+
+        e = self.assertRaises(
+            exceptions.ContextSetupFailure,
+            self.ctx_obj._create_resources, create, [1, 2, 3, 4],
+            resources=resources, resource_name="foo", threads=1)
+
+        self.assertIn("Failed to create 2 foo(s)", "%s" % e)
+        # created resources should be kept for the cleanup
+        self.assertEqual([2, 4], resources)
@@ -0,0 +1,231 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+
+import mock
+
+from tests.unit import test
+from xrally_docker.task import scenario
+
+
+BASE = "xrally_docker.task.scenario"
+
+
+class FakeScenario(scenario.BaseDockerScenario):
+
+    def run(self, error=None):
+        self.generate_random_name()
+        if error:
+            raise error
+        return "result"
+
+
+class BaseDockerScenarioTestCase(test.TestCase):
+
+    @mock.patch("%s.service.Docker" % BASE)
+    def test_init(self, mock_docker):
+        spec = {"host": "tcp://a"}
+        scenario.BaseDockerScenario({"env": {"platforms": {"docker": spec}}})
+
+        self.assertEqual(spec, mock_docker.call_args[0][0])
+
+    @mock.patch("%s.service.Docker" % BASE)
+    def test_init_with_daemon_info(self, mock_docker):
+        mock_docker.DAEMON_INFO_KEYS = ("Driver", "NCPU")
+        spec = {"host": "tcp://a", "daemon": {"Driver": "overlay2"}}
+
+        scen = scenario.BaseDockerScenario(
+            {"env": {"platforms": {"docker": spec}}, "iteration": 1})
+
+        self.assertEqual(
+            {"cols": ["Property", "tcp://a"],
+             "rows": [["Driver", "overlay2"], ["NCPU", None]]},
+            scen._output["complete"][0]["data"])
+
+        # the info is saved only once per workload
+        scen = scenario.BaseDockerScenario(
+            {"env": {"platforms": {"docker": spec}}, "iteration": 2})
+        self.assertEqual([], scen._output["complete"])
+
+    @mock.patch("%s.sharding.ROUTER" % BASE)
+    @mock.patch("%s.service.Docker" % BASE)
+    def test_init_with_several_hosts(self, mock_docker, mock_router):
+        mock_router.select.return_value = 1
+        mock_router.get_latency.side_effect = [0.5, None]
+        hosts = [{"host": "tcp://a"}, {"host": "tcp://b"}]
+        spec = {"host": "tcp://a", "hosts": hosts, "sharding": "hash"}
+
+        scen = scenario.BaseDockerScenario(
+            {"env": {"platforms": {"docker": spec}}, "iteration": 3})
+
+        self.assertEqual(hosts[1], mock_docker.call_args[0][0])
+        mock_router.select.assert_called_once_with(2, "hash", 3)
+        mock_router.track.assert_called_once_with(1, scen.atomic_actions())
+        self.assertEqual(
+            [[["tcp://a", 0], ["tcp://b", 1]], [["tcp://a", 0.5]]],
+            [o["data"] for o in scen._output["additive"]])
+
+    @mock.patch("%s.sharding.ROUTER" % BASE)
+    @mock.patch("%s.service.Docker" % BASE)
+    def test_init_with_several_hosts_and_networks(self, mock_docker,
+                                                  mock_router):
+        hosts = [{"host": "tcp://a"}, {"host": "tcp://b"}]
+        spec = {"host": "tcp://a", "hosts": hosts}
+
+        scen = scenario.BaseDockerScenario(
+            {"env": {"platforms": {"docker": spec}}, "iteration": 2,
+             "docker": {"networks": [{"Id": "foo"}]}})
+
+        # networks exist at the first host only
+        self.assertEqual(hosts[0], mock_docker.call_args[0][0])
+        self.assertEqual("tcp://a", scen._host)
+        self.assertFalse(mock_router.select.called)
+
+    @mock.patch("%s.daemon_stats" % BASE)
+    @mock.patch("%s.time.time" % BASE)
+    @mock.patch("%s.service.Docker" % BASE)
+    def test_init_with_daemon_monitor(self, mock_docker, mock_time,
+                                      mock_daemon_stats):
+        # the timer of reading samples calls time.time too
+        mock_time.side_effect = [10, 15, 15, 16]
+        output = {"title": "foo", "chart_plugin": "Lines",
+                  "data": [["dockerd", 1]]}
+        mock_daemon_stats.make_output.return_value = [output]
+        scen = FakeScenario(
+            {"env": {"platforms": {"docker": {}}}, "owner_id": "foo-bar",
+             "docker": {"daemon_monitor": {"path": "/foo"}}})
+
+        self.assertRaises(ValueError, scen.run, error=ValueError)
+
+        mock_daemon_stats.read_samples.assert_called_once_with(
+            "/foo", since=10, until=15)
+        mock_daemon_stats.make_output.assert_called_once_with(
+            mock_daemon_stats.read_samples.return_value)
+        self.assertEqual([output], scen._output["additive"])
+        self.assertEqual(1, scen.idle_duration())
+
+    @mock.patch("%s.time.time" % BASE)
+    @mock.patch("%s.service.Docker" % BASE)
+    def test_init_with_events(self, mock_docker, mock_time):
+        mock_time.side_effect = [10, 11, 15, 12]
+        dclient = mock_docker.return_value
+        scen = FakeScenario(
+            {"env": {"platforms": {"docker": {}}}, "owner_id": "foo-bar",
+             "docker": {"events": {"types": ["container"]}}})
+        names = scen._generated_names
+
+        def event(action, timestamp, name):
+            return {"Type": "container", "Action": action,
+                    "timeNano": timestamp * 10 ** 9,
+                    "Actor": {"ID": name, "Attributes": {"name": name}}}
+
+        dclient.list_events.side_effect = lambda **kw: [
+            event("start", 12, name) for name in names] + [
+            event("create", 11, name) for name in names] + [
+            event("create", 11, "alien")]
+
+        self.assertEqual("result", scen.run())
+        name = list(names)[0]
+
+        dclient.list_events.assert_called_once_with(
+            since=10, until=15, filters={"type": ["container"]})
+        self.assertEqual(1, scen.idle_duration())
+        additive = scen._output["additive"]
+        self.assertEqual(
+            ["Daemon-side duration of container create-start"],
+            [o["title"] for o in additive])
+        self.assertEqual([["avg", 1], ["max", 1]], additive[0]["data"])
+        complete = scen._output["complete"]
+        self.assertEqual([[1, "container", "create", name],
+                          [2, "container", "start", name]],
+                         complete[0]["data"]["rows"])
+
+    @mock.patch("%s.service.Docker" % BASE)
+    def test_init_with_events_fails(self, mock_docker):
+        mock_docker.return_value.list_events.side_effect = Exception("oops")
+        scen = FakeScenario(
+            {"env": {"platforms": {"docker": {}}}, "owner_id": "foo-bar",
+             "docker": {"events": {"types": ["container"]}}})
+
+        self.assertRaises(ValueError, scen.run, error=ValueError())
+        self.assertEqual([], scen._output["additive"])
+        self.assertEqual([], scen._output["complete"])
+
+    def test__get_image_name(self):
+        scen = scenario.BaseDockerScenario(
+            {"docker": {"registry": {"images": {
+                "foo:latest": "localhost:5000/foo:rally"}}}})
+
+        self.assertEqual("localhost:5000/foo:rally",
+                         scen._get_image_name("foo"))
+        self.assertEqual("bar:baz", scen._get_image_name("bar:baz"))
+        self.assertEqual("localhost:5000/bar:latest",
+                         scen._get_image_name("localhost:5000/bar"))
+
+    @mock.patch("%s.service.Docker" % BASE)
+    def test__ensure_image_loaded_by_context(self, mock_docker):
+        scen = scenario.BaseDockerScenario(
+            {"env": {"platforms": {"docker": {}}}, "owner_id": "foo-bar",
+             "docker": {"images": [{"RepoTags": ["foo:latest"]}]}})
+
+        self.assertEqual("foo:latest", scen._ensure_image("foo"))
+        self.assertFalse(mock_docker.return_value.pull_image.called)
+
+    @mock.patch("%s.service.Docker" % BASE)
+    def test__ensure_image(self, mock_docker):
+        pull_image = mock_docker.return_value.pull_image
+        pull_image.side_effect = [Exception("oops"), {}, {}]
+        ctx = {"env": {"platforms": {"docker": {"host": "tcp://a"}}},
+               "owner_id": "foo-bar", "docker": {"images": []}}
+
+        scen = scenario.BaseDockerScenario(ctx)
+        self.assertRaises(Exception, scen._ensure_image, "foo")
+        # the failed pull is retried
+        self.assertEqual("foo:latest", scen._ensure_image("foo"))
+        self.assertEqual("foo:latest",
+                         scenario.BaseDockerScenario(ctx)._ensure_image("foo"))
+        self.assertEqual(2, pull_image.call_count)
+        pull_image.assert_called_with("foo:latest")
+
+        # the image is pulled again for another workload
+        ctx["owner_id"] = "bar-foo"
+        scenario.BaseDockerScenario(ctx)._ensure_image("foo")
+        self.assertEqual(3, pull_image.call_count)
+
+    @mock.patch("%s.service.Docker" % BASE)
+    def test__ensure_image_single_flight(self, mock_docker):
+        started = threading.Event()
+        release = threading.Event()
+
+        def pull_image(name):
+            started.set()
+            release.wait(5)
+
+        mock_docker.return_value.pull_image.side_effect = pull_image
+        ctx = {"env": {"platforms": {"docker": {}}}, "owner_id": "foo-bar"}
+
+        threads = [threading.Thread(
+            target=scenario.BaseDockerScenario(ctx)._ensure_image,
+            args=("foo",)) for i in range(3)]
+        threads[0].start()
+        started.wait(5)
+        for t in threads[1:]:
+            t.start()
+        release.set()
+        for t in threads:
+            t.join(5)
+
+        mock_docker.return_value.pull_image.assert_called_once_with(
+            "foo:latest")
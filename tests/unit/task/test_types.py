@@ -0,0 +1,66 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from tests.unit import test
+from xrally_docker.task import types
+
+
+class DockerImageTestCase(test.TestCase):
+
+    def _get_context(self, pull_missing=True, hosts=None):
+        spec = {"host": "tcp://a"}
+        if hosts:
+            spec["hosts"] = hosts
+        return {"config": {"images@docker": {"pull_missing": pull_missing}},
+                "env": {"platforms": {"docker": spec}},
+                "docker": {"images": [{"RepoTags": ["foo:latest"]}]}}
+
+    @mock.patch("xrally_docker.task.types.service.Docker")
+    def test_pre_process(self, mock_docker):
+        mock_docker.return_value.pull_image.return_value = {
+            "RepoTags": ["bar:latest"]}
+        ctx = self._get_context()
+
+        self.assertIsNone(types.DockerImage(ctx).pre_process("bar", {}))
+
+        mock_docker.assert_called_once_with({"host": "tcp://a"})
+        mock_docker.return_value.pull_image.assert_called_once_with(
+            "bar:latest")
+        self.assertEqual([{"RepoTags": ["foo:latest"]},
+                          {"RepoTags": ["bar:latest"]}],
+                         ctx["docker"]["images"])
+
+        # the image is known now
+        types.DockerImage(ctx).pre_process("bar", {})
+        self.assertEqual(1, mock_docker.return_value.pull_image.call_count)
+
+    @mock.patch("xrally_docker.task.types.service.Docker")
+    def test_pre_process_with_several_hosts(self, mock_docker):
+        hosts = [{"host": "tcp://a"}, {"host": "tcp://b"}]
+        ctx = self._get_context(hosts=hosts)
+
+        types.DockerImage(ctx).pre_process("bar:1", {})
+
+        self.assertEqual([mock.call(h) for h in hosts],
+                         mock_docker.call_args_list)
+        self.assertEqual(2, mock_docker.return_value.pull_image.call_count)
+
+    @mock.patch("xrally_docker.task.types.service.Docker")
+    def test_pre_process_is_disabled(self, mock_docker):
+        types.DockerImage(self._get_context(False)).pre_process("bar", {})
+        types.DockerImage(self._get_context()).pre_process("foo", {})
+
+        self.assertFalse(mock_docker.called)
@@ -23,6 +23,8 @@ class TestCase(testtools.TestCase):
     def setUp(self):
         super(TestCase, self).setUp()
         self.addCleanup(mock.patch.stopall)
+        # images pulled by scenarios are cached per process
+        mock.patch.dict("xrally_docker.task.scenario._PULLED_IMAGES").start()
 
     def assertSequenceEqual(self, iterable_1, iterable_2, msg=None):
         self.assertEqual(tuple(iterable_1), tuple(iterable_2), msg)
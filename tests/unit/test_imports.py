@@ -0,0 +1,34 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from tests.ci import import_time
+from tests.unit import test
+
+
+class PluginsImportTestCase(test.TestCase):
+
+    def test_heavy_modules_are_not_imported(self):
+        # plugins are loaded at every invocation of rally CLI, so the docker
+        #   SDK should be imported only when a client is built
+        #   (Rally itself may import some of the heavy modules)
+        base = import_time.measure([])
+        result = import_time.measure(import_time.list_plugin_modules())
+        self.assertEqual(set(), set(result["heavy"]) - set(base["heavy"]))
+
+    def test_list_plugin_modules(self):
+        modules = import_time.list_plugin_modules()
+        self.assertIn("xrally_docker", modules)
+        self.assertIn("xrally_docker.service", modules)
+        self.assertIn("xrally_docker.task.scenarios.images", modules)
+        self.assertNotIn("xrally_docker.task.__init__", modules)
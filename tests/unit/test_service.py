@@ -12,7 +12,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import os
+import shutil
+import socket
+import tempfile
+
 import mock
+import six
 
 from tests.unit import test
 from xrally_docker import service
@@ -85,6 +91,90 @@ class DockerServiceTestCase(test.TestCase):
             version="auto"
         )
 
+    def test___init___with_transport_options(self):
+        from requests import adapters
+
+        self.client_cls.reset_mock()
+        adapter = adapters.HTTPAdapter()
+        self.client.api.adapters = {"http://": adapter}
+        self.client.api.headers = {}
+
+        service.Docker({"host": "tcp://foo", "max_pool_size": 100,
+                        "use_ssh_client": False, "keep_alive": False,
+                        "socket_receive_buffer": 4096})
+
+        self.client_cls.assert_called_once_with(
+            base_url="tcp://foo", timeout=60, tls=False, version="auto",
+            max_pool_size=100, use_ssh_client=False)
+        self.assertEqual({"Connection": "close"}, self.client.api.headers)
+        pool_kw = adapter.poolmanager.connection_pool_kw
+        self.assertEqual(100, pool_kw["maxsize"])
+        self.assertEqual((socket.SOL_SOCKET, socket.SO_RCVBUF, 4096),
+                         pool_kw["socket_options"][-1])
+
+    def test___init___with_transport_options_and_tls(self):
+        from docker import tls
+        from requests import adapters
+
+        class SSLHTTPAdapter(adapters.HTTPAdapter):
+            # the signature of the TLS adapter of docker SDK < 7.0
+            def init_poolmanager(self, connections, maxsize, block=False):
+                super(SSLHTTPAdapter, self).init_poolmanager(
+                    connections, maxsize, block=block, ssl_version=None)
+
+        p_mock_tls = mock.patch.object(tls, "TLSConfig")
+        p_mock_tls.start()
+        self.addCleanup(p_mock_tls.stop)
+        adapter = SSLHTTPAdapter()
+        self.client.api.adapters = {"https://": adapter}
+        self.client.api.headers = {}
+
+        service.Docker({"host": "tcp://foo", "tls_verify": True,
+                        "cert_path": "/foo", "max_pool_size": 100,
+                        "socket_send_buffer": 4096})
+
+        pool_kw = adapter.poolmanager.connection_pool_kw
+        self.assertEqual(100, pool_kw["maxsize"])
+        self.assertIsNone(pool_kw["ssl_version"])
+        self.assertEqual((socket.SOL_SOCKET, socket.SO_SNDBUF, 4096),
+                         pool_kw["socket_options"][-1])
+
+    def test___init___with_max_pool_size_of_unix_socket(self):
+        # unix socket adapter is configured by docker SDK itself
+        self.client.api.adapters = {"http+docker://": mock.Mock()}
+
+        service.Docker({"host": "unix:///foo", "max_pool_size": 100})
+
+        self.assertFalse(
+            self.client.api.adapters["http+docker://"].init_poolmanager.called)
+
+    def test___init___with_socket_options_of_unix_socket(self):
+        from docker import transport
+
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.addCleanup(server.close)
+        server.bind(os.path.join(path, "docker.sock"))
+        server.listen(1)
+        adapter = transport.UnixHTTPAdapter(
+            "http+unix://%s" % os.path.join(path, "docker.sock"))
+        self.client.api.adapters = {"http+docker://": adapter}
+        self.client.api.headers = {}
+
+        service.Docker({"host": "unix://%s/docker.sock" % path,
+                        "keep_alive": False, "socket_send_buffer": 8192})
+
+        self.assertEqual({"Connection": "close"}, self.client.api.headers)
+        conn = adapter.get_connection(
+            "http+docker://localhost/_ping")._new_conn()
+        conn.connect()
+        self.addCleanup(conn.close)
+        # linux doubles the value to leave space for the bookkeeping
+        self.assertIn(conn.sock.getsockopt(socket.SOL_SOCKET,
+                                           socket.SO_SNDBUF),
+                      (8192, 16384))
+
     def test_get_info(self):
         self.client.version.return_value = {"Version": 3}
 
@@ -93,22 +183,104 @@ class DockerServiceTestCase(test.TestCase):
 
         self.client.version.assert_called_once_with()
 
+    def test_ping(self):
+        self.assertEqual(self.client.ping.return_value, self.docker.ping())
+        self.client.ping.assert_called_once_with()
+
+    def test_get_daemon_info(self):
+        self.client.info.return_value = {"Driver": "overlay2", "NCPU": 4,
+                                         "Name": "some-host"}
+
+        info = self.docker.get_daemon_info()
+
+        self.assertEqual(set(service.Docker.DAEMON_INFO_KEYS), set(info))
+        self.assertEqual("overlay2", info["Driver"])
+        self.assertEqual(4, info["NCPU"])
+        self.assertIsNone(info["CgroupDriver"])
+
+    def test_stream_events(self):
+        self.assertEqual(
+            self.client.api.events.return_value,
+            self.docker.stream_events(filters={"type": ["container"]}))
+        self.client.api.events.assert_called_once_with(
+            since=None, filters={"type": ["container"]}, decode=True)
+
+    def test_list_events(self):
+        self.client.api.events.return_value = iter([{"id": "1"}])
+
+        self.assertEqual([{"id": "1"}],
+                         self.docker.list_events(since=1, until=2))
+        self.client.api.events.assert_called_once_with(
+            since=1, until=2, filters=None, decode=True)
+
+    def test_fan_out(self):
+        self.client.api.containers.side_effect = [[], Exception("oops"), []]
+
+        durations, errors = self.docker.fan_out("list_containers",
+                                                calls_count=3, concurrency=2)
+
+        self.assertEqual(3, self.client.api.containers.call_count)
+        self.assertEqual(2, len(durations))
+        self.assertEqual(["oops"], [str(e) for e in errors])
+        self.assertEqual(["docker.fan_out"],
+                         [a["name"] for a in self.docker._atomic_actions])
+
+    def test_run_open_loop(self):
+        self.client.api.create_network.return_value = {"Id": "net"}
+
+        records = self.docker.run_open_loop(
+            "create_and_delete_network", rate=1000, requests_count=2,
+            driver="bridge")
+
+        self.assertEqual([None, None], [r["error"] for r in records])
+        self.client.api.create_network.assert_called_with(
+            self.name_generator.return_value, driver="bridge", labels=None)
+        self.assertEqual(2, self.client.api.create_network.call_count)
+        self.client.api.remove_network.assert_called_with("net")
+        self.assertEqual(["docker.open_loop"],
+                         [a["name"] for a in self.docker._atomic_actions])
+
+    def test__run_and_remove_container(self):
+        self.assertEqual(
+            self.client.containers.run.return_value,
+            self.docker._run_and_remove_container("busybox", command="true"))
+        self.client.containers.run.assert_called_once_with(
+            image="busybox:latest", name=self.name_generator.return_value,
+            command="true", remove=True)
+
     def test__fix_the_name(self):
         self.assertEqual("foo:bar", self.docker._fix_the_name("foo:bar"))
         self.assertEqual("foo:latest", self.docker._fix_the_name("foo"))
+        self.assertEqual("localhost:5000/foo:latest",
+                         self.docker._fix_the_name("localhost:5000/foo"))
+        self.assertEqual("localhost:5000/foo:bar",
+                         self.docker._fix_the_name("localhost:5000/foo:bar"))
 
     def test_pull_image(self):
-        image_obj = self.client.images.get.return_value
+        image_obj = self.client.images.pull.return_value
         image_name = "foo:bar"
 
         image = self.docker.pull_image(image_name)
-        self.assertNotEqual(
-            self.client.images.pull.return_value.attrs, image)
         self.assertEqual(image_obj.attrs, image)
 
         self.client.images.pull.assert_called_once_with(image_name)
         image_obj.tag.assert_called_once_with("foo",
                                               self.name_generator.return_value)
+        image_obj.reload.assert_called_once_with()
+        # the pulled image object should be reused
+        self.assertFalse(self.client.images.get.called)
+
+        # no tagging without name generator
+        docker = service.Docker({})
+        image_obj.reset_mock()
+        self.assertEqual(image_obj.attrs, docker.pull_image(image_name))
+        self.assertFalse(image_obj.tag.called)
+        self.assertFalse(image_obj.reload.called)
+
+    def test_get_image(self):
+        self.assertEqual(self.client.images.get.return_value.attrs,
+                         self.docker.get_image("foo"))
+        self.client.images.get.assert_called_once_with("foo:latest")
 
     def test_tag_image(self):
         image_obj = self.client.images.get.return_value
@@ -121,12 +293,292 @@ class DockerServiceTestCase(test.TestCase):
             [mock.call("foo", t) for t in tags],
             image_obj.tag.call_args_list
         )
+        self.client.images.get.assert_called_once_with(image_name)
+        image_obj.reload.assert_called_once_with()
+        self.assertEqual(["docker.tag_image"],
+                         [a["name"] for a in self.docker._atomic_actions])
 
         image_obj.tag.reset_mock()
         self.docker.tag_image(image_name)
         image_obj.tag.assert_called_once_with(
             "foo", self.name_generator.return_value)
 
+    def test_tag_image_with_repository(self):
+        image_obj = self.client.images.get.return_value
+
+        self.docker.tag_image("foo", tags=["bar"],
+                              repository="localhost:5000/foo")
+
+        self.client.images.get.assert_called_once_with("foo:latest")
+        image_obj.tag.assert_called_once_with("localhost:5000/foo", "bar")
+
+    @mock.patch("xrally_docker.service.time.time")
+    def test_push_image(self, mock_time):
+        mock_time.side_effect = range(10)
+        self.client.api.push.return_value = iter([
+            {"status": "The push refers to repository [localhost:5000/foo]"},
+            {"id": "l1", "status": "Preparing"},
+            {"id": "l2", "status": "Preparing"},
+            {"id": "l1", "status": "Pushing",
+             "progressDetail": {"current": 5, "total": 10}},
+            {"id": "l2", "status": "Layer already exists"},
+            {"id": "l1", "status": "Pushed"},
+            {"status": "bar: digest: sha256:a size: 1"},
+            {"aux": {"Tag": "bar", "Digest": "sha256:a", "Size": 1}}])
+
+        result = self.docker.push_image("localhost:5000/foo:bar")
+
+        self.client.api.push.assert_called_once_with(
+            "localhost:5000/foo", tag="bar", stream=True, decode=True)
+        self.assertEqual(
+            {"name": "localhost:5000/foo:bar",
+             "digest": "sha256:a",
+             "duration": 6,
+             "size": 10,
+             "layers": [
+                 {"id": "l1", "status": "pushed", "size": 10, "duration": 4},
+                 {"id": "l2", "status": "exists", "size": 0, "duration": 2}]},
+            result)
+        self.assertEqual(["docker.push_image"],
+                         [a["name"] for a in self.docker._atomic_actions])
+
+    def test_push_images(self):
+        self.client.api.push.side_effect = lambda *a, **kw: iter(
+            [{"id": "l1", "status": "Mounted from foo"}])
+
+        results = self.docker.push_images(["foo:1", "foo:2"], concurrency=1)
+
+        self.assertEqual(["foo:1", "foo:2"], [r["name"] for r in results])
+        self.assertEqual(["mounted", "mounted"],
+                         [r["layers"][0]["status"] for r in results])
+        self.assertEqual(["docker.push_images"],
+                         [a["name"] for a in self.docker._atomic_actions])
+
+    def test_push_image_fails(self):
+        import docker
+
+        self.client.api.push.return_value = iter([{"status": "Pushing"},
+                                                  {"error": "denied"}])
+
+        self.assertRaises(docker.errors.APIError,
+                          self.docker.push_image, "localhost:5000/foo")
+
+    def test_delete_image(self):
+        self.docker.delete_image("foo:bar")
+        self.client.images.remove.assert_called_once_with(image="foo:bar",
+                                                          force=False)
+
+    def _get_temp_path(self, name):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        return os.path.join(tmp_dir, name)
+
+    def test_save_image(self):
+        self.client.api.get_image.return_value = iter([b"abc", b"de"])
+        path = self._get_temp_path("foo.tar")
+
+        self.assertEqual(5, self.docker.save_image("foo", path=path))
+
+        self.client.api.get_image.assert_called_once_with("foo:latest")
+        with open(path, "rb") as f:
+            self.assertEqual(b"abcde", f.read())
+
+    def test_put_archive(self):
+        path = self._get_temp_path("foo.tar")
+        with open(path, "wb") as f:
+            f.write(b"abc")
+
+        def put_archive(container_id, path, data):
+            # the file object should be passed to stream it
+            self.assertEqual(b"abc", data.read())
+
+        self.client.api.put_archive.side_effect = put_archive
+
+        self.assertEqual(3, self.docker.put_archive("c-id", path="/tmp",
+                                                    tarball=path))
+        self.assertEqual(1, self.client.api.put_archive.call_count)
+
+    def test_get_archive(self):
+        self.client.api.get_archive.return_value = (iter([b"abc", b"de"]),
+                                                    {"size": 5})
+        path = self._get_temp_path("foo.tar")
+
+        self.assertEqual(5, self.docker.get_archive("c-id", path="/tmp/foo",
+                                                    tarball=path))
+
+        self.client.api.get_archive.assert_called_once_with("c-id",
+                                                            "/tmp/foo")
+        with open(path, "rb") as f:
+            self.assertEqual(b"abcde", f.read())
+
+    def test_load_image(self):
+        import docker
+
+        path = self._get_temp_path("foo.tar")
+        with open(path, "wb") as f:
+            f.write(b"abc")
+        self.client.api.load_image.return_value = iter([
+            {"stream": "Loaded image: foo:bar\n"},
+            {"stream": "Loaded image ID: sha256:abcd\n"}])
+
+        self.assertEqual(["foo:bar", "sha256:abcd"],
+                         self.docker.load_image(path))
+        self.assertEqual(
+            path, self.client.api.load_image.call_args[0][0].name)
+
+        self.client.api.load_image.return_value = iter([
+            {"error": "invalid tar header"}])
+        self.assertRaises(docker.errors.ImageLoadError,
+                          self.docker.load_image, path)
+
+    @mock.patch("docker.utils.tar")
+    def test_build_image(self, mock_tar):
+        context = six.BytesIO(b"x" * 10)
+        mock_tar.return_value = context
+        self.client.api.build.return_value = iter([
+            {"stream": "Step 1/2 : FROM busybox\n"},
+            {"stream": " ---> 1234\n"},
+            {"stream": "Step 2/2 : COPY foo /foo\n"},
+            {"stream": " ---> Using cache\n"},
+            {"aux": {"ID": "sha256:abcd"}},
+            {"stream": "Successfully built abcd\n"}])
+
+        image = self.docker.build_image("/foo", nocache=True)
+
+        mock_tar.assert_called_once_with("/foo", exclude=[])
+        tag = "xrally:%s" % self.name_generator.return_value
+        self.client.api.build.assert_called_once_with(
+            fileobj=context, custom_context=True, tag=tag, dockerfile=None,
+            nocache=True, pull=False, buildargs=None, labels=None, rm=True,
+            forcerm=True, decode=True)
+        self.assertTrue(context.closed)
+        self.assertEqual("sha256:abcd", image["Id"])
+        self.assertEqual([tag], image["RepoTags"])
+        self.assertEqual(10, image["context_size"])
+        self.assertIsNotNone(image["context_upload_duration"])
+        self.assertEqual(
+            [("Step 1/2 : FROM busybox", False),
+             ("Step 2/2 : COPY foo /foo", True)],
+            [(s["name"], s["cached"]) for s in image["steps"]])
+        self.assertEqual(5, len(image["output"]))
+
+    @mock.patch("docker.utils.tar")
+    def test_build_image_fails(self, mock_tar):
+        import docker
+
+        mock_tar.return_value = six.BytesIO(b"")
+        self.client.api.build.return_value = iter([
+            {"stream": "Step 1/1 : FROM foo\n"},
+            {"error": "pull access denied"}])
+
+        self.assertRaises(docker.errors.BuildError,
+                          self.docker.build_image, "/foo")
+
+    def test_run_container(self):
+        self.assertEqual(
+            self.client.containers.run.return_value,
+            self.docker.run_container("foo", command="ls",
+                                      tmpfs={"/foo": "size=1"},
+                                      entrypoint="sh"))
+        self.client.containers.run.assert_called_once_with(
+            image="foo:latest", name=self.name_generator.return_value,
+            command="ls", detach=False, stdout=True, stderr=False,
+            remove=True, ports=None, volumes=None, tmpfs={"/foo": "size=1"},
+            entrypoint="sh", network=None)
+
+    def test_run_containers(self):
+        self.client.containers.run.side_effect = (
+            lambda image, name, command, **kwargs: command.upper())
+
+        self.assertEqual(
+            ["FOO", "BAR", "BAZ"],
+            self.docker.run_containers("foo", commands=["foo", "bar", "baz"],
+                                       concurrency=2, network="net"))
+        self.assertEqual(
+            [mock.call(image="foo:latest",
+                       name=self.name_generator.return_value, command=c,
+                       remove=True, network="net")
+             for c in ("bar", "baz", "foo")],
+            sorted(self.client.containers.run.call_args_list,
+                   key=lambda c: c[1]["command"]))
+        self.assertEqual(["docker.run_containers"],
+                         [a["name"] for a in self.docker._atomic_actions])
+
+    def test_run_containers_fails(self):
+        self.client.containers.run.side_effect = [Exception("oops"), "foo"]
+
+        self.assertRaises(Exception, self.docker.run_containers, "foo",
+                          commands=["foo", "bar"], concurrency=1)
+
+    def test_start_containers(self):
+        self.client.api.create_container.side_effect = [
+            {"Id": "c1"}, Exception("oops"), {"Id": "c3"}]
+
+        ids, durations, errors = self.docker.start_containers(
+            "foo", count=3, command="sleep 10", concurrency=1)
+
+        self.assertEqual(["c1", "c3"], ids)
+        self.assertEqual(2, len(durations))
+        self.assertEqual(["oops"], [str(e) for e in errors])
+        self.client.api.create_container.assert_called_with(
+            image="foo:latest", command="sleep 10",
+            name=self.name_generator.return_value)
+        self.assertEqual([mock.call("c1"), mock.call("c3")],
+                         self.client.api.start.call_args_list)
+        self.assertEqual(["docker.start_containers"],
+                         [a["name"] for a in self.docker._atomic_actions])
+
+    def test_probe_container_requests(self):
+        durations = self.docker.probe_container_requests(
+            "c-id", requests_count=2)
+
+        self.assertEqual(["inspect", "list"], sorted(durations))
+        self.assertEqual([2, 2], [len(v) for v in durations.values()])
+        self.assertEqual([mock.call(all=True)] * 2,
+                         self.client.api.containers.call_args_list)
+        self.assertEqual([mock.call("c-id")] * 2,
+                         self.client.api.inspect_container.call_args_list)
+
+    def test_get_container_logs(self):
+        self.assertEqual(self.client.api.logs.return_value,
+                         self.docker.get_container_logs("c-id"))
+        self.client.api.logs.assert_called_once_with("c-id", stdout=True,
+                                                     stderr=True)
+
+    def test_create_volume(self):
+        self.assertEqual(self.client.api.create_volume.return_value,
+                         self.docker.create_volume(driver="local",
+                                                   labels={"foo": "bar"}))
+        name = self.name_generator.return_value
+        self.client.api.create_volume.assert_called_once_with(
+            name=name, driver="local", driver_opts=None,
+            labels={"foo": "bar", "org.xrally.owner": name})
+
+        self.client.api.create_volume.reset_mock()
+        self.docker.create_volume(name="foo")
+        self.client.api.create_volume.assert_called_once_with(
+            name="foo", driver=None, driver_opts=None,
+            labels={"org.xrally.owner": name})
+
+    def test_get_volume(self):
+        self.assertEqual(self.client.api.inspect_volume.return_value,
+                         self.docker.get_volume("foo"))
+        self.client.api.inspect_volume.assert_called_once_with("foo")
+
+    def test_list_volumes(self):
+        self.client.api.volumes.return_value = {"Volumes": None}
+        self.assertEqual([], self.docker.list_volumes())
+        self.client.api.volumes.assert_called_once_with(filters=None)
+
+        self.client.api.volumes.return_value = {"Volumes": [{"Name": "a"}]}
+        self.assertEqual([{"Name": "a"}],
+                         self.docker.list_volumes(filters={"label": "x"}))
+
+    def test_delete_volume(self):
+        self.docker.delete_volume("foo")
+        self.client.api.remove_volume.assert_called_once_with(
+            "foo", force=False)
+
     def test_create_network(self):
         driver = "foo"
         options = "options"
@@ -180,20 +632,128 @@ class DockerServiceTestCase(test.TestCase):
             net_id)
 
     def test_list_networks(self):
-        networks = [mock.MagicMock(), mock.MagicMock()]
-        self.client.networks.list.return_value = networks
+        networks = [{"Id": "id1", "Name": "n1", "Driver": "d"},
+                    {"Id": "id2", "Name": "n2", "Driver": "d"}]
+        self.client.api.networks.return_value = networks
 
         ids = ["id1", "id2"]
         names = ["name1"]
         driver = "foo"
         label = "label"
         ntype = "type"
-        detailed = True
 
-        self.assertEqual([n.attrs for n in networks],
+        self.assertEqual(networks,
                          self.docker.list_networks(
                              ids=ids, names=names, driver=driver, label=label,
-                             ntype=ntype, detailed=detailed))
-        self.client.networks.list.assert_called_once_with(
-            ids=ids, names=names, greedy=detailed,
-            filters={"type": ntype, "label": label, "driver": driver})
+                             ntype=ntype, filters={"scope": "local"}))
+        self.client.api.networks.assert_called_once_with(
+            ids=ids, names=names,
+            filters={"type": ntype, "label": label, "driver": driver,
+                     "scope": "local"})
+        self.assertFalse(self.client.api.inspect_network.called)
+
+    def test_list_networks_detailed(self):
+        self.client.api.networks.return_value = [{"Id": "id1"}]
+
+        self.assertEqual([self.client.api.inspect_network.return_value],
+                         self.docker.list_networks(detailed=True))
+        self.client.api.inspect_network.assert_called_once_with("id1")
+
+    def test_iter_networks_summary(self):
+        self.client.api.networks.return_value = [
+            {"Id": "id1", "Name": "n1", "Driver": "d", "IPAM": {}}]
+
+        networks = self.docker.iter_networks(summary=True)
+
+        self.assertFalse(self.client.api.networks.called)
+        self.assertEqual([{"Id": "id1", "Name": "n1", "Driver": "d"}],
+                         list(networks))
+        self.client.api.networks.assert_called_once_with(
+            ids=None, names=None, filters={})
+
+    def test_list_images(self):
+        self.client.api.images.return_value = [{"Id": "id1"},
+                                               {"Id": "id2"}]
+        filters = {"label": "foo"}
+
+        self.assertEqual(
+            [self.client.images.get.return_value.attrs] * 2,
+            self.docker.list_images(all=True, filters=filters))
+        self.client.api.images.assert_called_once_with(all=True,
+                                                       filters=filters)
+        self.assertEqual([mock.call("id1"), mock.call("id2")],
+                         self.client.images.get.call_args_list)
+
+    def test_iter_images_summary(self):
+        self.client.api.images.return_value = [
+            {"Id": "id1", "RepoTags": ["foo:bar"], "Size": 1},
+            {"Id": "id2", "RepoTags": None}]
+
+        images = self.docker.iter_images(summary=True)
+
+        self.assertFalse(self.client.api.images.called)
+        self.assertEqual([{"Id": "id1", "RepoTags": ["foo:bar"]},
+                          {"Id": "id2", "RepoTags": []}],
+                         list(images))
+        self.client.api.images.assert_called_once_with(all=False,
+                                                       filters=None)
+        self.assertFalse(self.client.images.get.called)
+
+    def test_get_container(self):
+        self.assertEqual(self.client.containers.get.return_value.attrs,
+                         self.docker.get_container("c-id"))
+        self.client.containers.get.assert_called_once_with("c-id")
+
+    def test_list_containers(self):
+        containers = [mock.MagicMock(), mock.MagicMock()]
+        self.client.containers.list.return_value = containers
+
+        self.assertEqual([c.attrs for c in containers],
+                         self.docker.list_containers())
+        self.client.containers.list.assert_called_once_with(all=True,
+                                                            filters=None)
+
+    def test_delete_container(self):
+        self.docker.delete_container("c-id")
+        self.client.api.remove_container.assert_called_once_with(
+            "c-id", force=True, v=False)
+
+    def test_delete_containers(self):
+        self.docker.delete_containers(["c1", "c2"], concurrency=2)
+
+        self.assertEqual(
+            [mock.call("c1", force=True), mock.call("c2", force=True)],
+            sorted(self.client.api.remove_container.call_args_list))
+        self.assertEqual(["docker.delete_containers"],
+                         [a["name"] for a in self.docker._atomic_actions])
+
+    def test_delete_containers_fails(self):
+        self.client.api.remove_container.side_effect = [Exception("oops"),
+                                                        None]
+
+        self.assertRaises(Exception, self.docker.delete_containers,
+                          ["c1", "c2"], concurrency=1)
+        self.assertEqual(2, self.client.api.remove_container.call_count)
+
+    def test_connect_containers_to_network(self):
+        result = self.docker.connect_containers_to_network(
+            "net-id", container_ids=["c1", "c2"], concurrency=2)
+
+        self.assertEqual(["c1", "c2"], sorted(c_id for c_id, d in result))
+        self.assertEqual(
+            [mock.call("c1", "net-id"), mock.call("c2", "net-id")],
+            sorted(self.client.api.connect_container_to_network
+                   .call_args_list))
+
+    def test_disconnect_containers_from_network(self):
+        api = self.client.api
+        api.disconnect_container_from_network.side_effect = [
+            None, Exception("oops")]
+
+        self.assertRaises(Exception,
+                          self.docker.disconnect_containers_from_network,
+                          "net-id", container_ids=["c1", "c2"],
+                          concurrency=1)
+        self.assertEqual(
+            [mock.call("c1", "net-id"), mock.call("c2", "net-id")],
+            api.disconnect_container_from_network.call_args_list)
@@ -0,0 +1,60 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Generator of build contexts for synthetic images."""
+
+import os
+
+
+def _write_file(path, size, compressibility):
+    # the compressible part is filled with zeros
+    random_size = int(round(size * (1 - compressibility)))
+    with open(path, "wb") as f:
+        f.write(os.urandom(random_size))
+        f.write(b"\0" * (size - random_size))
+
+
+def generate(path, base_image="scratch", layers_count=1, layer_size=1048576,
+             files_per_layer=1, compressibility=0.0):
+    """Generate a build context with random data.
+
+    Each layer of the image is a separate file (or a directory with several
+    files) added by COPY instruction.
+
+    :param path: a path to an existing directory to generate context in
+    :param base_image: the image to use in FROM instruction. ``scratch``
+        does not require any image to be present.
+    :param layers_count: a number of layers to add
+    :param layer_size: a size of each layer in bytes
+    :param files_per_layer: a number of files to split each layer into
+    :param compressibility: a fraction of each file which can be compressed
+        (0 means random content, 1 means zeros only)
+    """
+    with open(os.path.join(path, "Dockerfile"), "w") as f:
+        f.write("FROM %s\n" % base_image)
+        for i in range(layers_count):
+            f.write("COPY layer-%s /layer-%s\n" % (i, i))
+    for i in range(layers_count):
+        layer_path = os.path.join(path, "layer-%s" % i)
+        if files_per_layer == 1:
+            _write_file(layer_path, layer_size, compressibility)
+            continue
+        os.mkdir(layer_path)
+        file_size = layer_size // files_per_layer
+        for j in range(files_per_layer):
+            if j == files_per_layer - 1:
+                # the last file gets the remainder
+                file_size += layer_size % files_per_layer
+            _write_file(os.path.join(layer_path, "file-%s" % j), file_size,
+                        compressibility)
@@ -20,6 +20,7 @@ from rally.common import logging
 from rally.common.plugin import discover
 from rally.common.plugin import plugin
 from rally.common import utils as rutils
+import six
 
 from xrally_docker.common.cleanup import resources
 from xrally_docker import service
@@ -31,7 +32,7 @@ LOG = logging.getLogger(__name__)
 class SeekAndDestroy(object):
 
     def __init__(self, manager_cls, client, resource_classes=None,
-                 owner_id=None):
+                 owner_id=None, raw_resources=None):
         """Resource deletion class.
 
         This class contains method exterminate() that finds and deletes
@@ -42,12 +43,15 @@ class SeekAndDestroy(object):
         :param resource_classes: Resource classes to match resource names
                                  against
         :param owner_id: The UUID of an owner to match resource names against
+        :param raw_resources: A list of known raw resources to delete instead
+                              of discovering them via manager_cls.list
         """
         self.manager_cls = manager_cls
         self.client = client
         self.resource_classes = resource_classes or [
             rutils.RandomNameGeneratorMixin]
         self.owner_id = owner_id
+        self.raw_resources = raw_resources
 
     def _delete_single_resource(self, resource):
         """Safe resource deletion with retries and timeouts.
@@ -61,9 +65,12 @@ class SeekAndDestroy(object):
                          that should be deleted.
         """
 
+        names = resource.name()
+        if isinstance(names, six.string_types):
+            names = [names]
         msg_kw = {
             "uuid": resource.id(),
-            "name": "; ".join(resource.name()),
+            "name": "; ".join(names),
             "resource": resource._name
         }
 
@@ -113,6 +120,11 @@ class SeekAndDestroy(object):
         deletion.
         """
 
+        if self.raw_resources is not None:
+            for raw_resource in self.raw_resources:
+                queue.append(self.manager_cls(raw_resource, self.client))
+            return
+
         try:
             for raw_resource in rutils.retry(
                     3, self.manager_cls.list, self.client):
@@ -170,7 +182,8 @@ def find_resource_managers(names=None):
     return resource_managers
 
 
-def cleanup(spec, names=None, superclass=plugin.Plugin, owner_id=None):
+def cleanup(spec, names=None, superclass=plugin.Plugin, owner_id=None,
+            raw_resources=None):
     """Generic cleaner.
 
     This method goes through all plugins. Filter those and left only plugins
@@ -185,6 +198,9 @@ def cleanup(spec, names=None, superclass=plugin.Plugin, owner_id=None):
     :param owner_id: The UUID of an owner of resource. If it was created at
         workload level, it should be workload UUID. If it was created at
         subtask level, it should be subtask UUID.
+    :param raw_resources: A dict with resource manager names as keys and lists
+        of known raw resources as values. Resources of such managers are not
+        discovered, only the specified ones are deleted.
     """
     resource_classes = [cls for cls in discover.itersubclasses(superclass)
                         if issubclass(cls, rutils.RandomNameGeneratorMixin)]
@@ -192,10 +208,19 @@ def cleanup(spec, names=None, superclass=plugin.Plugin, owner_id=None):
                                            rutils.RandomNameGeneratorMixin):
         resource_classes.append(superclass)
 
-    docker = service.Docker(spec)
-
-    for manager in find_resource_managers(names):
-        LOG.debug("Cleaning up docker %s objects" % manager._name)
-        SeekAndDestroy(manager, docker,
-                       resource_classes=resource_classes,
-                       owner_id=owner_id).exterminate()
+    raw_resources = raw_resources or {}
+
+    # scenarios may create resources at any host of multi-host platform,
+    #   while known raw resources are created by contexts at the first one
+    for i, host_spec in enumerate(spec.get("hosts") or [spec]):
+        docker = service.Docker(host_spec)
+        for manager in find_resource_managers(names):
+            if manager._name in raw_resources and i > 0:
+                continue
+            LOG.debug("Cleaning up docker %s objects at %s"
+                      % (manager._name, host_spec.get("host")))
+            SeekAndDestroy(manager, docker,
+                           resource_classes=resource_classes,
+                           owner_id=owner_id,
+                           raw_resources=raw_resources.get(manager._name)
+                           ).exterminate()
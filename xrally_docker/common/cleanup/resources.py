@@ -15,6 +15,8 @@
 
 from rally.common import cfg
 
+from xrally_docker import service
+
 CONF = cfg.CONF
 
 
@@ -101,11 +103,54 @@ class ResourceManager(object):
 
 @configure("image")
 class Image(ResourceManager):
+    """Image tag.
+
+    Each tag of an image is a separate resource, so only tags created by
+    Rally are removed. The image itself is removed with its last tag.
+    """
+
+    @classmethod
+    def list(cls, client):
+        # tags are enough to find images, so there is no need to inspect
+        #   each image
+        return [cls(tag, client)
+                for image in client.list_images(summary=True)
+                for tag in image["RepoTags"] or []]
+
+    def id(self):
+        return self.raw_resource
+
+    def name(self):
+        return self.raw_resource.rsplit(":", 1)[1]
+
+
+@configure("container", order=-1)
+class Container(ResourceManager):
     def name(self):
-        return [tag.split(":", 1)[1]
-                for tag in self.raw_resource["RepoTags"]]
+        return self.raw_resource["Name"].lstrip("/")
 
 
 @configure("network")
 class Network(ResourceManager):
     pass
+
+
+@configure("volume")
+class Volume(ResourceManager):
+    """Volume created by Rally.
+
+    Volumes are owned by the label with a random name, so volumes with any
+    name can be found.
+    """
+
+    @classmethod
+    def list(cls, client):
+        return [cls(volume, client) for volume in client.list_volumes(
+            filters={"label": service.OWNER_LABEL})]
+
+    def id(self):
+        return self.raw_resource["Name"]
+
+    def name(self):
+        return (self.raw_resource.get("Labels") or {}).get(
+            service.OWNER_LABEL, "")
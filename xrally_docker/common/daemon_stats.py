@@ -0,0 +1,303 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Helpers for sampling resource usage of local Docker daemon processes."""
+
+import json
+import os
+import threading
+import time
+
+from rally.common import logging
+
+
+LOG = logging.getLogger(__name__)
+
+PROC_PATH = "/proc"
+
+MEMORY_USAGE_TITLE = "Docker daemon memory usage"
+
+# samples read by the current process from files of samplers. They are read
+#   incrementally, so each iteration reads only new lines of the file
+_READ_SAMPLES = {}
+_LOCK = threading.Lock()
+
+
+def is_local(spec):
+    """Check whether the docker platform spec points to a local daemon."""
+    host = spec.get("host")
+    return not host or host.startswith("unix://")
+
+
+def find_processes(names):
+    """Find pids of processes by their names.
+
+    :param names: a list of process names (as they appear in
+        ``/proc/<pid>/comm``)
+    :returns: a dict with process names as keys and lists of pids as values
+    """
+    pids = dict((name, []) for name in names)
+    for pid in os.listdir(PROC_PATH):
+        if not pid.isdigit():
+            continue
+        try:
+            with open(os.path.join(PROC_PATH, pid, "comm")) as f:
+                comm = f.read().strip()
+        except (IOError, OSError):
+            # the process has gone
+            continue
+        if comm in pids:
+            pids[comm].append(int(pid))
+    return pids
+
+
+def sample_process(pid):
+    """Collect CPU time, RSS and a number of open FDs of the process.
+
+    :returns: a dict with ``cpu_time`` (seconds), ``rss`` (bytes) and ``fds``
+        (None if /proc/<pid>/fd is not readable) keys
+    """
+    proc = os.path.join(PROC_PATH, str(pid))
+    with open(os.path.join(proc, "stat")) as f:
+        # the second field (comm) may include spaces, so let's skip it
+        fields = f.read().rsplit(")", 1)[1].split()
+    # utime and stime are 14th and 15th fields, the first two are cut above
+    cpu_time = ((int(fields[11]) + int(fields[12])) /
+                float(os.sysconf("SC_CLK_TCK")))
+
+    rss = 0
+    with open(os.path.join(proc, "status")) as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                rss = int(line.split()[1]) * 1024
+                break
+
+    try:
+        fds = len(os.listdir(os.path.join(proc, "fd")))
+    except (IOError, OSError):
+        fds = None
+
+    return {"cpu_time": cpu_time, "rss": rss, "fds": fds}
+
+
+def get_memory_usage():
+    """Get memory usage of the local host.
+
+    :returns: a tuple of used and total memory in bytes. Page cache and
+        other reclaimable memory is not counted as used.
+    """
+    meminfo = {}
+    with open(os.path.join(PROC_PATH, "meminfo")) as f:
+        for line in f:
+            key, value = line.split(":", 1)
+            meminfo[key] = int(value.split()[0]) * 1024
+    # MemAvailable is missed in kernels older than 3.14
+    available = meminfo.get("MemAvailable", meminfo["MemFree"])
+    return meminfo["MemTotal"] - available, meminfo["MemTotal"]
+
+
+def get_goroutines(metrics_url, timeout=5):
+    """Get a number of goroutines from the daemon metrics endpoint.
+
+    The metrics endpoint is enabled via ``metrics-addr`` option of dockerd.
+    """
+    import requests
+
+    resp = requests.get(metrics_url, timeout=timeout)
+    resp.raise_for_status()
+    for line in resp.text.splitlines():
+        if line.startswith("go_goroutines "):
+            return int(float(line.split()[1]))
+    return None
+
+
+def take_snapshot(pids, metrics_url=None):
+    """Sample all processes at once.
+
+    :param pids: a dict with process names as keys and lists of pids as
+        values (see `find_processes`)
+    :param metrics_url: an URL of daemon metrics endpoint
+    """
+    snapshot = {"timestamp": time.time(), "processes": {},
+                "goroutines": None}
+    for name, name_pids in pids.items():
+        stats = {"cpu_time": 0, "rss": 0, "fds": None}
+        for pid in name_pids:
+            try:
+                p_stats = sample_process(pid)
+            except (IOError, OSError):
+                LOG.debug("Failed to sample %s process (pid %s)."
+                          % (name, pid))
+                continue
+            stats["cpu_time"] += p_stats["cpu_time"]
+            stats["rss"] += p_stats["rss"]
+            if p_stats["fds"] is not None:
+                stats["fds"] = (stats["fds"] or 0) + p_stats["fds"]
+        snapshot["processes"][name] = stats
+
+    if metrics_url:
+        try:
+            snapshot["goroutines"] = get_goroutines(metrics_url)
+        except Exception as e:
+            LOG.debug("Failed to get goroutines from %s: %s"
+                      % (metrics_url, e))
+    return snapshot
+
+
+class Sampler(object):
+    """Sample daemon processes at a fixed interval in a background thread.
+
+    Samples are appended to a file as JSON lines, so iterations which are
+    run by other processes can read samples taken during them (see
+    `read_samples`).
+    """
+
+    def __init__(self, pids, path, metrics_url=None, interval=1.0):
+        """Init the sampler.
+
+        :param pids: a dict with process names as keys and lists of pids as
+            values (see `find_processes`)
+        :param path: a path of the file to append samples to
+        :param metrics_url: an URL of daemon metrics endpoint
+        :param interval: time between samples in seconds
+        """
+        self._pids = pids
+        self._path = path
+        self._metrics_url = metrics_url
+        self._interval = interval
+        self._stopped = threading.Event()
+        self._thread = None
+        self.baseline = None
+        self.samples = []
+
+    def _sample(self, previous):
+        """Take a snapshot and calculate CPU usage since the previous one.
+
+        :returns: a tuple of the snapshot and the sample
+        """
+        snapshot = take_snapshot(self._pids, self._metrics_url)
+        duration = snapshot["timestamp"] - previous["timestamp"]
+        processes = {}
+        for name, stats in snapshot["processes"].items():
+            prev_cpu = previous["processes"].get(name, stats)["cpu_time"]
+            usage = 0.0
+            if duration > 0:
+                usage = (max(stats["cpu_time"] - prev_cpu, 0) * 100.0 /
+                         duration)
+            processes[name] = {"cpu": round(usage, 2), "rss": stats["rss"],
+                               "fds": stats["fds"]}
+        return snapshot, {"timestamp": snapshot["timestamp"],
+                          "processes": processes,
+                          "goroutines": snapshot["goroutines"]}
+
+    def _run(self):
+        previous = self.baseline
+        with open(self._path, "a") as f:
+            while not self._stopped.wait(self._interval):
+                previous, sample = self._sample(previous)
+                self.samples.append(sample)
+                f.write(json.dumps(sample) + "\n")
+                f.flush()
+
+    def start(self):
+        self.baseline = take_snapshot(self._pids, self._metrics_url)
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Stop sampling.
+
+        :returns: a list of samples
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.samples
+
+
+def read_samples(path, since, until):
+    """Read samples taken by `Sampler` between since and until.
+
+    If there are no samples in the period (e.g. it is shorter than the
+    interval of the sampler), the latest sample taken before its end is
+    returned.
+
+    :param path: a path of the file of the sampler
+    :param since: the beginning of the period as a timestamp
+    :param until: the end of the period as a timestamp
+    :returns: a list of samples
+    """
+    with _LOCK:
+        cache = _READ_SAMPLES.setdefault(path, {"offset": 0, "samples": []})
+        with open(path, "rb") as f:
+            f.seek(cache["offset"])
+            for line in iter(f.readline, b""):
+                if not line.endswith(b"\n"):
+                    # the sample is being written at the moment
+                    break
+                cache["offset"] += len(line)
+                cache["samples"].append(json.loads(line.decode("utf-8")))
+        samples = cache["samples"]
+    period = [s for s in samples if since <= s["timestamp"] <= until]
+    if not period:
+        period = [s for s in samples if s["timestamp"] <= until][-1:]
+    return period
+
+
+def make_output(samples):
+    """Transform samples taken during the iteration into additive outputs.
+
+    CPU usage is averaged over samples, other values are peaks.
+
+    :param samples: a list of samples (see `read_samples`)
+    """
+    cpu, rss, fds = [], [], []
+    names = sorted(samples[-1]["processes"]) if samples else []
+    for name in names:
+        values = [s["processes"][name] for s in samples
+                  if name in s["processes"]]
+        cpu.append([name, round(sum(v["cpu"] for v in values) /
+                                len(values), 2)])
+        rss.append([name, round(max(v["rss"] for v in values) /
+                                1048576.0, 2)])
+        name_fds = [v["fds"] for v in values if v["fds"] is not None]
+        if name_fds:
+            fds.append([name, max(name_fds)])
+    goroutines = [s["goroutines"] for s in samples
+                  if s["goroutines"] is not None]
+
+    outputs = []
+    if cpu:
+        outputs.append({"title": "Docker daemon CPU usage",
+                        "description": "Average CPU usage of daemon "
+                                       "processes during the iteration.",
+                        "chart_plugin": "Lines",
+                        "label": "%",
+                        "data": cpu})
+        outputs.append({"title": MEMORY_USAGE_TITLE,
+                        "description": "Peak resident set size of daemon "
+                                       "processes during the iteration.",
+                        "chart_plugin": "Lines",
+                        "label": "MiB",
+                        "data": rss})
+    if fds:
+        outputs.append({"title": "Docker daemon open file descriptors",
+                        "chart_plugin": "Lines",
+                        "data": fds})
+    if goroutines:
+        outputs.append({"title": "Docker daemon goroutines",
+                        "chart_plugin": "Lines",
+                        "data": [["goroutines", max(goroutines)]]})
+    return outputs
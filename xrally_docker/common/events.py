@@ -0,0 +1,133 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Helpers for recording and analysing events of Docker daemon."""
+
+import threading
+
+from rally.common import logging
+
+
+LOG = logging.getLogger(__name__)
+
+EVENT_TYPES = ("container", "image", "network", "volume")
+
+# pairs of actions which bound daemon-side phases of resources lifecycle
+PHASES = (("container", "create", "start"),
+          ("container", "start", "die"),
+          ("container", "die", "destroy"),
+          ("network", "create", "destroy"),
+          ("volume", "create", "destroy"))
+
+
+def get_actor_name(event):
+    """Get the name of a resource which the event is related to.
+
+    It is a name of container, network or image tag. Volumes are identified
+    by their names.
+    """
+    actor = event.get("Actor") or {}
+    return (actor.get("Attributes") or {}).get("name") or actor.get("ID")
+
+
+def get_timestamp(event):
+    """Get the daemon-side timestamp of the event in seconds."""
+    if "timeNano" in event:
+        return event["timeNano"] / 1000000000.0
+    return float(event["time"])
+
+
+def matches_names(event, names):
+    """Check whether the event is related to one of resources.
+
+    :param event: an event
+    :param names: a collection of names of resources. An image tag matches
+        the name of image as well, so images tagged with random names are
+        found.
+    """
+    name = get_actor_name(event) or ""
+    return name in names or name.rpartition(":")[2] in names
+
+
+def get_phases(events):
+    """Calculate durations of lifecycle phases of resources.
+
+    :param events: a list of events
+    :returns: a list of tuples with a title of phase and a list of durations
+        (one per resource) for phases which are found in the events
+    """
+    timestamps = {}
+    for event in events:
+        # some actions include details, e.g. "exec_start: sh -c ls"
+        action = event.get("Action", "").split(":")[0]
+        key = (event.get("Type"), (event.get("Actor") or {}).get("ID"))
+        timestamps.setdefault(key, {}).setdefault(action,
+                                                  get_timestamp(event))
+
+    phases = []
+    for etype, start, end in PHASES:
+        durations = [actions[end] - actions[start]
+                     for (t, actor), actions in sorted(timestamps.items())
+                     if t == etype and start in actions and end in actions]
+        if durations:
+            phases.append(("%s %s-%s" % (etype, start, end), durations))
+    return phases
+
+
+class Recorder(object):
+    """Record events of the daemon in a background thread."""
+
+    def __init__(self, client, types=EVENT_TYPES, matcher=None):
+        """Init the recorder.
+
+        :param client: an instance of Docker service
+        :param types: types of events to subscribe to
+        :param matcher: a function which accepts an event and returns True
+            if it should be recorded. All events are recorded by default.
+        """
+        self._client = client
+        self._types = list(types)
+        self._matcher = matcher
+        self._stream = None
+        self._thread = None
+        self._stopped = False
+        self.events = []
+
+    def _consume(self):
+        try:
+            for event in self._stream:
+                if self._matcher is None or self._matcher(event):
+                    self.events.append(event)
+        except Exception as e:
+            if not self._stopped:
+                LOG.warning("Recording of Docker events is interrupted: %s"
+                            % e)
+
+    def start(self):
+        self._stream = self._client.stream_events(
+            filters={"type": self._types})
+        self._thread = threading.Thread(target=self._consume)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, timeout=5):
+        """Unsubscribe from events.
+
+        :returns: a list of recorded events
+        """
+        self._stopped = True
+        if self._stream is not None:
+            self._stream.close()
+            self._thread.join(timeout)
+        return self.events
@@ -0,0 +1,102 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Open-loop (arrival-rate) driver of requests.
+
+Unlike a closed-loop runner, where a new request is issued only when the
+previous one is finished, requests are issued at a fixed rate regardless of
+their completion. A slow daemon does not reduce the rate, so latency spikes
+are not hidden (so-called coordinated omission).
+"""
+
+import threading
+import time
+
+from six.moves import queue as Queue
+
+
+def run(func, rate, requests_count, max_outstanding=None):
+    """Call func at the target rate independently of its completion.
+
+    Each request has an intended start time which is defined by the schedule
+    only. If all workers are busy, the request waits for a free one, and the
+    waiting time is a part of its corrected latency.
+
+    :param func: a function to call. It accepts an index of the request.
+    :param rate: a target number of requests per second
+    :param requests_count: a number of requests to issue
+    :param max_outstanding: a maximum number of simultaneous requests.
+        Defaults to the number of requests, i.e. a request never waits for a
+        previous one.
+    :returns: a list of dicts with ``intended``, ``started`` and
+        ``finished`` timestamps and ``error`` (None for successful requests)
+        in order of the schedule
+    """
+    records = [None] * requests_count
+    requests = Queue.Queue()
+
+    def worker():
+        while True:
+            request = requests.get()
+            if request is None:
+                return
+            index, intended = request
+            started = time.time()
+            error = None
+            try:
+                func(index)
+            except Exception as e:
+                error = e
+            records[index] = {"intended": intended,
+                              "started": started,
+                              "finished": time.time(),
+                              "error": error}
+
+    workers = []
+    for i in range(min(max_outstanding or requests_count, requests_count)):
+        thread = threading.Thread(target=worker)
+        thread.daemon = True
+        thread.start()
+        workers.append(thread)
+
+    begin = time.time()
+    for index in range(requests_count):
+        intended = begin + float(index) / rate
+        delay = intended - time.time()
+        if delay > 0:
+            time.sleep(delay)
+        requests.put((index, intended))
+
+    for thread in workers:
+        requests.put(None)
+    for thread in workers:
+        thread.join()
+    return records
+
+
+def summarize(records):
+    """Calculate latency statistics of open-loop requests.
+
+    :param records: the result of `run`
+    :returns: a dict with sorted lists of ``service`` (from the actual start)
+        and ``corrected`` (from the intended start) latencies of successful
+        requests, sorted ``lag`` of actual starts behind the schedule and
+        a list of ``errors``
+    """
+    succeeded = [r for r in records if r["error"] is None]
+    return {
+        "service": sorted(r["finished"] - r["started"] for r in succeeded),
+        "corrected": sorted(r["finished"] - r["intended"] for r in succeeded),
+        "lag": sorted(r["started"] - r["intended"] for r in records),
+        "errors": [r["error"] for r in records if r["error"] is not None]}
@@ -23,7 +23,15 @@ DOCKER_OPTS = [
     cfg.IntOpt("cleanup_threads",
                default=20,
                deprecated_group="cleanup",
-               help="Number of cleanup threads to run")
+               help="Number of cleanup threads to run"),
+    cfg.IntOpt("networks_context_threads",
+               default=10,
+               help="Number of threads to create networks in parallel at "
+                    "networks@docker context"),
+    cfg.IntOpt("volumes_context_threads",
+               default=10,
+               help="Number of threads to create volumes in parallel at "
+                    "volumes@docker context")
 ]
 
 
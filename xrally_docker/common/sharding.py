@@ -0,0 +1,90 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Distribution of workload iterations across several Docker hosts."""
+
+import collections
+import threading
+import zlib
+
+
+class HostRouter(object):
+    """Select a Docker host for each iteration.
+
+    The observed latency of a host is an exponentially weighted moving
+    average of durations of atomic actions of iterations run at the host by
+    the current process.
+    """
+
+    # a weight of the latest observation
+    ALPHA = 0.3
+    # a number of recent iterations which atomic actions are tracked
+    MAX_TRACKED = 1000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latency = {}
+        self._tracked = collections.deque(maxlen=self.MAX_TRACKED)
+
+    def _collect(self):
+        for tracked in self._tracked:
+            index, actions, consumed = tracked
+            # atomic actions are appended at start and get finished_at key
+            #   at the end
+            while consumed < len(actions) and (
+                    "finished_at" in actions[consumed]):
+                action = actions[consumed]
+                duration = action["finished_at"] - action["started_at"]
+                if index in self._latency:
+                    duration = (self.ALPHA * duration +
+                                (1 - self.ALPHA) * self._latency[index])
+                self._latency[index] = duration
+                consumed += 1
+            tracked[2] = consumed
+
+    def get_latency(self, index):
+        """Get the observed latency of the host or None."""
+        with self._lock:
+            self._collect()
+            return self._latency.get(index)
+
+    def select(self, hosts_count, strategy, iteration):
+        """Select a host for the iteration.
+
+        :param hosts_count: a number of hosts
+        :param strategy: ``round_robin``, ``least_latency`` or ``hash``
+        :param iteration: the number of iteration (starts from 1)
+        :returns: the index of selected host
+        """
+        if strategy == "hash":
+            return zlib.crc32(str(iteration).encode("utf-8")) % hosts_count
+        if strategy == "least_latency":
+            with self._lock:
+                self._collect()
+                not_observed = [i for i in range(hosts_count)
+                                if i not in self._latency]
+                if not not_observed:
+                    return min(range(hosts_count),
+                               key=lambda i: self._latency[i])
+                # hosts without observations are tried first
+                return not_observed[(iteration - 1) % len(not_observed)]
+        return (iteration - 1) % hosts_count
+
+    def track(self, index, atomic_actions):
+        """Track atomic actions of the iteration run at the host."""
+        with self._lock:
+            self._tracked.append([index, atomic_actions, 0])
+
+
+ROUTER = HostRouter()
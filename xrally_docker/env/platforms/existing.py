@@ -17,8 +17,10 @@ import traceback
 
 from rally.common import cfg
 from rally.common import logging
+from rally.common import utils as rutils
 from rally.env import platform
 
+from xrally_docker.common import stats
 from xrally_docker import service
 
 
@@ -31,12 +33,65 @@ CONF = cfg.CONF
 class Docker(platform.Platform):
     """Default plugin for Docker."""
 
+    # options of connections which are applied to all hosts
+    TRANSPORT_OPTIONS = ("timeout", "version", "ssl_version", "max_pool_size",
+                         "keep_alive", "socket_send_buffer",
+                         "socket_receive_buffer", "use_ssh_client")
+
     CONFIG_SCHEMA = {
         "type": "object",
         "properties": {
             "host": {
                 "type": "string",
                 "description": "The URL to the Docker host"},
+            "unix_socket": {
+                "type": "string",
+                "description": "A path to the unix socket of the Docker "
+                               "daemon. It is a shortcut for ``host`` "
+                               "(``unix://<path>``)."},
+            "hosts": {
+                "type": "array",
+                "minItems": 1,
+                "description": "Several Docker hosts to distribute "
+                               "iterations of workloads across (see "
+                               "``sharding``). Contexts prepare resources "
+                               "at the first host, so workloads with "
+                               "networks@docker, volumes@docker, "
+                               "registry@docker or synthetic_images@docker "
+                               "contexts are run at the first host only. "
+                               "``host``, "
+                               "``unix_socket``, ``tls_verify`` and "
+                               "``cert_path`` properties are ignored if "
+                               "``hosts`` is specified.",
+                "items": {
+                    "type": "object",
+                    "description": "A Docker host.",
+                    "properties": {
+                        "host": {
+                            "type": "string",
+                            "description": "The URL to the Docker host"},
+                        "tls_verify": {
+                            "type": "boolean",
+                            "description": "Verify the host against a CA "
+                                           "certificate."},
+                        "cert_path": {
+                            "type": "string",
+                            "description": "A path to a directory "
+                                           "containing TLS certificates of "
+                                           "the host."}
+                    },
+                    "required": ["host"],
+                    "additionalProperties": False
+                }
+            },
+            "sharding": {
+                "enum": ["round_robin", "least_latency", "hash"],
+                "description": "A strategy of distributing iterations across "
+                               "``hosts``: ``round_robin`` (default), "
+                               "``least_latency`` picks the host with the "
+                               "lowest observed latency of API calls, "
+                               "``hash`` picks a host by a hash of the "
+                               "iteration number."},
             "timeout": {
                 "type": "number",
                 "minimum": 0,
@@ -61,26 +116,113 @@ class Docker(platform.Platform):
                     "A valid SSL version (see "
                     "https://docs.python.org/3.5/library/ssl.html"
                     "#ssl.PROTOCOL_TLSv1)"
-            }
+            },
+            "max_pool_size": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "The maximum number of open connections to "
+                               "each host. Requests beyond it wait for a free "
+                               "connection, so it should not be less than "
+                               "the number of simultaneous requests of a "
+                               "runner worker. Defaults to 10."},
+            "keep_alive": {
+                "type": "boolean",
+                "description": "Reuse connections between requests. If "
+                               "disabled, each request opens a new "
+                               "connection. Defaults to true."},
+            "socket_send_buffer": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "The size of send buffer of TCP and unix "
+                               "socket connections (SO_SNDBUF), in bytes."},
+            "socket_receive_buffer": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "The size of receive buffer of TCP and "
+                               "unix socket connections (SO_RCVBUF), in "
+                               "bytes."},
+            "use_ssh_client": {
+                "type": "boolean",
+                "description": "Use ssh command line client instead of "
+                               "paramiko for ``ssh://`` hosts."},
+            "health_check_pings": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "A number of ``/_ping`` requests to measure "
+                               "round-trip latency of each host at health "
+                               "check. Defaults to 5."}
         },
         "additionalProperties": False
     }
 
-    def create(self):
-        """Converts creds of Docker to internal presentation."""
-
-        host = self.spec.get("host")
-        enable_tls = self.spec.get("cert_path") or self.spec.get("tls_verify")
+    @staticmethod
+    def _get_host_data(spec):
+        host = spec.get("host")
+        enable_tls = spec.get("cert_path") or spec.get("tls_verify")
         if host:
             host = host.replace("tcp://", "https://") if enable_tls else host
 
-        cert_path = self.spec.get("cert_path")
+        cert_path = spec.get("cert_path")
         if enable_tls and not cert_path:
             cert_path = os.path.join(os.path.expanduser("~"), ".docker")
 
         return {"host": host,
-                "tls_verify": self.spec.get("tls_verify"),
-                "cert_path": cert_path}, {}
+                "tls_verify": spec.get("tls_verify"),
+                "cert_path": cert_path}
+
+    def _get_transport_data(self):
+        return dict((k, self.spec[k]) for k in self.TRANSPORT_OPTIONS
+                    if k in self.spec)
+
+    def _get_hosts_data(self):
+        return self.platform_data.get("hosts") or [self.platform_data]
+
+    @staticmethod
+    def _get_daemon_info(host):
+        try:
+            return service.Docker(host).get_daemon_info()
+        except Exception as e:
+            LOG.warning("Failed to get info of Docker daemon at %s: %s"
+                        % (host["host"] or "the default host", e))
+
+    def _measure_latency(self, client):
+        durations = []
+        for i in range(self.spec.get("health_check_pings", 5)):
+            with rutils.Timer() as timer:
+                client.ping()
+            durations.append(timer.duration())
+        durations.sort()
+        return {"min": durations[0],
+                "median": stats.percentile(durations, 50),
+                "p99": stats.percentile(durations, 99)}
+
+    def create(self):
+        """Converts creds of Docker to internal presentation.
+
+        Configuration and capacity of daemons are saved as well, so results
+        of workloads can be compared across hosts and runs.
+        """
+        transport = self._get_transport_data()
+        if not self.spec.get("hosts"):
+            spec = self.spec
+            if spec.get("unix_socket") and not spec.get("host"):
+                spec = dict(spec, host="unix://%s" % spec["unix_socket"])
+            platform_data = self._get_host_data(spec)
+            platform_data.update(transport)
+            platform_data["daemon"] = self._get_daemon_info(platform_data)
+            return platform_data, {}
+
+        hosts = []
+        for host_spec in self.spec["hosts"]:
+            host = self._get_host_data(host_spec)
+            host.update(transport)
+            host["daemon"] = self._get_daemon_info(host)
+            hosts.append(host)
+        # the first host is used by contexts and by single-host consumers
+        platform_data = dict(hosts[0])
+        platform_data["hosts"] = hosts
+        platform_data["sharding"] = self.spec.get("sharding", "round_robin")
+        return platform_data, {}
 
     def destroy(self):
         # NOTE(boris-42): No action need to be performed.
@@ -97,21 +239,42 @@ class Docker(platform.Platform):
         }
 
     def check_health(self):
-        """Check whatever platform is alive."""
-        try:
-            service.Docker(self.platform_data).get_info()
-        except Exception:
-            return {
-                "available": False,
-                "message": "Something went wrong",
-                "traceback": traceback.format_exc()
-            }
-
-        return {"available": True}
+        """Check whatever platform is alive and measure its latency."""
+        messages = []
+        for host in self._get_hosts_data():
+            try:
+                latency = self._measure_latency(service.Docker(host))
+            except Exception:
+                message = "Something went wrong"
+                if "hosts" in self.platform_data:
+                    message = "Docker host %s is not available" % host["host"]
+                return {
+                    "available": False,
+                    "message": message,
+                    "traceback": traceback.format_exc()
+                }
+            message = ("Round-trip latency: min %.2f ms, median %.2f ms, "
+                       "p99 %.2f ms." % (latency["min"] * 1000,
+                                         latency["median"] * 1000,
+                                         latency["p99"] * 1000))
+            if "hosts" in self.platform_data:
+                message = "%s: %s" % (host["host"], message)
+            messages.append(message)
+
+        return {"available": True, "message": " ".join(messages)}
+
+    def _get_host_info(self, host):
+        client = service.Docker(host)
+        return {"version": client.get_info(),
+                "daemon": client.get_daemon_info(),
+                "latency": self._measure_latency(client)}
 
     def info(self):
         """Return an info about Docker server."""
-        return {"info": service.Docker(self.platform_data).get_info()}
+        if "hosts" not in self.platform_data:
+            return {"info": self._get_host_info(self.platform_data)}
+        return {"info": dict((h["host"], self._get_host_info(h))
+                             for h in self._get_hosts_data())}
 
     def _get_validation_context(self):
         return {}
@@ -12,13 +12,69 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
 import os
+import socket
+import time
 
+from rally.common import broker
+from rally.common import utils as rutils
 from rally.task import atomic
 from rally.task import service
 
+from xrally_docker.common import open_loop
+
+
+# a label with the random name of a resource. It allows to find resources
+#   created by Rally regardless of their names
+OWNER_LABEL = "org.xrally.owner"
+
+
+def _run_concurrently(func, args_list, concurrency):
+    """Call func for each item of args_list using a pool of threads.
+
+    :returns: a list of tuples (item, duration, error) in order of
+        completion. The error is None for successful calls.
+    """
+    results = []
+
+    def consumer(cache, item):
+        error = None
+        with rutils.Timer() as timer:
+            try:
+                func(item)
+            except Exception as e:
+                error = e
+        results.append((item, timer.duration(), error))
+
+    broker.run(lambda queue: queue.extend(args_list), consumer,
+               consumers_count=min(concurrency, len(args_list)) or 1)
+    return results
+
 
 class Docker(service.Service):
+
+    # read-only API requests which can be issued by `fan_out` method. Values
+    #   are methods of the low-level API client.
+    FAN_OUT_CALLS = {"ping": "ping",
+                     "version": "version",
+                     "info": "info",
+                     "list_containers": "containers",
+                     "list_images": "images",
+                     "list_networks": "networks",
+                     "list_volumes": "volumes"}
+
+    # properties of the daemon which describe its configuration and capacity
+    DAEMON_INFO_KEYS = ("ServerVersion", "OperatingSystem", "KernelVersion",
+                        "Driver", "CgroupDriver", "CgroupVersion", "NCPU",
+                        "MemTotal", "Containers", "Images")
+
+    # operations which can be issued by `run_open_loop` method. Values are
+    #   private methods which do not produce atomic actions
+    OPEN_LOOP_OPERATIONS = {
+        "create_and_delete_network": "_create_and_delete_network",
+        "run_container": "_run_and_remove_container"}
+
     def __init__(self, spec, name_generator=None, atomic_inst=None):
         super(Docker, self).__init__(None, name_generator=name_generator,
                                      atomic_inst=atomic_inst)
@@ -42,24 +98,204 @@ class Docker(service.Service):
 
         import docker
 
+        # these options are passed only if they are specified, so defaults
+        #   of docker SDK are kept (they require docker SDK >= 4.4.0)
+        kwargs = dict((k, self._spec[k]) for k in ("max_pool_size",
+                                                   "use_ssh_client")
+                      if k in self._spec)
         self._client = docker.DockerClient(
             base_url=self._spec.get("host"),
             version=self._spec.get("version", "auto"),
             timeout=self._spec.get(
                 "timeout", docker.constants.DEFAULT_TIMEOUT_SECONDS),
-            tls=tls)
+            tls=tls, **kwargs)
+        self._configure_transport()
+
+    def _configure_transport(self):
+        """Apply connection options which docker SDK does not handle."""
+        api = self._client.api
+        if not self._spec.get("keep_alive", True):
+            api.headers["Connection"] = "close"
+
+        socket_options = []
+        for key, option in (("socket_send_buffer", socket.SO_SNDBUF),
+                            ("socket_receive_buffer", socket.SO_RCVBUF)):
+            if self._spec.get(key):
+                socket_options.append(
+                    (socket.SOL_SOCKET, option, self._spec[key]))
+        max_pool_size = self._spec.get("max_pool_size")
+        if not (socket_options or max_pool_size):
+            return
+
+        from docker import transport
+        from urllib3 import connection
+
+        unix_adapter = api.adapters.get("http+docker://")
+        if socket_options and isinstance(unix_adapter,
+                                         transport.UnixHTTPAdapter):
+            self._set_unix_socket_options(unix_adapter, socket_options)
+
+        # docker SDK applies max_pool_size to unix socket and ssh transports
+        #   only, while TCP connections are made by adapters of requests
+        #   with the default pool of 10 connections
+        for prefix in ("http://", "https://"):
+            adapter = api.adapters.get(prefix)
+            if adapter is None:
+                continue
+            # the TLS adapter of docker SDK does not accept extra arguments
+            #   of the pool manager, so they are set after its creation
+            adapter.init_poolmanager(adapter._pool_connections,
+                                     max_pool_size or adapter._pool_maxsize,
+                                     block=adapter._pool_block)
+            if socket_options:
+                adapter.poolmanager.connection_pool_kw["socket_options"] = (
+                    connection.HTTPConnection.default_socket_options +
+                    socket_options)
+
+    @staticmethod
+    def _set_unix_socket_options(adapter, socket_options):
+        """Set socket options of connections of the unix socket adapter.
+
+        Unlike TCP connections of urllib3, connections to unix socket made
+        by docker SDK do not accept socket options, so they are set right
+        after the connect.
+        """
+        def new_conn(pool_new_conn):
+            conn = pool_new_conn()
+            conn_connect = conn.connect
+
+            def connect():
+                conn_connect()
+                for option in socket_options:
+                    conn.sock.setsockopt(*option)
+
+            conn.connect = connect
+            return conn
+
+        adapter_get_connection = adapter.get_connection
+
+        def get_connection(*args, **kwargs):
+            pool = adapter_get_connection(*args, **kwargs)
+            if not isinstance(pool._new_conn, functools.partial):
+                pool._new_conn = functools.partial(new_conn, pool._new_conn)
+            return pool
+
+        adapter.get_connection = get_connection
+        # the connection made by the detection of API version is dropped
+        adapter.pools.clear()
 
     @atomic.action_timer("docker.version")
     def get_info(self):
         """Get info about Docker server."""
         return self._client.version()
 
+    @atomic.action_timer("docker.ping")
+    def ping(self):
+        """Check that the daemon is responsive via ``/_ping`` endpoint."""
+        return self._client.ping()
+
+    @atomic.action_timer("docker.info")
+    def get_daemon_info(self):
+        """Get configuration and capacity of the daemon.
+
+        :returns: a dict with the storage driver, the cgroup driver, a number
+            of CPUs, total memory, numbers of containers and images, etc
+            (see DAEMON_INFO_KEYS)
+        """
+        info = self._client.info()
+        return dict((k, info.get(k)) for k in self.DAEMON_INFO_KEYS)
+
+    def stream_events(self, since=None, filters=None):
+        """Subscribe to events of the daemon.
+
+        :param since: a timestamp to get events from
+        :param filters: Filters to be processed on events (e.g.
+            ``{"type": ["container"]}``).
+        :returns: an endless iterator over decoded events. Call its ``close``
+            method to unsubscribe.
+        """
+        return self._client.api.events(since=since, filters=filters,
+                                       decode=True)
+
+    def list_events(self, since, until, filters=None):
+        """List events of the daemon for the period of time.
+
+        The daemon keeps a limited number of the recent events only.
+
+        :param since: a timestamp to get events from
+        :param until: a timestamp to get events till
+        :param filters: Filters to be processed on events (e.g.
+            ``{"type": ["container"]}``).
+        """
+        return list(self._client.api.events(since=since, until=until,
+                                            filters=filters, decode=True))
+
+    @atomic.action_timer("docker.fan_out")
+    def fan_out(self, call, calls_count, concurrency=None):
+        """Issue many simultaneous API requests.
+
+        Requests are issued by a pool of threads sharing the connection pool
+        of the client, so one iteration can load the daemon with hundreds of
+        requests. Only raw responses of the low-level API are received, there
+        is no overhead of wrapping them into objects.
+
+        :param call: a name of API request (see FAN_OUT_CALLS)
+        :param calls_count: a number of requests to issue
+        :param concurrency: a number of simultaneous requests. Defaults to
+            the number of requests.
+        :returns: a tuple of a list of durations of successful requests in
+            order of completion and a list of errors
+        """
+        method = getattr(self._client.api, self.FAN_OUT_CALLS[call])
+        results = _run_concurrently(lambda i: method(),
+                                    list(range(calls_count)),
+                                    concurrency=concurrency or calls_count)
+        return ([d for i, d, e in results if e is None],
+                [e for i, d, e in results if e is not None])
+
+    @atomic.action_timer("docker.open_loop")
+    def run_open_loop(self, operation, rate, requests_count,
+                      max_outstanding=None, **kwargs):
+        """Issue operations at a fixed rate independently of completion.
+
+        :param operation: a name of operation (see OPEN_LOOP_OPERATIONS)
+        :param rate: a target number of operations per second
+        :param requests_count: a number of operations to issue
+        :param max_outstanding: a maximum number of simultaneous operations.
+            Defaults to the number of operations.
+        :param kwargs: arguments of the operation
+        :returns: a list of records of operations in order of the schedule
+            (see `xrally_docker.common.open_loop.run`)
+        """
+        method = getattr(self, self.OPEN_LOOP_OPERATIONS[operation])
+        return open_loop.run(lambda i: method(**kwargs), rate=rate,
+                             requests_count=requests_count,
+                             max_outstanding=max_outstanding)
+
+    def _create_and_delete_network(self, driver=None, labels=None):
+        network = self._client.api.create_network(
+            self.generate_random_name(), driver=driver, labels=labels)
+        self._client.api.remove_network(network["Id"])
+
+    def _run_and_remove_container(self, image_name, command=None):
+        return self._run_container(image_name, command=command, remove=True)
+
     @staticmethod
-    def _fix_the_name(name):
+    def _split_the_name(name):
+        """Split the name of image into a repository and a tag.
+
+        'latest' tag is used if there is no tag in the name.
+        """
+        repository, sep, tag = name.rpartition(":")
+        # a colon may be a part of registry address (e.g. localhost:5000/foo)
+        if not sep or "/" in tag:
+            return name, "latest"
+        return repository, tag
+
+    @classmethod
+    def _fix_the_name(cls, name):
         """Add 'latest' tag if no tag in the name."""
-        if ":" not in name:
-            return "%s:latest" % name
-        return name
+        return "%s:%s" % cls._split_the_name(name)
 
     @atomic.action_timer("docker.pull_image")
     def pull_image(self, name):
@@ -70,50 +306,306 @@ class Docker(service.Service):
         image = self._client.images.pull(self._fix_the_name(name))
         if self._name_generator is not None:
             # add Rally tag.
-            return self.tag_image(name)
+            return self._tag_image(image, name,
+                                   tags=[self.generate_random_name()])
 
         return image.attrs
 
-    @atomic.action_timer("docker.get_image")
-    def _get_image(self, name):
-        """Get raw image object."""
-        return self._client.images.get(self._fix_the_name(name))
-
     @atomic.action_timer("docker.get_image")
     def get_image(self, name):
         """Get image."""
-        return self._get_image(name).attrs
+        return self._client.images.get(self._fix_the_name(name)).attrs
+
+    def _tag_image(self, image, name, tags, repository=None):
+        """Add tags to the image object and refresh its attributes once."""
+        # TODO(andreykurilin): validate format of the tags before trying to
+        #   adding them.
+        repository = repository or self._split_the_name(name)[0]
+        for tag in tags:
+            image.tag(repository, tag)
+        image.reload()
+        return image.attrs
 
     @atomic.action_timer("docker.tag_image")
-    def tag_image(self, name, tags=None):
+    def tag_image(self, name, tags=None, repository=None):
         """Add tag(s) to the image.
 
         :param name: name of the image
         :param tags: list of tags to add. If None, the random tag will be added
+        :param repository: a repository for new tags. Defaults to the
+            repository of the image
         """
         if tags is None:
             tags = [self.generate_random_name()]
-        image = self._get_image(name)
+        image = self._client.images.get(self._fix_the_name(name))
+        return self._tag_image(image, name, tags=tags, repository=repository)
 
-        # TODO(andreykurilin): validate format of the tags before trying to
-        #   adding them.
-        for tag in tags:
-            image.tag(name.split(":", 1)[0], tag)
+    def _push_image(self, name):
+        import docker
+
+        repository, tag = self._split_the_name(name)
+        layers = []
+        layers_by_id = {}
+        digest = None
+        with rutils.Timer() as timer:
+            stream = self._client.api.push(repository, tag=tag, stream=True,
+                                           decode=True)
+            for chunk in stream:
+                if "error" in chunk:
+                    raise docker.errors.APIError(chunk["error"])
+                if "aux" in chunk:
+                    digest = chunk["aux"].get("Digest")
+                    continue
+                layer_id = chunk.get("id")
+                status = chunk.get("status", "")
+                if not layer_id or layer_id == tag:
+                    continue
+                now = time.time()
+                if layer_id not in layers_by_id:
+                    layers_by_id[layer_id] = {"id": layer_id, "status": None,
+                                              "size": 0, "started_at": now}
+                    layers.append(layers_by_id[layer_id])
+                layer = layers_by_id[layer_id]
+                total = (chunk.get("progressDetail") or {}).get("total")
+                if total:
+                    layer["size"] = total
+                if status == "Pushed":
+                    layer["status"] = "pushed"
+                elif status == "Layer already exists":
+                    layer["status"] = "exists"
+                elif status.startswith("Mounted from"):
+                    layer["status"] = "mounted"
+                else:
+                    continue
+                layer["duration"] = now - layer.pop("started_at")
+        return {"name": name,
+                "digest": digest,
+                "duration": timer.duration(),
+                "size": sum(layer["size"] for layer in layers
+                            if layer["status"] == "pushed"),
+                "layers": layers}
+
+    @atomic.action_timer("docker.push_image")
+    def push_image(self, name):
+        """Push the image to a registry.
+
+        The progress of the push is streamed, so each layer is timed from
+        the first progress message till it is pushed or found in the
+        registry.
+
+        :param name: the name of image including the registry address
+        :returns: a dict with ``name``, ``digest``, ``duration``, ``size``
+            (bytes uploaded) and ``layers`` keys. Each layer is a dict with
+            ``id``, ``status`` (one of ``pushed``, ``exists`` or ``mounted``),
+            ``size`` and ``duration`` keys.
+        """
+        return self._push_image(name)
+
+    @atomic.action_timer("docker.push_images")
+    def push_images(self, names, concurrency=None):
+        """Push several images simultaneously.
+
+        :param names: a list of image names including the registry address
+        :param concurrency: a number of simultaneous pushes. Defaults to the
+            number of images.
+        :returns: a list of results of `push_image` in order of completion
+        """
+        pushed = []
+        results = _run_concurrently(
+            lambda name: pushed.append(self._push_image(name)), names,
+            concurrency=concurrency or len(names))
+        errors = [e for name, d, e in results if e is not None]
+        if errors:
+            raise errors[0]
+        return pushed
+
+    @atomic.action_timer("docker.delete_image")
+    def delete_image(self, name, force=False):
+        """Remove an image or its tag.
+
+        If the image has several tags and the name includes one of them,
+        only this tag is removed.
+
+        :param name: the ID of image or its name with a tag
+        :param force: Force removal of the image
+        """
+        self._client.images.remove(image=name, force=force)
+
+    @atomic.action_timer("docker.save_image")
+    def save_image(self, name, path):
+        """Export the image to a tarball.
+
+        The tarball is written to the file chunk by chunk as it is received
+        from the daemon, so it is never kept in memory whole.
+
+        :param name: the name of image
+        :param path: a path of the file to write the tarball to
+        :returns: the size of tarball in bytes
+        """
+        size = 0
+        with open(path, "wb") as f:
+            for chunk in self._client.api.get_image(self._fix_the_name(name)):
+                f.write(chunk)
+                size += len(chunk)
+        return size
+
+    @atomic.action_timer("docker.load_image")
+    def load_image(self, path):
+        """Import images from a tarball.
+
+        The file is streamed to the daemon without reading it into memory.
+
+        :param path: a path to the tarball created by `save_image` or
+            ``docker save``
+        :returns: a list of names of loaded images (or IDs for untagged ones)
+        """
+        import docker
+
+        loaded = []
+        with open(path, "rb") as f:
+            for chunk in self._client.api.load_image(f) or []:
+                if "error" in chunk:
+                    raise docker.errors.ImageLoadError(chunk["error"])
+                line = chunk.get("stream", "")
+                for prefix in ("Loaded image: ", "Loaded image ID: "):
+                    if line.startswith(prefix):
+                        loaded.append(line[len(prefix):].strip())
+        return loaded
+
+    @staticmethod
+    def _read_dockerignore(path):
+        dockerignore = os.path.join(path, ".dockerignore")
+        if not os.path.exists(dockerignore):
+            return []
+        with open(dockerignore) as f:
+            return [line.strip() for line in f.read().splitlines()
+                    if line.strip() and not line.startswith("#")]
+
+    @atomic.action_timer("docker.build_image")
+    def build_image(self, path, repository="xrally", dockerfile=None,
+                    nocache=False, pull=False, buildargs=None, labels=None):
+        """Build an image from a context directory.
+
+        The build context is packed before sending the request, so the
+        upload of context (the time before the first message from the
+        daemon) is measured separately from build steps.
+
+        :param path: a path to the directory containing the build context
+        :param repository: a repository of the image. The random tag is used.
+        :param dockerfile: a path within the build context to the Dockerfile
+        :param nocache: Don't use the cache when set to True
+        :param pull: Downloads any updates to the FROM image in Dockerfiles
+        :param buildargs: A dictionary of build arguments
+        :param labels: A dictionary of labels to set on the image
+        :returns: a dict with ``Id`` and ``RepoTags`` of the image and build
+            statistics: ``context_size`` (in bytes),
+            ``context_upload_duration``, ``steps`` (a list of dicts with
+            ``name``, ``duration`` and ``cached`` keys) and ``output``
+        """
+        import docker
+
+        tag = "%s:%s" % (repository, self.generate_random_name())
+        context = docker.utils.tar(path,
+                                   exclude=self._read_dockerignore(path))
+        context.seek(0, os.SEEK_END)
+        context_size = context.tell()
+        context.seek(0)
+
+        started_at = time.time()
+        stream = self._client.api.build(
+            fileobj=context, custom_context=True, tag=tag,
+            dockerfile=dockerfile, nocache=nocache, pull=pull,
+            buildargs=buildargs, labels=labels, rm=True, forcerm=True,
+            decode=True)
+
+        upload_duration = None
+        image_id = None
+        steps = []
+        step_started_at = None
+        output = []
+        try:
+            for chunk in stream:
+                now = time.time()
+                if upload_duration is None:
+                    upload_duration = now - started_at
+                if "error" in chunk:
+                    raise docker.errors.BuildError(chunk["error"], output)
+                if "ID" in chunk.get("aux", {}):
+                    image_id = chunk["aux"]["ID"]
+                line = chunk.get("stream", "")
+                if not line:
+                    continue
+                output.append(line.rstrip("\n"))
+                if line.startswith("Step "):
+                    if steps:
+                        steps[-1]["duration"] = now - step_started_at
+                    step_started_at = now
+                    steps.append({"name": line.strip(), "duration": None,
+                                  "cached": False})
+                elif line.strip() == "---> Using cache" and steps:
+                    steps[-1]["cached"] = True
+                elif line.startswith("Successfully built ") and not image_id:
+                    image_id = line.split()[-1]
+        finally:
+            context.close()
+        if steps:
+            steps[-1]["duration"] = time.time() - step_started_at
 
-        return self.get_image(name)
+        return {"Id": image_id,
+                "RepoTags": [tag],
+                "context_size": context_size,
+                "context_upload_duration": upload_duration,
+                "steps": steps,
+                "output": output}
+
+    def iter_images(self, all=False, filters=None, summary=False):
+        """Iterate over available images.
+
+        All images are listed with a single request, but unlike
+        `list_images`, each image is inspected only when it is consumed, so
+        the whole list of detailed images is never kept in memory.
+
+        :param all: Show intermediate image layers. By default, these are
+            filtered out
+        :param filters: Filters to be processed on the image list. Available
+            filters: ``dangling``, ``label``, ``reference``, ``before``,
+            ``since``.
+        :param summary: Yield only ``Id`` and ``RepoTags`` of images without
+            inspecting them.
+        """
+        for image in self._client.api.images(all=all, filters=filters):
+            if summary:
+                yield {"Id": image["Id"],
+                       "RepoTags": image.get("RepoTags") or []}
+            else:
+                yield self._client.images.get(image["Id"]).attrs
 
     @atomic.action_timer("docker.list_images")
-    def list_images(self, all=False):
+    def list_images(self, all=False, filters=None, summary=False):
         """List all available images.
 
         :param all: Show intermediate image layers. By default, these are
             filtered out
+        :param filters: Filters to be processed on the image list. Available
+            filters: ``dangling``, ``label``, ``reference``, ``before``,
+            ``since``.
+        :param summary: Return only ``Id`` and ``RepoTags`` of images. It
+            requires a single API call instead of inspecting each image.
         """
-        return [i.attrs for i in self._client.images.list(all=all)]
+        return list(self.iter_images(all=all, filters=filters,
+                                     summary=summary))
+
+    def _run_container(self, image_name, container_name=None, **kwargs):
+        container_name = container_name or self.generate_random_name()
+        return self._client.containers.run(
+            image=self._fix_the_name(image_name), name=container_name,
+            **kwargs)
 
     @atomic.action_timer("docker.run")
     def run_container(self, image_name, container_name=None, command=None,
-                      detach=False, stdout=True, stderr=False, remove=True):
+                      detach=False, stdout=True, stderr=False, remove=True,
+                      ports=None, volumes=None, tmpfs=None, entrypoint=None,
+                      network=None):
         """Run a container
 
         :param image_name: The name of image to launch
@@ -127,12 +619,242 @@ class Docker(service.Service):
             Defaults to False.
         :param remove: Remove the container when it has finished running.
             Defaults to True.
+        :param ports: Ports to bind inside the container as a dict of
+            ``{"<port>/<protocol>": <host port>}``.
+        :param volumes: Volumes or host paths to mount as a dict of
+            ``{"<volume name or host path>": {"bind": "<path>",
+            "mode": "rw"}}``.
+        :param tmpfs: Temporary filesystems to mount as a dict of
+            ``{"<path>": "<options>"}``.
+        :param entrypoint: The entrypoint to use instead of the image one.
+        :param network: The name of network to connect the container to
         """
-        container_name = container_name or self.generate_random_name()
-        return self._client.containers.run(
-            image=self._fix_the_name(image_name), name=container_name,
-            command=command,
-            detach=detach, stdout=stdout, stderr=stderr, remove=remove)
+        return self._run_container(
+            image_name, container_name=container_name, command=command,
+            detach=detach, stdout=stdout, stderr=stderr, remove=remove,
+            ports=ports, volumes=volumes, tmpfs=tmpfs, entrypoint=entrypoint,
+            network=network)
+
+    @atomic.action_timer("docker.run_containers")
+    def run_containers(self, image_name, commands, concurrency=None,
+                       remove=True, **kwargs):
+        """Run several containers simultaneously till they finish.
+
+        :param image_name: The name of image to launch
+        :param commands: A list of commands. A container is run for each
+            command.
+        :param concurrency: A number of simultaneously running containers.
+            Defaults to the number of commands.
+        :param remove: Remove containers when they have finished running.
+            Defaults to True.
+        :param kwargs: Other arguments of `run_container` method
+        :returns: a list of outputs of containers in order of commands
+        """
+        outputs = {}
+
+        def run(index):
+            outputs[index] = self._run_container(
+                image_name, command=commands[index], remove=remove, **kwargs)
+
+        results = _run_concurrently(run, list(range(len(commands))),
+                                    concurrency=concurrency or len(commands))
+        errors = [e for i, d, e in results if e is not None]
+        if errors:
+            raise errors[0]
+        return [outputs[i] for i in range(len(commands))]
+
+    def _create_and_start_container(self, image_name, command=None):
+        """Create and start a container in the background.
+
+        :returns: a tuple of the container ID and the duration of the
+            create request
+        """
+        with rutils.Timer() as timer:
+            container = self._client.api.create_container(
+                image=self._fix_the_name(image_name), command=command,
+                name=self.generate_random_name())
+        self._client.api.start(container["Id"])
+        return container["Id"], timer.duration()
+
+    @atomic.action_timer("docker.start_containers")
+    def start_containers(self, image_name, count, command=None,
+                         concurrency=None):
+        """Start several containers in the background simultaneously.
+
+        Unlike `run_containers`, containers are not waited for, so it allows
+        to accumulate long-living containers.
+
+        :param image_name: The name of image to launch
+        :param count: A number of containers to start
+        :param command: A long-living command to run in containers
+        :param concurrency: A number of simultaneous requests. Defaults to
+            the number of containers.
+        :returns: a tuple of a list of IDs of started containers, a list of
+            durations of their create requests and a list of errors
+        """
+        started = []
+
+        def start(index):
+            started.append(self._create_and_start_container(
+                image_name, command=command))
+
+        results = _run_concurrently(start, list(range(count)),
+                                    concurrency=concurrency or count)
+        return ([c_id for c_id, d in started], [d for c_id, d in started],
+                [e for i, d, e in results if e is not None])
+
+    def probe_container_requests(self, container_id, requests_count=5):
+        """Measure latency of listing and inspecting containers.
+
+        Requests are issued one by one via the low-level API, so the client
+        does not inspect each container of the list.
+
+        :param container_id: a Container ID to inspect
+        :param requests_count: a number of requests of each kind
+        :returns: a dict with lists of durations of ``list`` and ``inspect``
+            requests
+        """
+        calls = (("list", lambda: self._client.api.containers(all=True)),
+                 ("inspect",
+                  lambda: self._client.api.inspect_container(container_id)))
+        durations = dict((key, []) for key, call in calls)
+        for i in range(requests_count):
+            for key, call in calls:
+                with rutils.Timer() as timer:
+                    call()
+                durations[key].append(timer.duration())
+        return durations
+
+    @atomic.action_timer("docker.get_container_logs")
+    def get_container_logs(self, container_id, stdout=True, stderr=True):
+        """Get logs of a container.
+
+        :param container_id: a Container ID
+        :param stdout: Get ``STDOUT``
+        :param stderr: Get ``STDERR``
+        """
+        return self._client.api.logs(container_id, stdout=stdout,
+                                     stderr=stderr)
+
+    @atomic.action_timer("docker.put_archive")
+    def put_archive(self, container_id, path, tarball):
+        """Upload a tar archive into a container.
+
+        The file is streamed to the daemon without reading it into memory.
+
+        :param container_id: a Container ID
+        :param path: a directory in the container to extract the archive to
+        :param tarball: a path to the local tar archive
+        :returns: the size of archive in bytes
+        """
+        with open(tarball, "rb") as f:
+            self._client.api.put_archive(container_id, path, f)
+        return os.path.getsize(tarball)
+
+    @atomic.action_timer("docker.get_archive")
+    def get_archive(self, container_id, path, tarball):
+        """Download a file or a directory of a container as a tar archive.
+
+        The archive is written to the file chunk by chunk as it is received
+        from the daemon.
+
+        :param container_id: a Container ID
+        :param path: a path in the container to download
+        :param tarball: a path of the local file to write the archive to
+        :returns: the size of archive in bytes
+        """
+        stream, stat = self._client.api.get_archive(container_id, path)
+        size = 0
+        with open(tarball, "wb") as f:
+            for chunk in stream:
+                f.write(chunk)
+                size += len(chunk)
+        return size
+
+    @atomic.action_timer("docker.get_container")
+    def get_container(self, container_id):
+        """Get container by ID or name."""
+        return self._client.containers.get(container_id).attrs
+
+    @atomic.action_timer("docker.list_containers")
+    def list_containers(self, all=True, filters=None):
+        """List containers.
+
+        :param all: Show all containers. Only running containers are shown
+            otherwise.
+        :param filters: Filters to be processed on the containers list.
+        """
+        return [c.attrs for c in self._client.containers.list(
+            all=all, filters=filters)]
+
+    @atomic.action_timer("docker.delete_container")
+    def delete_container(self, container_id, force=True, volumes=False):
+        """Remove a container by its ID.
+
+        :param container_id: a Container ID
+        :param force: Force the removal of a running container
+        :param volumes: Remove anonymous volumes of the container
+        """
+        self._client.api.remove_container(container_id, force=force,
+                                          v=volumes)
+
+    @atomic.action_timer("docker.delete_containers")
+    def delete_containers(self, container_ids, concurrency=None):
+        """Remove several containers simultaneously.
+
+        :param container_ids: a list of Container IDs
+        :param concurrency: a number of simultaneous requests. Defaults to
+            the number of containers.
+        """
+        results = _run_concurrently(
+            lambda c_id: self._client.api.remove_container(c_id, force=True),
+            container_ids, concurrency=concurrency or len(container_ids))
+        errors = [e for c_id, d, e in results if e is not None]
+        if errors:
+            raise errors[0]
+
+    @atomic.action_timer("docker.create_volume")
+    def create_volume(self, name=None, driver=None, driver_opts=None,
+                      labels=None):
+        """Create a volume.
+
+        The random name is saved as ``org.xrally.owner`` label of the volume,
+        so the volume is removed at cleanup even if its name is specified.
+
+        :param name: Name of the volume. Defaults to the random name.
+        :param driver: Name of the driver used to create the volume
+        :param driver_opts: Driver options as a key-value dictionary
+        :param labels: Map of labels to set on the volume
+        """
+        owner = self.generate_random_name()
+        labels = dict(labels or {})
+        labels[OWNER_LABEL] = owner
+        return self._client.api.create_volume(
+            name=name or owner, driver=driver, driver_opts=driver_opts,
+            labels=labels)
+
+    @atomic.action_timer("docker.get_volume")
+    def get_volume(self, name):
+        """Get volume by name."""
+        return self._client.api.inspect_volume(name)
+
+    @atomic.action_timer("docker.list_volumes")
+    def list_volumes(self, filters=None):
+        """List volumes.
+
+        :param filters: Filters to be processed on the volumes list (e.g.
+            ``{"label": "org.xrally.owner"}``).
+        """
+        return self._client.api.volumes(filters=filters)["Volumes"] or []
+
+    @atomic.action_timer("docker.delete_volume")
+    def delete_volume(self, name, force=False):
+        """Remove a volume by its name.
+
+        :param name: a Volume name
+        :param force: Force the removal of the volume
+        """
+        self._client.api.remove_volume(name, force=force)
 
     @atomic.action_timer("docker.create_network")
     def create_network(self, name=None, driver=None, options=None, ipam=None,
@@ -201,10 +923,13 @@ class Docker(service.Service):
         """Remove a network by its ID"""
         self._client.networks.client.api.remove_network(network_id)
 
-    @atomic.action_timer("docker.list_networks")
-    def list_networks(self, ids=None, names=None, driver=None, label=None,
-                      ntype=None, detailed=False):
-        """List available networks.
+    def iter_networks(self, ids=None, names=None, driver=None, label=None,
+                      ntype=None, detailed=False, filters=None,
+                      summary=False):
+        """Iterate over available networks.
+
+        All networks are listed with a single request. In case of detailed
+        mode, each network is inspected only when it is consumed.
 
         :param ids: List of ids to filter by.
         :param names: List of names to filter by.
@@ -212,15 +937,86 @@ class Docker(service.Service):
         :param label: label to match
         :param ntype: Filters networks by type.
         :param detailed: Grep detailed information about networks (aka greedy)
+        :param filters: Other filters to be processed on the network list.
+        :param summary: Yield only ``Id``, ``Name`` and ``Driver`` of
+            networks.
         """
-        filters = {}
+        filters = dict(filters or {})
         if driver:
             filters["driver"] = driver
         if label:
             filters["label"] = label
         if ntype:
             filters["type"] = ntype
-        return [n.attrs for n in self._client.networks.list(
-            ids=ids or [],
-            names=names or [],
-            greedy=detailed, filters=filters)]
+        networks = self._client.api.networks(names=names, ids=ids,
+                                             filters=filters)
+        for net in networks:
+            if summary:
+                yield {"Id": net["Id"], "Name": net["Name"],
+                       "Driver": net.get("Driver")}
+            elif detailed:
+                yield self._client.api.inspect_network(net["Id"])
+            else:
+                yield net
+
+    @atomic.action_timer("docker.list_networks")
+    def list_networks(self, ids=None, names=None, driver=None, label=None,
+                      ntype=None, detailed=False, filters=None,
+                      summary=False):
+        """List available networks.
+
+        :param ids: List of ids to filter by.
+        :param names: List of names to filter by.
+        :param driver: a network driver to match
+        :param label: label to match
+        :param ntype: Filters networks by type.
+        :param detailed: Grep detailed information about networks (aka greedy)
+        :param filters: Other filters to be processed on the network list.
+        :param summary: Return only ``Id``, ``Name`` and ``Driver`` of
+            networks.
+        """
+        return list(self.iter_networks(
+            ids=ids, names=names, driver=driver, label=label, ntype=ntype,
+            detailed=detailed, filters=filters, summary=summary))
+
+    @staticmethod
+    def _for_each_container(method, network_id, container_ids, concurrency):
+        results = _run_concurrently(
+            lambda c_id: method(c_id, network_id), container_ids,
+            concurrency=concurrency or len(container_ids))
+        errors = [e for c_id, d, e in results if e is not None]
+        if errors:
+            raise errors[0]
+        return [(c_id, duration) for c_id, duration, e in results]
+
+    @atomic.action_timer("docker.connect_containers_to_network")
+    def connect_containers_to_network(self, network_id, container_ids,
+                                      concurrency=None):
+        """Connect several containers to a network simultaneously.
+
+        :param network_id: a Network ID
+        :param container_ids: a list of Container IDs to connect
+        :param concurrency: a number of simultaneous requests. Defaults to
+            the number of containers.
+        :returns: a list of tuples (container_id, duration) in order of
+            completion
+        """
+        return self._for_each_container(
+            self._client.api.connect_container_to_network,
+            network_id, container_ids, concurrency)
+
+    @atomic.action_timer("docker.disconnect_containers_from_network")
+    def disconnect_containers_from_network(self, network_id, container_ids,
+                                           concurrency=None):
+        """Disconnect several containers from a network simultaneously.
+
+        :param network_id: a Network ID
+        :param container_ids: a list of Container IDs to disconnect
+        :param concurrency: a number of simultaneous requests. Defaults to
+            the number of containers.
+        :returns: a list of tuples (container_id, duration) in order of
+            completion
+        """
+        return self._for_each_container(
+            self._client.api.disconnect_container_from_network,
+            network_id, container_ids, concurrency)
@@ -12,6 +12,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from rally.common import broker
+from rally import exceptions
 from rally.task import context
 
 from xrally_docker import service
@@ -33,3 +35,33 @@ class BaseDockerContext(context.Context):
             atomic_inst=self.atomic_actions(),
             name_generator=self.generate_random_name
         )
+
+    def _create_resources(self, create, items, resources, resource_name,
+                          threads):
+        """Create resources in parallel and fail the setup on errors.
+
+        :param create: a function creating a resource from an item
+        :param items: a list of items to create resources from
+        :param resources: a list to append resources to. Resources are
+            appended as soon as they are created, so they are cleaned up
+            even if the setup fails.
+        :param resource_name: a name of resources for the error message
+        :param threads: a number of threads creating resources
+        """
+        errors = []
+
+        def consumer(cache, item):
+            try:
+                resources.append(create(item))
+            except Exception as e:
+                errors.append(e)
+                raise
+
+        broker.run(lambda queue: queue.extend(items), consumer,
+                   consumers_count=threads)
+
+        if errors:
+            raise exceptions.ContextSetupFailure(
+                ctx_name=self.get_name(),
+                msg="Failed to create %s %s(s). The first error: %s" % (
+                    len(errors), resource_name, errors[0]))
@@ -0,0 +1,102 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import tempfile
+
+from rally.common import logging
+
+from xrally_docker.common import daemon_stats
+from xrally_docker.task import context
+
+
+LOG = logging.getLogger(__name__)
+
+
+@context.configure("daemon_monitor", order=50)
+class DaemonMonitorContext(context.BaseDockerContext):
+    """Sample resource usage of Docker daemon during the workload.
+
+    CPU usage, RSS and a number of open file descriptors of daemon processes
+    (works only for a local daemon) and a number of goroutines (requires
+    enabled metrics endpoint of dockerd) are sampled at a fixed interval in
+    a background thread. Samples taken during each iteration are saved as
+    additive output of the scenario, so they are displayed alongside the
+    atomic actions.
+    """
+
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "properties": {
+            "processes": {
+                "type": "array",
+                "description": "Names of daemon processes to sample.",
+                "items": {"type": "string",
+                          "description": "A process name."}
+            },
+            "metrics_url": {
+                "type": "string",
+                "description": "An URL of dockerd metrics endpoint (see "
+                               "``metrics-addr`` option of dockerd), "
+                               "e.g. 'http://127.0.0.1:9323/metrics'."
+            },
+            "interval": {
+                "type": "number",
+                "minimum": 0.1,
+                "description": "Time between samples in seconds."
+            }
+        },
+        "additionalProperties": False
+    }
+
+    DEFAULT_CONFIG = {"processes": ["dockerd", "containerd"], "interval": 1}
+
+    def setup(self):
+        pids = {}
+        if daemon_stats.is_local(self.context["env"]["platforms"]["docker"]):
+            pids = daemon_stats.find_processes(
+                list(self.config["processes"]))
+            for name, name_pids in pids.items():
+                if not name_pids:
+                    LOG.warning("Process '%s' is not found. Its resource "
+                                "usage will not be sampled." % name)
+            pids = dict((k, v) for k, v in pids.items() if v)
+        else:
+            LOG.warning("Docker daemon is not local. Resource usage of "
+                        "daemon processes will not be sampled.")
+
+        fd, path = tempfile.mkstemp(prefix="xrally-daemon-monitor-",
+                                    suffix=".json")
+        os.close(fd)
+        self._sampler = daemon_stats.Sampler(
+            pids, path, metrics_url=self.config.get("metrics_url"),
+            interval=self.config["interval"])
+        self._sampler.start()
+        self.context["docker"]["daemon_monitor"] = {"path": path}
+
+    def cleanup(self):
+        sampler = getattr(self, "_sampler", None)
+        if sampler is None:
+            return
+        samples = sampler.stop()
+        os.remove(self.context["docker"]["daemon_monitor"]["path"])
+        LOG.info("Docker daemon is sampled %s times during the workload."
+                 % len(samples))
+        if not samples:
+            return
+        baseline = sampler.baseline
+        for name, stats in samples[-1]["processes"].items():
+            rss_growth = stats["rss"] - baseline["processes"][name]["rss"]
+            LOG.info("Docker daemon process '%s' RSS changed by %.2f MiB "
+                     "during the workload." % (name, rss_growth / 1048576.0))
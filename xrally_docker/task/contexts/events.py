@@ -0,0 +1,101 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+
+from rally.common import logging
+from rally.common import utils as rutils
+from rally import exceptions
+from rally.task import context as rally_context
+from rally.task import scenario as rally_scenario
+
+from xrally_docker.common import events
+from xrally_docker import service
+from xrally_docker.task import context
+
+
+LOG = logging.getLogger(__name__)
+
+
+@context.configure("events", order=40)
+class EventsContext(context.BaseDockerContext):
+    """Record events of Docker daemon during the workload.
+
+    Events of resources created by the workload are recorded in a background
+    thread. Daemon-side timestamps of events allow to separate the latency
+    observed by the client from the processing time of the daemon. Events
+    related to resources of each iteration are saved as output of the
+    iteration, durations of lifecycle phases (e.g. container create-start)
+    for the whole workload are logged at cleanup.
+    """
+
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "properties": {
+            "types": {
+                "type": "array",
+                "description": "Types of events to record.",
+                "items": {"enum": list(events.EVENT_TYPES),
+                          "description": "A type of events."},
+                "minItems": 1,
+                "uniqueItems": True
+            },
+            "path": {
+                "type": "string",
+                "description": "A path to a file to save recorded events to "
+                               "as a JSON list."
+            }
+        },
+        "additionalProperties": False
+    }
+
+    DEFAULT_CONFIG = {"types": list(events.EVENT_TYPES)}
+
+    def _is_owned(self, event):
+        actor = event.get("Actor") or {}
+        owner = (actor.get("Attributes") or {}).get(service.OWNER_LABEL)
+        name = events.get_actor_name(event) or ""
+        return any(rutils.name_matches_object(
+            n, rally_scenario.Scenario, rally_context.Context,
+            task_id=self.get_owner_id(), exact=False)
+            for n in (owner, name, name.rpartition(":")[2]) if n)
+
+    def setup(self):
+        self._recorder = events.Recorder(self.client,
+                                         types=list(self.config["types"]),
+                                         matcher=self._is_owned)
+        try:
+            self._recorder.start()
+        except Exception as e:
+            raise exceptions.ContextSetupFailure(
+                ctx_name=self.get_name(),
+                msg="Failed to subscribe to Docker events: %s" % e)
+        self.context["docker"]["events"] = {
+            "types": list(self.config["types"])}
+
+    def cleanup(self):
+        recorder = getattr(self, "_recorder", None)
+        if recorder is None:
+            return
+        recorded = recorder.stop()
+        LOG.info("%s Docker events are recorded during the workload."
+                 % len(recorded))
+        for title, durations in events.get_phases(recorded):
+            LOG.info("Daemon-side duration of %s phase: avg %.3f s, max "
+                     "%.3f s (%s resources)." % (
+                         title, sum(durations) / len(durations),
+                         max(durations), len(durations)))
+        if self.config.get("path"):
+            with open(self.config["path"], "w") as f:
+                json.dump(recorded, f)
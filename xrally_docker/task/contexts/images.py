@@ -13,6 +13,7 @@
 #    under the License.
 
 from xrally_docker.common.cleanup import manager
+from xrally_docker import service
 from xrally_docker.task import context
 
 
@@ -23,7 +24,10 @@ class ImagesContext(context.BaseDockerContext):
     CONFIG_SCHEMA = {
         "type": "object",
         "properties": {
-            "existing": {"description": "Load all existing images",
+            "existing": {"description": "Load all existing images. If "
+                                        "there are several hosts, only "
+                                        "images existing at all of them "
+                                        "are loaded.",
                          "type": "boolean"},
             "names": {"description": "Pull images from the list.",
                       "type": "array",
@@ -31,22 +35,65 @@ class ImagesContext(context.BaseDockerContext):
                           "type": "string",
                           "description": "The image to pull. (if the tag of "
                                          "image is not specified, 'latest' "
-                                         "will be used)."}}},
+                                         "will be used)."}},
+            "tarballs": {"description": "Load images from local tarballs "
+                                        "(created by ``docker save``) "
+                                        "instead of pulling them from a "
+                                        "registry.",
+                         "type": "array",
+                         "items": {
+                             "type": "string",
+                             "description": "A path to the tarball."}},
+            "pull_missing": {"description": "Pull images required by the "
+                                            "scenario which are not loaded "
+                                            "by the context before the "
+                                            "load instead of pulling them "
+                                            "inside iterations.",
+                             "type": "boolean"}},
         "additionalProperties": False
     }
 
-    DEFAULT_CONFIG = {"names": []}
-
-    def setup(self):
-        self.context["docker"]["images"] = []
+    DEFAULT_CONFIG = {"names": [], "tarballs": []}
 
+    def _setup_images(self, client):
+        images = []
         for name in self.config["names"]:
-            self.context["docker"]["images"].append(
-                self.client.pull_image(name))
+            images.append(client.pull_image(name))
+
+        tarballs = self.config.get("tarballs", [])
+        for path in tarballs:
+            for name in client.load_image(path):
+                if name.startswith("sha256:"):
+                    # untagged image can not be tagged by Rally
+                    image = client.get_image(name)
+                else:
+                    image = client.tag_image(name)
+                images.append(image)
+
+        new_images = self.config["names"] or tarballs
+        if self.config.get("existing", not bool(new_images)):
+            # images are found by names only, so they are not inspected
+            images.extend(client.list_images(summary=True))
+        return images
+
+    def setup(self):
+        self.context["docker"]["images"] = self._setup_images(self.client)
 
-        if self.config.get("existing", not bool(self.config["names"])):
-            self.context["docker"]["images"].extend(
-                self.client.list_images())
+        # iterations may be run at any host of multi-host platform, while
+        #   the client of context is connected to the first one
+        spec = self.context["env"]["platforms"]["docker"]
+        for host_spec in (spec.get("hosts") or [])[1:]:
+            client = service.Docker(host_spec,
+                                    atomic_inst=self.atomic_actions(),
+                                    name_generator=self.generate_random_name)
+            names = set()
+            for image in self._setup_images(client):
+                names.update(image.get("RepoTags") or [])
+            # images are found by names, so names which are missing at
+            #   any host are dropped
+            for image in self.context["docker"]["images"]:
+                image["RepoTags"] = [name for name in image.get("RepoTags")
+                                     or [] if name in names]
 
     def cleanup(self):
         manager.cleanup(
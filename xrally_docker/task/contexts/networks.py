@@ -12,12 +12,17 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import copy
+import netaddr
+from rally.common import cfg
+from rally import exceptions
 
 from xrally_docker.common.cleanup import manager
 from xrally_docker.task import context
 
 
+CONF = cfg.CONF
+
+
 @context.configure("networks", order=100)
 class NetworksContext(context.BaseDockerContext):
     """Create one or several docker networks."""
@@ -88,6 +93,26 @@ class NetworksContext(context.BaseDockerContext):
                 "additionalProperties": False,
                 "required": ["Driver"]
             },
+            "subnet-pool": {
+                "type": "object",
+                "description": "A supernet to allocate subnets from.",
+                "properties": {
+                    "cidr": {
+                        "type": "string",
+                        "description": "IPv4 or IPv6 supernet using the CIDR "
+                                       "notation (e.g. '10.128.0.0/9' or "
+                                       "'fd00:dead:beef::/48')."
+                    },
+                    "prefixlen": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "maximum": 128,
+                        "description": "Prefix length of allocated subnets."
+                    }
+                },
+                "additionalProperties": False,
+                "required": ["cidr", "prefixlen"]
+            },
             "single-network": {
                 "type": "object",
                 "properties": {
@@ -131,30 +156,117 @@ class NetworksContext(context.BaseDockerContext):
                         "type": "boolean",
                         "description": "If set, create an ingress network "
                                        "which provides the routing-mesh in "
-                                       "swarm mode."}
+                                       "swarm mode."},
+                    "count": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "description": "A number of networks to create with "
+                                       "this configuration. Defaults to 1."
+                    },
+                    "subnet_pools": {
+                        "type": "array",
+                        "description": "Allocate a subnet from each pool for "
+                                       "every network. Subnets of one pool "
+                                       "never overlap each other and subnets "
+                                       "of existing networks, so there is no "
+                                       "need in searching free address pools "
+                                       "at Docker side. Different pools "
+                                       "should not overlap.",
+                        "items": {"$ref": "#/definitions/subnet-pool"}
+                    }
                 },
                 "additionalProperties": False
             }
         }
     }
 
-    def setup(self):
-        self.context["docker"]["networks"] = []
+    def _get_used_subnets(self):
+        used = []
+        for net in self.client.list_networks():
+            for pool in (net.get("IPAM") or {}).get("Config") or []:
+                if pool.get("Subnet"):
+                    used.append(netaddr.IPNetwork(pool["Subnet"]))
+        return used
+
+    def _allocate_subnet(self, pool):
+        """Allocate the next subnet of the pool that is not used yet."""
+        if self._used_subnets is None:
+            self._used_subnets = self._get_used_subnets()
+        key = (pool["cidr"], pool["prefixlen"])
+        if key not in self._allocators:
+            supernet = netaddr.IPNetwork(pool["cidr"])
+            max_prefixlen = 32 if supernet.version == 4 else 128
+            if not (supernet.prefixlen <= pool["prefixlen"] <= max_prefixlen):
+                raise exceptions.ContextSetupFailure(
+                    ctx_name=self.get_name(),
+                    msg="Prefix length %s does not fit supernet %s." % (
+                        pool["prefixlen"], pool["cidr"]))
+            self._allocators[key] = supernet.subnet(pool["prefixlen"])
+        # subnets of one pool are disjoint, so it is enough to check them
+        #   only against subnets of already existing networks
+        for subnet in self._allocators[key]:
+            if not any(subnet in used or used in subnet
+                       for used in self._used_subnets):
+                return subnet
+        raise exceptions.ContextSetupFailure(
+            ctx_name=self.get_name(),
+            msg="There is no more free /%s subnets in %s." % (
+                pool["prefixlen"], pool["cidr"]))
+
+    def _get_networks_configs(self):
         networks = self.config
         if isinstance(networks, dict):
             networks = [networks]
 
+        configs = []
         for net_cfg in networks:
-            net_cfg = copy.deepcopy(net_cfg)
+            # config is read-only, so make a shallow copy to modify it
+            net_cfg = dict(net_cfg)
+            count = net_cfg.pop("count", 1)
+            pools = net_cfg.pop("subnet_pools", [])
             if "ipam" in net_cfg:
-                net_cfg["ipam"].setdefault("Options", {})
-            self.context["docker"]["networks"].append(
-                self.client.create_network(**net_cfg))
+                ipam = dict(net_cfg["ipam"])
+                ipam.setdefault("Options", {})
+                net_cfg["ipam"] = ipam
+            if not pools:
+                # all networks of one configuration share the same arguments,
+                #   since create_network does not modify them
+                configs.extend([net_cfg] * count)
+                continue
+
+            for i in range(count):
+                cfg = dict(net_cfg)
+                ipam = dict(cfg.get("ipam", {"Driver": "default",
+                                             "Options": {}}))
+                ipam["Config"] = list(ipam.get("Config", []))
+                for pool in pools:
+                    subnet = self._allocate_subnet(pool)
+                    ipam["Config"].append({"subnet": str(subnet)})
+                    if subnet.version == 6:
+                        cfg["enable_ipv6"] = True
+                cfg["ipam"] = ipam
+                configs.append(cfg)
+        return configs
+
+    def setup(self):
+        self.context["docker"]["networks"] = []
+        self._allocators = {}
+        self._used_subnets = None
+
+        configs = self._get_networks_configs()
+
+        self._create_resources(
+            lambda net_cfg: self.client.create_network(**net_cfg), configs,
+            resources=self.context["docker"]["networks"],
+            resource_name="network",
+            threads=CONF.docker.networks_context_threads)
 
     def cleanup(self):
         manager.cleanup(
             names=["network"],
             spec=self.context["env"]["platforms"]["docker"],
             superclass=self.__class__,
-            owner_id=self.get_owner_id()
+            owner_id=self.get_owner_id(),
+            raw_resources={
+                "network": self.context["docker"].get("networks", [])}
         )
@@ -0,0 +1,180 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import shutil
+import tempfile
+import time
+
+from rally.common import logging
+from rally.common import utils as rutils
+from rally import exceptions
+
+from xrally_docker.common import build_context
+from xrally_docker.common.cleanup import manager
+from xrally_docker.task import context
+
+
+LOG = logging.getLogger(__name__)
+
+
+@context.configure("registry", order=110)
+class RegistryContext(context.BaseDockerContext):
+    """Start a local registry and seed it with images.
+
+    Scenarios which accept image names use images from the registry instead
+    of the original ones (i.e. 'busybox' is replaced by
+    'localhost:5000/busybox:<random tag>'). Generated images are available
+    by names 'xrally-generated-<number>'.
+    """
+
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "properties": {
+            "image": {
+                "type": "string",
+                "description": "The image of registry. It should be present "
+                               "locally at offline hosts."
+            },
+            "port": {
+                "type": "integer",
+                "minimum": 1,
+                "maximum": 65535,
+                "description": "The port of docker host to publish the "
+                               "registry at."
+            },
+            "timeout": {
+                "type": "number",
+                "minimum": 0,
+                "description": "Time to wait for the registry to start, in "
+                               "seconds."
+            },
+            "images": {
+                "type": "array",
+                "description": "Local images to push to the registry. Images "
+                               "generated by synthetic_images@docker "
+                               "context can be used as well.",
+                "items": {"type": "string",
+                          "description": "The name of local image."}
+            },
+            "generated": {
+                "type": "object",
+                "description": "Generate images with random layers and push "
+                               "them to the registry. Local copies of "
+                               "generated images are removed, so pulling "
+                               "them downloads all layers.",
+                "properties": {
+                    "count": {"type": "integer", "minimum": 1,
+                              "description": "A number of images."},
+                    "layers_count": {"type": "integer", "minimum": 1,
+                                     "description": "A number of layers."},
+                    "layer_size": {"type": "integer", "minimum": 1,
+                                   "description": "A size of each layer in "
+                                                  "bytes."}
+                },
+                "additionalProperties": False,
+                "required": ["count"]
+            }
+        },
+        "additionalProperties": False
+    }
+
+    DEFAULT_CONFIG = {"image": "registry:2", "port": 5000, "timeout": 60,
+                      "images": []}
+
+    def _wait_for_registry(self, container_id):
+        started_at = time.time()
+        while time.time() - started_at < self.config["timeout"]:
+            if self.client.get_container(container_id)["State"]["Running"]:
+                return
+            rutils.interruptable_sleep(1)
+        raise exceptions.ContextSetupFailure(
+            ctx_name=self.get_name(),
+            msg="Registry container %s has not started in %s seconds." % (
+                container_id, self.config["timeout"]))
+
+    def _push(self, name, attempts=10):
+        # the registry may not be ready to accept connections right after
+        #   the start of container
+        for i in range(attempts):
+            try:
+                return self.client.push_image(name)
+            except Exception:
+                if i == attempts - 1:
+                    raise
+                rutils.interruptable_sleep(1)
+
+    def _seed_image(self, name):
+        registry = self.context["docker"]["registry"]
+        if ":" not in name.rsplit("/", 1)[-1]:
+            name = "%s:latest" % name
+        repository = "%s/%s" % (registry["address"],
+                                name.rsplit(":", 1)[0])
+        tag = self.generate_random_name()
+        # images generated by synthetic_images@docker context have random
+        #   tags
+        source = self.context["docker"].get("synthetic_images", {}).get(
+            name, name)
+        self.client.tag_image(source, tags=[tag], repository=repository)
+        registry["images"][name] = "%s:%s" % (repository, tag)
+        self._push(registry["images"][name])
+        self.client.delete_image(registry["images"][name])
+
+    def _seed_generated_image(self, index, layers_count, layer_size):
+        registry = self.context["docker"]["registry"]
+        path = tempfile.mkdtemp()
+        try:
+            build_context.generate(path, layers_count=layers_count,
+                                   layer_size=layer_size)
+            image = self.client.build_image(
+                path, repository="%s/xrally-generated-%s" % (
+                    registry["address"], index))
+        finally:
+            shutil.rmtree(path)
+        name = image["RepoTags"][0]
+        registry["images"]["xrally-generated-%s:latest" % index] = name
+        self._push(name)
+        self.client.delete_image(name)
+
+    def setup(self):
+        container = self.client.run_container(
+            image_name=self.config["image"], detach=True, remove=False,
+            ports={"5000/tcp": self.config["port"]})
+        self.context["docker"]["registry"] = {
+            "address": "localhost:%s" % self.config["port"],
+            "container": container.id,
+            "images": {}
+        }
+        self._wait_for_registry(container.id)
+
+        for name in self.config["images"]:
+            self._seed_image(name)
+
+        generated = self.config.get("generated")
+        if generated:
+            for i in range(generated["count"]):
+                self._seed_generated_image(
+                    i, layers_count=generated.get("layers_count", 1),
+                    layer_size=generated.get("layer_size", 1048576))
+
+    def cleanup(self):
+        registry = self.context["docker"].get("registry")
+        if registry:
+            self.client.delete_container(registry["container"],
+                                         volumes=True)
+        manager.cleanup(
+            names=["image"],
+            spec=self.context["env"]["platforms"]["docker"],
+            superclass=self.__class__,
+            owner_id=self.get_owner_id()
+        )
@@ -0,0 +1,101 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import shutil
+import tempfile
+
+from xrally_docker.common import build_context
+from xrally_docker.common.cleanup import manager
+from xrally_docker.task import context
+
+
+@context.configure("synthetic_images", order=105)
+class SyntheticImagesContext(context.BaseDockerContext):
+    """Generate images with the specified layers structure.
+
+    Images are available for scenarios by names 'xrally-synthetic-<number>'
+    (numbers start from 0 in order of the configuration). Each image is
+    tagged with a Rally-owned tag, so it is removed at cleanup.
+    """
+
+    CONFIG_SCHEMA = {
+        "type": "array",
+        "description": "A list of images to generate.",
+        "items": {
+            "type": "object",
+            "description": "The structure of the image.",
+            "properties": {
+                "base_image": {
+                    "type": "string",
+                    "description": "The image to build from. Defaults to "
+                                   "'scratch'."
+                },
+                "layers_count": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "description": "A number of layers."
+                },
+                "layer_size": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "description": "A size of each layer in bytes."
+                },
+                "files_per_layer": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "description": "A number of files in each layer."
+                },
+                "compressibility": {
+                    "type": "number",
+                    "minimum": 0,
+                    "maximum": 1,
+                    "description": "A fraction of each file which can be "
+                                   "compressed. 0 means random content, 1 "
+                                   "means zeros only."
+                }
+            },
+            "additionalProperties": False
+        },
+        "minItems": 1
+    }
+
+    def setup(self):
+        self.context["docker"].setdefault("images", [])
+        self.context["docker"]["synthetic_images"] = {}
+
+        for i, image_cfg in enumerate(self.config):
+            path = tempfile.mkdtemp()
+            try:
+                build_context.generate(
+                    path,
+                    base_image=image_cfg.get("base_image", "scratch"),
+                    layers_count=image_cfg.get("layers_count", 1),
+                    layer_size=image_cfg.get("layer_size", 1048576),
+                    files_per_layer=image_cfg.get("files_per_layer", 1),
+                    compressibility=image_cfg.get("compressibility", 0.0))
+                image = self.client.build_image(
+                    path, repository="xrally-synthetic-%s" % i)
+            finally:
+                shutil.rmtree(path)
+            self.context["docker"]["images"].append(image)
+            self.context["docker"]["synthetic_images"][
+                "xrally-synthetic-%s:latest" % i] = image["RepoTags"][0]
+
+    def cleanup(self):
+        manager.cleanup(
+            names=["image"],
+            spec=self.context["env"]["platforms"]["docker"],
+            superclass=self.__class__,
+            owner_id=self.get_owner_id()
+        )
@@ -0,0 +1,76 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from rally.common import cfg
+
+from xrally_docker.common.cleanup import manager
+from xrally_docker.task import context
+
+
+CONF = cfg.CONF
+
+
+@context.configure("volumes", order=100)
+class VolumesContext(context.BaseDockerContext):
+    """Create docker volumes in parallel."""
+
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "properties": {
+            "count": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "A number of volumes to create."
+            },
+            "driver": {
+                "type": "string",
+                "description": "Name of the driver used to create volumes."
+            },
+            "driver_opts": {
+                "type": "object",
+                "description": "Driver options as a key-value dictionary."
+            },
+            "labels": {
+                "type": "object",
+                "description": "Map of labels to set on volumes."
+            }
+        },
+        "additionalProperties": False
+    }
+
+    DEFAULT_CONFIG = {"count": 1}
+
+    def _create_volume(self, index):
+        return self.client.create_volume(
+            driver=self.config.get("driver"),
+            driver_opts=self.config.get("driver_opts"),
+            labels=self.config.get("labels"))
+
+    def setup(self):
+        self.context["docker"]["volumes"] = []
+        self._create_resources(
+            self._create_volume, range(self.config["count"]),
+            resources=self.context["docker"]["volumes"],
+            resource_name="volume",
+            threads=CONF.docker.volumes_context_threads)
+
+    def cleanup(self):
+        manager.cleanup(
+            names=["volume"],
+            spec=self.context["env"]["platforms"]["docker"],
+            superclass=self.__class__,
+            owner_id=self.get_owner_id(),
+            raw_resources={
+                "volume": self.context["docker"].get("volumes", [])}
+        )
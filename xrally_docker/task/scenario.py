@@ -12,13 +12,37 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
+import threading
+import time
+
+from rally.common import logging
 from rally.common.plugin import plugin
+from rally.common import utils as rutils
 from rally.common import validation
 from rally.task import scenario
 
+from xrally_docker.common import daemon_stats
+from xrally_docker.common import events
+from xrally_docker.common import sharding
 from xrally_docker import service
 
 
+LOG = logging.getLogger(__name__)
+
+# NOTE: images pulled by iterations of the current process. Concurrent
+#   iterations wait for the single pull of the image instead of pulling it
+#   simultaneously.
+_PULLED_IMAGES = {}
+_PULLED_IMAGES_LOCK = threading.Lock()
+
+# NOTE: these contexts create resources at the first host of multi-host
+#   platform only, so workloads which use them are not distributed
+#   across hosts.
+_FIRST_HOST_CONTEXTS = ("networks", "volumes", "registry",
+                        "synthetic_images")
+
+
 def configure(name=None, context=None):
     return scenario.configure(name=name, platform="docker", context=context)
 
@@ -28,8 +52,208 @@ def configure(name=None, context=None):
 class BaseDockerScenario(scenario.Scenario):
     def __init__(self, context=None):
         super(BaseDockerScenario, self).__init__(context)
+        self._generated_names = None
+        self._host = None
         if "env" in self.context:
+            spec = self.context["env"]["platforms"]["docker"]
+            if self.context.get("iteration") == 1:
+                self._add_daemon_info_output(spec)
+            if spec.get("hosts"):
+                docker_ctx = self.context.get("docker", {})
+                if any(k in docker_ctx for k in _FIRST_HOST_CONTEXTS):
+                    spec = spec["hosts"][0]
+                else:
+                    spec = self._select_host(spec)
+            self._host = spec.get("host")
             self.client = service.Docker(
-                self.context["env"]["platforms"]["docker"],
+                spec,
                 atomic_inst=self.atomic_actions(),
                 name_generator=self.generate_random_name)
+        monitor = self.context.get("docker", {}).get("daemon_monitor")
+        if monitor:
+            self.run = self._add_daemon_samples(self.run, monitor["path"])
+        events_ctx = self.context.get("docker", {}).get("events")
+        if events_ctx and "env" in self.context:
+            self._generated_names = set()
+            self.run = self._record_events(self.run, events_ctx["types"])
+
+    def generate_random_name(self):
+        name = super(BaseDockerScenario, self).generate_random_name()
+        if self._generated_names is not None:
+            self._generated_names.add(name)
+        return name
+
+    def _add_daemon_samples(self, run, path):
+        """Wrap the scenario to save daemon samples taken during it."""
+
+        @functools.wraps(run)
+        def wrapper(*args, **kwargs):
+            started_at = time.time()
+            try:
+                return run(*args, **kwargs)
+            finally:
+                with rutils.Timer() as timer:
+                    try:
+                        samples = daemon_stats.read_samples(
+                            path, since=started_at, until=time.time())
+                    except Exception as e:
+                        LOG.warning("Failed to read samples of Docker "
+                                    "daemon: %s" % e)
+                        samples = []
+                    for output in daemon_stats.make_output(samples):
+                        self.add_output(additive=output)
+                # NOTE: reading samples is not a part of the workload, so it
+                #   is excluded from the duration of iteration
+                self._idle_duration += timer.duration()
+
+        return wrapper
+
+    def _record_events(self, run, types):
+        """Wrap the scenario to save daemon events of its resources."""
+
+        @functools.wraps(run)
+        def wrapper(*args, **kwargs):
+            started_at = time.time()
+            try:
+                return run(*args, **kwargs)
+            finally:
+                self._add_events_output(started_at, types)
+
+        return wrapper
+
+    def _add_events_output(self, started_at, types):
+        with rutils.Timer() as timer:
+            try:
+                iteration_events = self.client.list_events(
+                    since=started_at, until=time.time(),
+                    filters={"type": list(types)})
+            except Exception as e:
+                LOG.warning("Failed to get Docker events: %s" % e)
+                iteration_events = []
+        # NOTE: getting events is not a part of the workload, so it is
+        #   excluded from the duration of iteration
+        self._idle_duration += timer.duration()
+
+        iteration_events = [
+            e for e in iteration_events
+            if events.matches_names(e, self._generated_names)]
+        if not iteration_events:
+            return
+        for title, durations in events.get_phases(iteration_events):
+            self.add_output(additive={
+                "title": "Daemon-side duration of %s" % title,
+                "description": "Time between daemon events of resources "
+                               "created at the iteration.",
+                "chart_plugin": "Lines",
+                "label": "seconds",
+                "data": [["avg", sum(durations) / len(durations)],
+                         ["max", max(durations)]]})
+        self.add_output(complete={
+            "title": "Docker events",
+            "description": "Events of resources created at the iteration. "
+                           "Time is counted from the beginning of the "
+                           "iteration, clocks of the client and the daemon "
+                           "are expected to be synchronized.",
+            "chart_plugin": "Table",
+            "data": {
+                "cols": ["Time", "Type", "Action", "Name"],
+                "rows": [[round(events.get_timestamp(e) - started_at, 3),
+                          e.get("Type"), e.get("Action"),
+                          events.get_actor_name(e)]
+                         for e in sorted(iteration_events,
+                                         key=events.get_timestamp)]}})
+
+    def _add_daemon_info_output(self, spec):
+        """Save configuration of daemons to make results comparable."""
+        hosts = [h for h in spec.get("hosts") or [spec] if h.get("daemon")]
+        if not hosts:
+            return
+        self.add_output(complete={
+            "title": "Docker daemon",
+            "description": "Configuration and capacity of Docker daemons "
+                           "at the moment of creating the environment.",
+            "chart_plugin": "Table",
+            "data": {
+                "cols": ["Property"] + [h.get("host") or "default"
+                                        for h in hosts],
+                "rows": [[key] + [h["daemon"].get(key) for h in hosts]
+                         for key in service.Docker.DAEMON_INFO_KEYS]}})
+
+    def _select_host(self, spec):
+        """Select a host of the multi-host platform for the iteration."""
+        hosts = spec["hosts"]
+        index = sharding.ROUTER.select(
+            len(hosts), spec.get("sharding", "round_robin"),
+            self.context.get("iteration", 1))
+        sharding.ROUTER.track(index, self.atomic_actions())
+
+        self.add_output(additive={
+            "title": "Iterations per Docker host",
+            "chart_plugin": "StackedArea",
+            "data": [[h["host"], int(i == index)]
+                     for i, h in enumerate(hosts)]})
+        latency = []
+        for i, host in enumerate(hosts):
+            value = sharding.ROUTER.get_latency(i)
+            if value is not None:
+                latency.append([host["host"], value])
+        if latency:
+            self.add_output(additive={
+                "title": "Observed latency of Docker hosts",
+                "description": "Moving average of durations of atomic "
+                               "actions at each host.",
+                "chart_plugin": "Lines",
+                "label": "seconds",
+                "data": latency})
+        return hosts[index]
+
+    def _get_image_name(self, image_name):
+        """Get the name of image with a tag (see get_image_name)."""
+        return get_image_name(self.context, image_name)
+
+    def _ensure_image(self, image_name):
+        """Pull the image if it was not loaded by images@docker context.
+
+        The image is pulled only once per process for the workload, other
+        iterations wait for the pull to finish.
+
+        :returns: the name of image with a tag
+        """
+        image_name = self._get_image_name(image_name)
+        if find_image(self.context, image_name):
+            return image_name
+
+        key = (self.context.get("owner_id"), self._host, image_name)
+        with _PULLED_IMAGES_LOCK:
+            pull = _PULLED_IMAGES.setdefault(
+                key, {"lock": threading.Lock(), "done": False})
+        with pull["lock"]:
+            # the pull is retried by the next iteration if it has failed
+            if not pull["done"]:
+                self.client.pull_image(image_name)
+                pull["done"] = True
+        return image_name
+
+
+def get_image_name(context, image_name):
+    """Get the name of image with a tag.
+
+    If registry@docker context is used, the name of image from the local
+    registry is returned. Names of images generated by
+    synthetic_images@docker context are resolved as well.
+    """
+    if ":" not in image_name.rsplit("/", 1)[-1]:
+        image_name = "%s:latest" % image_name
+    ctx = context.get("docker", {})
+    registry = ctx.get("registry")
+    if registry and image_name in registry["images"]:
+        return registry["images"][image_name]
+    return ctx.get("synthetic_images", {}).get(image_name, image_name)
+
+
+def find_image(context, image_name):
+    """Find the image loaded by images@docker context by its name."""
+    for image in context.get("docker", {}).get("images", []):
+        if image_name in (image.get("RepoTags") or []):
+            return image
+    return None
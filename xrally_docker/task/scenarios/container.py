@@ -12,11 +12,28 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+
+from rally.common import logging
+from rally.common import utils as rutils
+from rally import exceptions
+from rally.task import types
 import six
 
+from xrally_docker.common import daemon_stats
+from xrally_docker.common import stats
 from xrally_docker.task import scenario
+from xrally_docker.task import validators
+
+
+LOG = logging.getLogger(__name__)
 
 
+@types.convert(image_name={"type": "docker_image@docker"})
 @scenario.configure(
     "Docker.run_container",
     context={"images@docker": {"existing": True}})
@@ -28,12 +45,7 @@ class RunContainer(scenario.BaseDockerScenario):
         :param image_name: The name of image to start
         :param command: The command to launch in container
         """
-        if ":" not in image_name:
-            image_name = "%s:latest" % image_name
-        p_match = [i for i in self.context["docker"]["images"]
-                   if image_name in i["RepoTags"]]
-        if not p_match:
-            self.client.pull_image(image_name)
+        image_name = self._ensure_image(image_name)
 
         output = self.client.run_container(image_name=image_name,
                                            command=command)
@@ -42,3 +54,337 @@ class RunContainer(scenario.BaseDockerScenario):
         self.add_output(complete={"title": "Script Output",
                                   "chart_plugin": "TextArea",
                                   "data": output})
+
+
+@validators.add("enum", param_name="target", missed=True,
+                values=["overlay", "volume", "bind", "tmpfs"])
+@validators.add("enum", param_name="rw", missed=True,
+                values=["read", "write", "randread", "randwrite"])
+@validators.add("number", param_name="block_size", minval=512,
+                integer_only=True, nullable=True)
+@validators.add("number", param_name="file_size", minval=1,
+                integer_only=True, nullable=True)
+@types.convert(image_name={"type": "docker_image@docker"})
+@scenario.configure(
+    "Docker.filesystem_io",
+    context={"images@docker": {"existing": True},
+             "cleanup@docker": ["container", "volume"]})
+class FilesystemIO(scenario.BaseDockerScenario):
+
+    MOUNT_PATH = "/xrally-io"
+    PERCENTILES = ("50", "95", "99", "99.9")
+
+    def _parse_fio_output(self, output, rw):
+        if isinstance(output, six.binary_type):
+            output = output.decode("utf-8")
+        # fio may print warnings before the json
+        result = json.loads(output[output.index("{"):])
+        job_stats = result["jobs"][0]["read" if "read" in rw else "write"]
+        if "clat_ns" in job_stats:
+            percentiles = job_stats["clat_ns"]["percentile"]
+            divider = 1000000.0
+        else:
+            # fio < 3.0 reports latency in microseconds
+            percentiles = job_stats["clat"]["percentile"]
+            divider = 1000.0
+        latency = []
+        for p in self.PERCENTILES:
+            key = "%.6f" % float(p)
+            if key in percentiles:
+                latency.append(["p%s" % p, percentiles[key] / divider])
+        return {"bw": job_stats.get("bw_bytes", job_stats["bw"] * 1024),
+                "iops": job_stats["iops"],
+                "latency": latency}
+
+    def run(self, image_name, target="overlay", rw="write",
+            block_size=4096, file_size=67108864, direct=False,
+            bind_path=None):
+        """Run fio inside a container and measure the filesystem I/O.
+
+        :param image_name: The name of image with fio installed. fio is used
+            as the entrypoint regardless of the image one.
+        :param target: Where to perform I/O: ``overlay`` is the writable
+            layer of the container, ``volume`` is a new named volume,
+            ``bind`` is a host directory (see ``bind_path``) and ``tmpfs`` is
+            a temporary filesystem in memory
+        :param rw: I/O pattern: ``read``, ``write`` (sequential) or
+            ``randread``, ``randwrite`` (random)
+        :param block_size: A size of I/O operations in bytes
+        :param file_size: A size of file to perform I/O on in bytes
+        :param direct: Use non-buffered I/O (O_DIRECT). It is not supported
+            by tmpfs.
+        :param bind_path: A directory on the docker host to use for ``bind``
+            target
+        """
+        if target == "bind" and not bind_path:
+            raise exceptions.InvalidArgumentsException(
+                "bind_path is required for 'bind' target.")
+        image_name = self._ensure_image(image_name)
+
+        volumes, tmpfs, volume = None, None, None
+        if target == "volume":
+            volume = self.client.create_volume()
+            volumes = {volume["Name"]: {"bind": self.MOUNT_PATH,
+                                        "mode": "rw"}}
+        elif target == "bind":
+            volumes = {bind_path: {"bind": self.MOUNT_PATH, "mode": "rw"}}
+        elif target == "tmpfs":
+            # leave some room for the filesystem metadata
+            tmpfs = {self.MOUNT_PATH: "size=%s" % (file_size + 1048576)}
+
+        command = ["--name=xrally", "--directory=%s" % self.MOUNT_PATH,
+                   "--filename=%s" % self.generate_random_name(),
+                   "--rw=%s" % rw, "--bs=%s" % block_size,
+                   "--size=%s" % file_size, "--direct=%d" % direct,
+                   "--ioengine=psync", "--unlink=1", "--output-format=json"]
+        try:
+            output = self.client.run_container(
+                image_name=image_name, command=command, volumes=volumes,
+                tmpfs=tmpfs, entrypoint="fio")
+        finally:
+            if volume:
+                self.client.delete_volume(volume["Name"])
+
+        result = self._parse_fio_output(output, rw)
+        name = "%s %s" % (target, rw)
+        self.add_output(additive={
+            "title": "Filesystem I/O throughput",
+            "chart_plugin": "Lines",
+            "label": "MiB/s",
+            "data": [[name, result["bw"] / 1048576.0]]})
+        self.add_output(additive={
+            "title": "Filesystem I/O operations",
+            "chart_plugin": "Lines",
+            "label": "IOPS",
+            "data": [[name, result["iops"]]]})
+        self.add_output(additive={
+            "title": "Filesystem I/O latency",
+            "description": "Completion latency percentiles of %s I/O "
+                           "operations of %s bytes." % (rw, block_size),
+            "chart_plugin": "Lines",
+            "label": "ms",
+            "data": result["latency"]})
+
+
+@validators.add("number", param_name="files_count", minval=1,
+                integer_only=True, nullable=True)
+@validators.add("number", param_name="file_size", minval=0,
+                integer_only=True, nullable=True)
+@types.convert(image_name={"type": "docker_image@docker"})
+@scenario.configure(
+    "Docker.copy_files",
+    context={"images@docker": {"existing": True},
+             "cleanup@docker": ["container"]})
+class CopyFiles(scenario.BaseDockerScenario):
+
+    def run(self, image_name, files_count=10, file_size=1048576,
+            path="/tmp", command="sleep 3600"):
+        """Copy files to a container and back via the archive API.
+
+        Random files are packed into a tarball which is streamed to a running
+        container and the extracted directory is downloaded back into
+        another tarball, so archives are never kept in memory.
+
+        :param image_name: The name of image to start the container from
+        :param files_count: A number of files to copy
+        :param file_size: A size of each file in bytes
+        :param path: An existing directory in the container to copy files to
+        :param command: A long-living command to launch in the container
+        """
+        image_name = self._ensure_image(image_name)
+
+        tmp_path = tempfile.mkdtemp()
+        try:
+            dir_name = self.generate_random_name()
+            src = os.path.join(tmp_path, dir_name)
+            os.mkdir(src)
+            for i in range(files_count):
+                with open(os.path.join(src, "file-%s" % i), "wb") as f:
+                    f.write(os.urandom(file_size))
+            tarball = os.path.join(tmp_path, "upload.tar")
+            with tarfile.open(tarball, "w") as tar:
+                tar.add(src, arcname=dir_name)
+
+            container = self.client.run_container(
+                image_name=image_name, command=command, detach=True,
+                remove=False)
+            try:
+                with rutils.Timer() as upload_timer:
+                    uploaded = self.client.put_archive(
+                        container.id, path=path, tarball=tarball)
+                with rutils.Timer() as download_timer:
+                    downloaded = self.client.get_archive(
+                        container.id, path="%s/%s" % (path.rstrip("/"),
+                                                      dir_name),
+                        tarball=os.path.join(tmp_path, "download.tar"))
+            finally:
+                self.client.delete_container(container.id)
+        finally:
+            shutil.rmtree(tmp_path)
+
+        self.add_output(additive={
+            "title": "Archive throughput",
+            "description": "Copied %s files of %s bytes." % (
+                files_count, file_size),
+            "chart_plugin": "Lines",
+            "label": "MiB/s",
+            "data": [
+                ["upload",
+                 uploaded / 1048576.0 / upload_timer.duration()],
+                ["download",
+                 downloaded / 1048576.0 / download_timer.duration()]]})
+        self.add_output(additive={
+            "title": "Archive files rate",
+            "chart_plugin": "Lines",
+            "label": "files/s",
+            "data": [["upload", files_count / upload_timer.duration()],
+                     ["download", files_count / download_timer.duration()]]})
+
+
+@validators.add("number", param_name="max_containers", minval=1,
+                integer_only=True, nullable=True)
+@validators.add("number", param_name="step_size", minval=1,
+                integer_only=True, nullable=True)
+@validators.add("number", param_name="concurrency", minval=1,
+                integer_only=True, nullable=True)
+@validators.add("number", param_name="requests_count", minval=1,
+                integer_only=True, nullable=True)
+@validators.add("number", param_name="max_latency", minval=0,
+                nullable=True)
+@validators.add("number", param_name="max_latency_growth", minval=1,
+                nullable=True)
+@validators.add("number", param_name="max_memory_usage", minval=0,
+                maxval=100, nullable=True)
+@types.convert(image_name={"type": "docker_image@docker"})
+@scenario.configure(
+    "Docker.container_density",
+    context={"images@docker": {"existing": True},
+             "cleanup@docker": ["container"]})
+class ContainerDensity(scenario.BaseDockerScenario):
+
+    LATENCY_KEYS = ("create", "list", "inspect")
+
+    def _check_limits(self, steps, max_latency, max_latency_growth,
+                      max_memory_usage):
+        """Get the reason to stop starting containers if any."""
+        step = steps[-1]
+        for key in self.LATENCY_KEYS:
+            if max_latency is not None and step[key] > max_latency:
+                return ("%s latency %.3fs exceeds %.3fs"
+                        % (key, step[key], max_latency))
+            if (max_latency_growth is not None
+                    and step[key] > steps[0][key] * max_latency_growth):
+                return ("%s latency %.3fs exceeds %s times the latency of "
+                        "the first step (%.3fs)"
+                        % (key, step[key], max_latency_growth,
+                           steps[0][key]))
+        if (max_memory_usage is not None and step["memory"] is not None
+                and step["memory"] * 100.0 / step["memory_total"]
+                > max_memory_usage):
+            return ("host memory usage exceeds %s%%" % max_memory_usage)
+        return None
+
+    def run(self, image_name, max_containers=100, step_size=10,
+            concurrency=None, command="sleep 3600", requests_count=5,
+            max_latency=None, max_latency_growth=None,
+            max_memory_usage=None):
+        """Start idle containers in steps until API latency degrades.
+
+        After each step, latency of list and inspect requests and of create
+        requests of the step is measured together with memory usage of the
+        host (only for a local daemon). Starting containers stops when the
+        limit of containers is reached, one of the limits of latency or
+        memory usage is exceeded or containers fail to start. All containers
+        are removed at the end of the iteration.
+
+        :param image_name: The name of image to start containers from
+        :param max_containers: The maximum number of containers to start
+        :param step_size: A number of containers started at each step
+        :param concurrency: A number of simultaneous requests to start or
+            remove containers. Defaults to the step size.
+        :param command: A long-living command to launch in containers
+        :param requests_count: A number of list and inspect requests issued
+            at each step. Median latency is reported.
+        :param max_latency: Stop when median latency of any kind of requests
+            exceeds this value in seconds
+        :param max_latency_growth: Stop when median latency of any kind of
+            requests grows more than this number of times comparing to the
+            first step
+        :param max_memory_usage: Stop when memory usage of the host exceeds
+            this percent
+        """
+        image_name = self._ensure_image(image_name)
+        is_local = daemon_stats.is_local({"host": self._host})
+        if max_memory_usage is not None and not is_local:
+            LOG.warning("Docker daemon is not local. The limit of memory "
+                        "usage is ignored.")
+
+        containers, steps = [], []
+        reason = "the limit of %s containers is reached" % max_containers
+        try:
+            while len(containers) < max_containers:
+                ids, durations, errors = self.client.start_containers(
+                    image_name, count=min(step_size,
+                                          max_containers - len(containers)),
+                    command=command, concurrency=concurrency)
+                containers.extend(ids)
+                if errors:
+                    if not steps:
+                        raise errors[0]
+                    reason = "containers failed to start: %s" % errors[0]
+                    break
+
+                durations = dict(self.client.probe_container_requests(
+                    containers[-1], requests_count=requests_count),
+                    create=durations)
+                step = dict((key, stats.percentile(sorted(values), 50))
+                            for key, values in durations.items())
+                step.update({"containers": len(containers), "memory": None,
+                             "memory_total": None})
+                if is_local:
+                    step["memory"], step["memory_total"] = (
+                        daemon_stats.get_memory_usage())
+                steps.append(step)
+
+                limit = self._check_limits(steps, max_latency,
+                                           max_latency_growth,
+                                           max_memory_usage)
+                if limit:
+                    reason = limit
+                    break
+        finally:
+            if containers:
+                self.client.delete_containers(
+                    containers, concurrency=concurrency or step_size)
+
+        self._add_density_output(steps, reason)
+
+    def _add_density_output(self, steps, reason):
+        self.add_output(additive={
+            "title": "Container density",
+            "description": "The number of idle containers started before "
+                           "stopping.",
+            "chart_plugin": "Lines",
+            "data": [["containers", steps[-1]["containers"]]]})
+        self.add_output(complete={
+            "title": "Latency by the number of containers",
+            "description": "Median latency of requests after each step.",
+            "chart_plugin": "Lines",
+            "axis_label": "Number of containers",
+            "label": "seconds",
+            "data": [[key, [[s["containers"], s[key]] for s in steps]]
+                     for key in self.LATENCY_KEYS]})
+        if steps[-1]["memory"] is not None:
+            self.add_output(complete={
+                "title": "Host memory usage by the number of containers",
+                "chart_plugin": "Lines",
+                "axis_label": "Number of containers",
+                "label": "MiB",
+                "data": [["used", [[s["containers"],
+                                    s["memory"] / 1048576.0]
+                                   for s in steps]]]})
+        self.add_output(complete={
+            "title": "Container density limit",
+            "chart_plugin": "TextArea",
+            "data": ["Stopped at %s containers: %s."
+                     % (steps[-1]["containers"], reason)]})
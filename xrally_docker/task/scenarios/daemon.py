@@ -0,0 +1,68 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from rally.common import utils as rutils
+
+from xrally_docker.common import stats
+from xrally_docker import service
+from xrally_docker.task import scenario
+from xrally_docker.task import validators
+
+
+@validators.add("enum", param_name="call",
+                values=sorted(service.Docker.FAN_OUT_CALLS), missed=True)
+@validators.add("number", param_name="calls_count", minval=1,
+                integer_only=True, nullable=True)
+@validators.add("number", param_name="concurrency", minval=1,
+                integer_only=True, nullable=True)
+@scenario.configure("Docker.fan_out_api_calls")
+class FanOutAPICalls(scenario.BaseDockerScenario):
+
+    def run(self, call="ping", calls_count=100, concurrency=None):
+        """Issue many simultaneous API requests from one iteration.
+
+        It allows to saturate the daemon from a single runner worker without
+        starting a worker per request.
+
+        :param call: A read-only API request: ``ping``, ``version``,
+            ``info``, ``list_containers``, ``list_images``,
+            ``list_networks`` or ``list_volumes``
+        :param calls_count: A number of requests per iteration
+        :param concurrency: A number of simultaneous requests. Defaults to
+            ``calls_count``.
+        """
+        with rutils.Timer() as timer:
+            durations, errors = self.client.fan_out(
+                call, calls_count=calls_count, concurrency=concurrency)
+
+        self.add_output(additive={
+            "title": "Fan-out throughput",
+            "description": "Successful %s requests per second." % call,
+            "chart_plugin": "Lines",
+            "label": "requests/s",
+            "data": [[call, len(durations) / timer.duration()]]})
+        if durations:
+            durations.sort()
+            self.add_output(additive={
+                "title": "Fan-out latency",
+                "chart_plugin": "Lines",
+                "label": "seconds",
+                "data": [["p%s" % p, stats.percentile(durations, p)]
+                         for p in (50, 95, 99)] + [["max", durations[-1]]]})
+        self.add_output(additive={
+            "title": "Fan-out errors",
+            "chart_plugin": "Lines",
+            "data": [["errors", len(errors)]]})
+        if errors:
+            raise errors[0]
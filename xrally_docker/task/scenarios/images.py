@@ -0,0 +1,263 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import shutil
+import tempfile
+
+from rally.common import utils as rutils
+from rally.task import atomic
+from rally.task import types
+
+from xrally_docker.common import build_context
+from xrally_docker.task import scenario
+from xrally_docker.task import validators
+
+
+@scenario.configure("Docker.pull_image",
+                    context={"cleanup@docker": ["image"]})
+class PullImage(scenario.BaseDockerScenario):
+
+    def run(self, image_name, delete_image=None):
+        """Pull an image and measure the throughput.
+
+        Use it with registry@docker context to pull images from the local
+        registry without the network.
+
+        :param image_name: The name of image to pull
+        :param delete_image: Delete the pulled image, so the next iteration
+            downloads all its layers again. Only references added by the
+            pull are removed. Defaults to True if registry@docker context
+            is used
+        """
+        image_name = self._get_image_name(image_name)
+        if delete_image is None:
+            delete_image = "registry" in self.context.get("docker", {})
+        with rutils.Timer() as timer:
+            image = self.client.pull_image(image_name)
+        if delete_image:
+            self._delete_pulled_references(image, image_name)
+
+        size_in_mb = image["Size"] / 1048576.0
+        self.add_output(additive={
+            "title": "Image pull throughput",
+            "description": "Image size is %.2f MiB." % size_in_mb,
+            "chart_plugin": "Lines",
+            "label": "MiB/s",
+            "data": [["pull", size_in_mb / timer.duration()]]})
+
+    def _delete_pulled_references(self, image, image_name):
+        # the pull adds Rally tag to the image, layers are removed with the
+        #   last reference only
+        self.client.delete_image(image_name)
+        repository = image_name.rpartition(":")[0]
+        for name in image.get("RepoTags") or []:
+            other_repository, _sep, tag = name.rpartition(":")
+            if (name != image_name and other_repository == repository
+                    and self.name_matches_object(
+                        tag, task_id=self.get_owner_id())):
+                self.client.delete_image(name)
+
+
+@validators.add("required_contexts", contexts=("registry@docker",))
+@validators.add("number", param_name="images_count", minval=1,
+                integer_only=True, nullable=True)
+@validators.add("number", param_name="concurrency", minval=1,
+                integer_only=True, nullable=True)
+@scenario.configure("Docker.push_image",
+                    context={"cleanup@docker": ["image"]})
+class PushImage(scenario.BaseDockerScenario):
+
+    def run(self, images_count=2, concurrency=2, layers_count=3,
+            layer_size=1048576):
+        """Push images with generated layers to the local registry.
+
+        An image with new random layers is built at each iteration and it is
+        pushed to ``images_count`` repositories of the registry started by
+        registry@docker context simultaneously. Layers of the same image are
+        uploaded once per repository or found in the registry by concurrent
+        pushes, so the output shows how layers deduplication affects the
+        push latency.
+
+        :param images_count: A number of repositories to push the image to
+        :param concurrency: A number of simultaneous pushes
+        :param layers_count: A number of layers of generated image
+        :param layer_size: A size of each layer in bytes
+        """
+        address = self.context["docker"]["registry"]["address"]
+        path = tempfile.mkdtemp()
+        try:
+            build_context.generate(path, layers_count=layers_count,
+                                   layer_size=layer_size)
+            image = self.client.build_image(
+                path, repository="%s/xrally-push-0" % address)
+        finally:
+            shutil.rmtree(path)
+
+        names = [image["RepoTags"][0]]
+        for i in range(1, images_count):
+            tag = self.generate_random_name()
+            repository = "%s/xrally-push-%s" % (address, i)
+            self.client.tag_image(names[0], tags=[tag],
+                                  repository=repository)
+            names.append("%s:%s" % (repository, tag))
+
+        with rutils.Timer() as timer:
+            results = self.client.push_images(names, concurrency=concurrency)
+
+        statuses = ("pushed", "exists", "mounted")
+        uploaded = sum(r["size"] for r in results) / 1048576.0
+        self.add_output(additive={
+            "title": "Push throughput",
+            "description": "Uploaded %.2f MiB." % uploaded,
+            "chart_plugin": "Lines",
+            "label": "MiB/s",
+            "data": [["push", uploaded / timer.duration()]]})
+        self.add_output(additive={
+            "title": "Pushed layers",
+            "description": "Layers uploaded to the registry or deduplicated "
+                           "(already existing or mounted from another "
+                           "repository).",
+            "chart_plugin": "StackedArea",
+            "data": [[status, len([layer for r in results
+                                   for layer in r["layers"]
+                                   if layer["status"] == status])]
+                     for status in statuses]})
+        latency = []
+        for status in statuses:
+            durations = [layer["duration"] for r in results
+                         for layer in r["layers"] if layer["status"] == status]
+            if durations:
+                latency.append([status, sum(durations) / len(durations)])
+        self.add_output(additive={
+            "title": "Layer push latency",
+            "description": "Average time from the first progress message "
+                           "of a layer till it is pushed or deduplicated.",
+            "chart_plugin": "Lines",
+            "label": "seconds",
+            "data": latency})
+        self.add_output(complete={
+            "title": "Pushes",
+            "description": "Pushes in order of completion.",
+            "chart_plugin": "Table",
+            "data": {
+                "cols": ["Image", "Duration, s", "Uploaded, MiB"] + [
+                    "Layers %s" % s for s in statuses],
+                "rows": [[r["name"], round(r["duration"], 3),
+                          round(r["size"] / 1048576.0, 2)] + [
+                    len([layer for layer in r["layers"]
+                         if layer["status"] == s]) for s in statuses]
+                    for r in results]}})
+
+
+@validators.add("enum", param_name="mode", values=["cold", "warm"],
+                missed=True)
+@scenario.configure("Docker.build_image",
+                    context={"cleanup@docker": ["image"]})
+class BuildImage(scenario.BaseDockerScenario):
+
+    def run(self, context_path=None, dockerfile=None, mode="cold",
+            base_image="busybox", layers_count=3, layer_size=1048576):
+        """Build an image and measure build steps and cache usage.
+
+        :param context_path: A path to the directory with the build context.
+            If it is not specified, the build context is generated.
+        :param dockerfile: A path within the build context to the Dockerfile
+        :param mode: ``cold`` mode builds an image without the build cache.
+            ``warm`` mode builds an image twice and measures the second
+            build, which should reuse the build cache.
+        :param base_image: The image to build generated context from
+        :param layers_count: A number of layers of generated context
+        :param layer_size: A size of each layer of generated context in bytes
+        """
+        tmp_path = None
+        if context_path is None:
+            tmp_path = tempfile.mkdtemp()
+            context_path = tmp_path
+            build_context.generate(context_path, base_image=base_image,
+                                   layers_count=layers_count,
+                                   layer_size=layer_size)
+        try:
+            if mode == "warm":
+                with atomic.ActionTimer(self, "prime_build_cache"):
+                    self.client.build_image(context_path,
+                                            dockerfile=dockerfile)
+            image = self.client.build_image(context_path,
+                                            dockerfile=dockerfile,
+                                            nocache=(mode == "cold"))
+        finally:
+            if tmp_path:
+                shutil.rmtree(tmp_path)
+
+        steps = image["steps"]
+        cached = len([s for s in steps if s["cached"]])
+        self.add_output(additive={
+            "title": "Build steps duration",
+            "chart_plugin": "StackedArea",
+            "label": "seconds",
+            "data": [[s["name"], s["duration"]] for s in steps]})
+        self.add_output(additive={
+            "title": "Build cache hit ratio",
+            "description": "A percentage of steps which used the cache.",
+            "chart_plugin": "Lines",
+            "label": "%",
+            "data": [["cache hits",
+                      100.0 * cached / len(steps) if steps else 0]]})
+        self.add_output(additive={
+            "title": "Build context upload",
+            "description": "Context size is %.2f MiB." % (
+                image["context_size"] / 1048576.0),
+            "chart_plugin": "Lines",
+            "label": "seconds",
+            "data": [["upload", image["context_upload_duration"]]]})
+        self.add_output(complete={"title": "Build Output",
+                                  "chart_plugin": "TextArea",
+                                  "data": image["output"]})
+
+
+@types.convert(image_name={"type": "docker_image@docker"})
+@scenario.configure(
+    "Docker.save_and_load_image",
+    context={"images@docker": {"existing": True}})
+class SaveAndLoadImage(scenario.BaseDockerScenario):
+
+    def run(self, image_name):
+        """Export an image to a tarball and import it back.
+
+        Images are streamed from/to a temporary file without keeping the
+        whole tarball in memory. The image is not deleted before the load,
+        so layers which exist already are not imported again.
+
+        :param image_name: The name of image to save and load
+        """
+        image_name = self._ensure_image(image_name)
+
+        fd, path = tempfile.mkstemp(suffix=".tar")
+        os.close(fd)
+        try:
+            with rutils.Timer() as save_timer:
+                size = self.client.save_image(image_name, path=path)
+            with rutils.Timer() as load_timer:
+                self.client.load_image(path)
+        finally:
+            os.remove(path)
+
+        size_in_mb = size / 1048576.0
+        self.add_output(additive={
+            "title": "Image save/load throughput",
+            "description": "Image size is %.2f MiB." % size_in_mb,
+            "chart_plugin": "Lines",
+            "label": "MiB/s",
+            "data": [["save", size_in_mb / save_timer.duration()],
+                     ["load", size_in_mb / load_timer.duration()]]})
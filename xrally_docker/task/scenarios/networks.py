@@ -12,6 +12,15 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
+import time
+
+from rally.common import utils as rutils
+from rally import exceptions
+from rally.task import atomic
+from rally.task import types
+import six
+
 from xrally_docker.task import scenario
 from xrally_docker.task import validators
 
@@ -91,3 +100,213 @@ class CreateAndDeleteNetwork(scenario.BaseDockerScenario):
             ingress=ingress)
 
         self.client.delete_network(network["Id"])
+
+
+@validators.add("number", param_name="containers_count", minval=1,
+                integer_only=True, nullable=True)
+@types.convert(image_name={"type": "docker_image@docker"})
+@scenario.configure(
+    "Docker.connect_and_disconnect_containers",
+    context={"images@docker": {"existing": True},
+             "cleanup@docker": ["container", "network"]})
+class ConnectAndDisconnectContainers(scenario.BaseDockerScenario):
+
+    def run(self, image_name, containers_count=10, concurrency=None,
+            command="sleep 3600", driver=None):
+        """Connect several containers to a network and disconnect them.
+
+        Containers are connected and disconnected simultaneously, so the
+        scenario measures the cost of endpoint creation (veth, iptables
+        rules, etc) for a growing number of endpoints per network.
+
+        :param image_name: The name of image to start containers from
+        :param containers_count: The number of containers to connect
+        :param concurrency: The number of simultaneous connect/disconnect
+            requests. Defaults to the number of containers.
+        :param command: A long-living command to launch in containers
+        :param driver: Name of the driver used to create the network
+        """
+        image_name = self._ensure_image(image_name)
+        network = self.client.create_network(driver=driver)
+
+        containers = []
+        for i in range(containers_count):
+            containers.append(self.client.run_container(
+                image_name=image_name, command=command, detach=True,
+                remove=False).id)
+
+        connected = self.client.connect_containers_to_network(
+            network["Id"], container_ids=containers, concurrency=concurrency)
+        disconnected = self.client.disconnect_containers_from_network(
+            network["Id"], container_ids=containers, concurrency=concurrency)
+
+        for container in containers:
+            self.client.delete_container(container)
+        self.client.delete_network(network["Id"])
+
+        for title, durations in (("Connect", connected),
+                                 ("Disconnect", disconnected)):
+            durations = [d for c_id, d in durations]
+            self.add_output(additive={
+                "title": "%s latency per endpoint" % title,
+                "description": "Average and maximum latency of a single "
+                               "request.",
+                "chart_plugin": "Lines",
+                "label": "seconds",
+                "data": [["avg", sum(durations) / len(durations)],
+                         ["max", max(durations)]]})
+            self.add_output(complete={
+                "title": "%s latency by the number of endpoints" % title,
+                "description": "Latency of requests in order of completion.",
+                "chart_plugin": "Lines",
+                "axis_label": "Number of endpoints",
+                "label": "seconds",
+                "data": [[title.lower(),
+                          [[i + 1, d] for i, d in enumerate(durations)]]]})
+
+
+@validators.add("required_contexts", contexts=("networks@docker",))
+@validators.add("enum", param_name="protocol", values=["tcp", "udp"],
+                missed=True)
+@validators.add("number", param_name="clients_count", minval=1,
+                integer_only=True, nullable=True)
+@validators.add("number", param_name="duration", minval=1,
+                integer_only=True, nullable=True)
+@types.convert(image_name={"type": "docker_image@docker"})
+@scenario.configure(
+    "Docker.network_throughput",
+    context={"images@docker": {"existing": True},
+             "cleanup@docker": ["container"]})
+class NetworkThroughput(scenario.BaseDockerScenario):
+
+    BASE_PORT = 5201
+
+    def _start_server(self, image_name, network, clients_count, timeout):
+        # iperf3 server handles one client at a time, so a server per client
+        #   is started
+        script = " & ".join(
+            "iperf3 -s -p %s" % (self.BASE_PORT + i)
+            for i in range(clients_count)) + " & wait"
+        server = self.client.run_container(
+            image_name=image_name, command=["-c", script], entrypoint="sh",
+            detach=True, remove=False, network=network["Name"])
+        with atomic.ActionTimer(self, "wait_for_iperf3_servers"):
+            started_at = time.time()
+            while True:
+                logs = self.client.get_container_logs(server.id)
+                if isinstance(logs, six.binary_type):
+                    logs = logs.decode("utf-8")
+                if logs.count("Server listening") >= clients_count:
+                    break
+                if time.time() - started_at > timeout:
+                    self.client.delete_container(server.id)
+                    raise exceptions.TimeoutException(
+                        timeout=timeout, resource_type="container",
+                        resource_name="iperf3 server",
+                        resource_id=server.id, desired_status="listening",
+                        resource_status="starting")
+                rutils.interruptable_sleep(0.5)
+        return server
+
+    @staticmethod
+    def _parse_iperf3_output(output, protocol):
+        if isinstance(output, six.binary_type):
+            output = output.decode("utf-8")
+        result = json.loads(output)
+        if "error" in result:
+            raise exceptions.RallyException(
+                "iperf3 client failed: %s" % result["error"])
+        end = result["end"]
+        if protocol == "udp":
+            return {"bps": end["sum"]["bits_per_second"],
+                    "jitter": end["sum"]["jitter_ms"],
+                    "lost": end["sum"]["lost_percent"]}
+        # RTT of TCP connections is reported in microseconds by Linux
+        #   senders only
+        rtts = [st["sender"]["mean_rtt"] for st in end["streams"]
+                if "mean_rtt" in st.get("sender", {})]
+        return {"bps": end["sum_received"]["bits_per_second"],
+                "rtt": sum(rtts) / 1000.0 / len(rtts) if rtts else None}
+
+    def run(self, image_name, protocol="tcp", clients_count=1, duration=10,
+            bandwidth=None, server_timeout=60):
+        """Measure throughput and latency between containers.
+
+        A server container and ``clients_count`` client containers are
+        started at each network created by networks@docker context, so
+        networks with different drivers, options and IPAM configurations
+        (as described by the context) can be compared in one workload.
+        Clients are run simultaneously.
+
+        :param image_name: The name of image with iperf3 and sh installed
+        :param protocol: ``tcp`` or ``udp``
+        :param clients_count: A number of simultaneous clients
+        :param duration: Time to transmit for, in seconds
+        :param bandwidth: Target bandwidth of each client (e.g. '1G'). iperf3
+            uses 1 Mbit/s for UDP by default.
+        :param server_timeout: Time to wait for the server to start
+        """
+        image_name = self._ensure_image(image_name)
+
+        throughput, rtt, jitter, lost = [], [], [], []
+        for network in self.context["docker"]["networks"]:
+            label = "%s (%s)" % (network["Name"], network["Driver"])
+            server = self._start_server(image_name, network, clients_count,
+                                        timeout=server_timeout)
+            try:
+                address = self.client.get_container(server.id)[
+                    "NetworkSettings"]["Networks"][network["Name"]][
+                    "IPAddress"]
+                commands = []
+                for i in range(clients_count):
+                    command = ["-c", address, "-p", str(self.BASE_PORT + i),
+                               "-t", str(duration), "-J"]
+                    if protocol == "udp":
+                        command.append("-u")
+                    if bandwidth:
+                        command.extend(["-b", bandwidth])
+                    commands.append(command)
+                outputs = self.client.run_containers(
+                    image_name, commands=commands, entrypoint="iperf3",
+                    network=network["Name"])
+            finally:
+                self.client.delete_container(server.id)
+
+            results = [self._parse_iperf3_output(o, protocol)
+                       for o in outputs]
+            throughput.append(
+                [label, sum(r["bps"] for r in results) / 1000000.0])
+            if protocol == "udp":
+                jitter.append(
+                    [label, sum(r["jitter"] for r in results) / len(results)])
+                lost.append(
+                    [label, sum(r["lost"] for r in results) / len(results)])
+            else:
+                rtts = [r["rtt"] for r in results if r["rtt"] is not None]
+                if rtts:
+                    rtt.append([label, sum(rtts) / len(rtts)])
+
+        self.add_output(additive={
+            "title": "Network throughput",
+            "description": "Total throughput of %s clients." % clients_count,
+            "chart_plugin": "Lines",
+            "label": "Mbit/s",
+            "data": throughput})
+        if rtt:
+            self.add_output(additive={
+                "title": "Round-trip time",
+                "description": "Average RTT of TCP connections.",
+                "chart_plugin": "Lines",
+                "label": "ms",
+                "data": rtt})
+        if protocol == "udp":
+            self.add_output(additive={
+                "title": "UDP jitter",
+                "chart_plugin": "Lines",
+                "label": "ms",
+                "data": jitter})
+            self.add_output(additive={
+                "title": "UDP packet loss",
+                "chart_plugin": "Lines",
+                "label": "%",
+                "data": lost})
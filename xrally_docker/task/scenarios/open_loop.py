@@ -0,0 +1,144 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from rally.task import types
+
+from xrally_docker.common import open_loop
+from xrally_docker.common import stats
+from xrally_docker.task import scenario
+from xrally_docker.task import validators
+
+
+PERCENTILES = (50, 95, 99)
+
+
+class OpenLoopScenario(scenario.BaseDockerScenario):
+    """Base class for scenarios issuing operations at a fixed rate."""
+
+    def _run_open_loop(self, operation, rate, requests_count,
+                       max_outstanding, **kwargs):
+        records = self.client.run_open_loop(
+            operation, rate=rate, requests_count=requests_count,
+            max_outstanding=max_outstanding, **kwargs)
+        summary = open_loop.summarize(records)
+
+        begin = records[0]["intended"]
+        duration = max(r["finished"] for r in records) - begin
+        completed = requests_count - len(summary["errors"])
+        self.add_output(additive={
+            "title": "Open-loop rate",
+            "description": "Target rate of %s operations and the achieved "
+                           "rate of successful ones." % operation,
+            "chart_plugin": "Lines",
+            "label": "operations/s",
+            "data": [["target", rate],
+                     ["achieved", completed / duration if duration else 0]]})
+        for title, key, description in (
+                ("Corrected latency", "corrected",
+                 "Latency from the intended start time of operations. It "
+                 "includes the time spent waiting behind slow operations."),
+                ("Service latency", "service",
+                 "Latency from the actual start time of operations."),
+                ("Schedule lag", "lag",
+                 "Delay of the actual start time of operations behind the "
+                 "intended one.")):
+            values = summary[key]
+            if not values:
+                continue
+            self.add_output(additive={
+                "title": title,
+                "description": description,
+                "chart_plugin": "Lines",
+                "label": "seconds",
+                "data": [["p%s" % p, stats.percentile(values, p)]
+                         for p in PERCENTILES] + [["max", values[-1]]]})
+        self.add_output(complete={
+            "title": "Intended vs actual start time",
+            "description": "Start time of operations since the beginning of "
+                           "the schedule.",
+            "chart_plugin": "Lines",
+            "axis_label": "Operation",
+            "label": "seconds",
+            "data": [[key, [[i + 1, r[key] - begin]
+                            for i, r in enumerate(records)]]
+                     for key in ("intended", "started")]})
+        self.add_output(additive={
+            "title": "Open-loop errors",
+            "chart_plugin": "Lines",
+            "data": [["errors", len(summary["errors"])]]})
+        if summary["errors"]:
+            raise summary["errors"][0]
+
+
+@validators.add("number", param_name="rate", minval=0.01)
+@validators.add("number", param_name="requests_count", minval=1,
+                integer_only=True)
+@validators.add("number", param_name="max_outstanding", minval=1,
+                integer_only=True, nullable=True)
+@scenario.configure(
+    "Docker.open_loop_create_and_delete_network",
+    context={"cleanup@docker": ["network"]})
+class OpenLoopCreateAndDeleteNetwork(OpenLoopScenario):
+
+    def run(self, rate, requests_count, max_outstanding=None, driver=None,
+            labels=None):
+        """Create and delete networks at a fixed rate.
+
+        Unlike runners of Rally, the rate does not drop when the daemon
+        slows down, so latency spikes are not hidden by the load generator.
+
+        :param rate: A target number of operations per second
+        :param requests_count: A number of operations per iteration
+        :param max_outstanding: A maximum number of simultaneous
+            operations. Defaults to the number of operations.
+        :param driver: Name of the driver used to create networks
+        :param labels: Map of labels to set on networks
+        """
+        self._run_open_loop("create_and_delete_network", rate=rate,
+                            requests_count=requests_count,
+                            max_outstanding=max_outstanding, driver=driver,
+                            labels=labels)
+
+
+@validators.add("number", param_name="rate", minval=0.01)
+@validators.add("number", param_name="requests_count", minval=1,
+                integer_only=True)
+@validators.add("number", param_name="max_outstanding", minval=1,
+                integer_only=True, nullable=True)
+@types.convert(image_name={"type": "docker_image@docker"})
+@scenario.configure(
+    "Docker.open_loop_run_container",
+    context={"images@docker": {"existing": True},
+             "cleanup@docker": ["container"]})
+class OpenLoopRunContainer(OpenLoopScenario):
+
+    def run(self, image_name, rate, requests_count, max_outstanding=None,
+            command=None):
+        """Run containers at a fixed rate till they finish.
+
+        Unlike runners of Rally, the rate does not drop when the daemon
+        slows down, so latency spikes are not hidden by the load generator.
+
+        :param image_name: The name of image to start containers from
+        :param rate: A target number of containers per second
+        :param requests_count: A number of containers per iteration
+        :param max_outstanding: A maximum number of simultaneously running
+            containers. Defaults to the number of containers.
+        :param command: The command to launch in containers
+        """
+        image_name = self._ensure_image(image_name)
+        self._run_open_loop("run_container", rate=rate,
+                            requests_count=requests_count,
+                            max_outstanding=max_outstanding,
+                            image_name=image_name, command=command)
@@ -0,0 +1,60 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from xrally_docker.task import scenario
+
+
+@scenario.configure("Docker.list_volumes")
+class ListVolumes(scenario.BaseDockerScenario):
+
+    def run(self, filters=None):
+        """List docker volumes.
+
+        :param filters: Filters to be processed on the volumes list
+        """
+        volumes = self.client.list_volumes(filters=filters)
+        if volumes:
+            self.add_output(
+                complete={
+                    "title": "Volumes",
+                    "description": "A list of available volumes.",
+                    "chart_plugin": "Table",
+                    "data": {
+                        "cols": ["Name", "Driver", "Mountpoint"],
+                        "rows": [[v["Name"], v["Driver"], v["Mountpoint"]]
+                                 for v in volumes]
+                    }
+                }
+            )
+        else:
+            self.add_output(complete={"title": "Volumes",
+                                      "chart_plugin": "TextArea",
+                                      "data": ["No volumes are available."]})
+
+
+@scenario.configure("Docker.create_and_delete_volume",
+                    context={"cleanup@docker": ["volume"]})
+class CreateAndDeleteVolume(scenario.BaseDockerScenario):
+
+    def run(self, driver=None, driver_opts=None, labels=None):
+        """Create and delete a volume.
+
+        :param driver: Name of the driver used to create the volume
+        :param driver_opts: Driver options as a key-value dictionary
+        :param labels: Map of labels to set on the volume
+        """
+        volume = self.client.create_volume(driver=driver,
+                                           driver_opts=driver_opts,
+                                           labels=labels)
+        self.client.delete_volume(volume["Name"])
@@ -0,0 +1,256 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""SLA criteria based on atomic actions of Docker scenarios."""
+
+import bisect
+
+from rally.task import sla
+
+from xrally_docker.common import stats
+
+
+CLEANUP_ACTION_PREFIX = "docker.delete_"
+
+
+def _walk(actions):
+    """Iterate over atomic actions including the nested ones."""
+    for action in actions:
+        yield action
+        for child in _walk(action.get("children", [])):
+            yield child
+
+
+def _duration(action):
+    return action["finished_at"] - action["started_at"]
+
+
+@sla.configure(name="max_atomic_percentile", platform="docker")
+class MaxAtomicPercentile(sla.SLA):
+    """Maximum percentile of durations of atomic actions in seconds.
+
+    Unlike *max_avg_duration_per_atomic*, tail latency is checked and atomic
+    actions nested into other ones are taken into account as well.
+    Iterations with errors are skipped.
+    """
+
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "properties": {
+            "percentile": {
+                "type": "number",
+                "description": "The percentile to check (95 by default).",
+                "minimum": 0,
+                "maximum": 100
+            },
+            "actions": {
+                "type": "object",
+                "description": "Maximum durations of atomic actions.",
+                "patternProperties": {
+                    ".*": {"type": "number",
+                           "description": "Maximum duration in seconds.",
+                           "minimum": 0}
+                },
+                "minProperties": 1,
+                "additionalProperties": False
+            }
+        },
+        "required": ["actions"],
+        "additionalProperties": False
+    }
+
+    def __init__(self, criterion_value):
+        super(MaxAtomicPercentile, self).__init__(criterion_value)
+        self.percentile = self.criterion_value.get("percentile", 95)
+        self.actions = self.criterion_value["actions"]
+        # sorted durations of each checked action
+        self.durations = dict((name, []) for name in self.actions)
+
+    def _get_value(self, name):
+        if not self.durations[name]:
+            return None
+        return stats.percentile(self.durations[name], self.percentile)
+
+    def _check(self):
+        self.success = all((self._get_value(name) or 0) <= max_duration
+                           for name, max_duration in self.actions.items())
+        return self.success
+
+    def add_iteration(self, iteration):
+        if not iteration.get("error"):
+            for action in _walk(iteration["atomic_actions"]):
+                if action["name"] in self.durations:
+                    bisect.insort(self.durations[action["name"]],
+                                  _duration(action))
+        return self._check()
+
+    def merge(self, other):
+        for name, durations in other.durations.items():
+            self.durations[name] = sorted(self.durations[name] + durations)
+        return self._check()
+
+    def details(self):
+        strs = []
+        for name, max_duration in sorted(self.actions.items()):
+            value = self._get_value(name)
+            value = "n/a" if value is None else "%.2fs" % value
+            strs.append("Action: '%s'. %s <= %.2fs"
+                        % (name, value, max_duration))
+        head = ("Percentile %s of durations of atomic actions:"
+                % self.percentile)
+        end = "Status: %s" % self.status()
+        return "\n".join([head] + strs + [end])
+
+
+@sla.configure(name="min_atomic_rate", platform="docker")
+class MinAtomicRate(sla.SLA):
+    """Minimum number of atomic actions finished per second.
+
+    The rate is a number of successful atomic actions divided by the time
+    between the start of the first one and the end of the last one, so the
+    time spent on failed actions lowers it. It shows the throughput of a
+    workload, e.g. how many containers per second are run by a churn
+    scenario.
+    """
+
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "properties": {
+            "min_iterations": {
+                "type": "integer",
+                "description": "A number of iterations to run before "
+                               "checking the rate (3 by default).",
+                "minimum": 1
+            },
+            "actions": {
+                "type": "object",
+                "description": "Minimum rates of atomic actions.",
+                "patternProperties": {
+                    ".*": {"type": "number",
+                           "description": "Minimum number of actions per "
+                                          "second.",
+                           "minimum": 0}
+                },
+                "minProperties": 1,
+                "additionalProperties": False
+            }
+        },
+        "required": ["actions"],
+        "additionalProperties": False
+    }
+
+    def __init__(self, criterion_value):
+        super(MinAtomicRate, self).__init__(criterion_value)
+        # NOTE: the rate of the first few iterations is not representative
+        self.min_iterations = self.criterion_value.get("min_iterations", 3)
+        self.actions = self.criterion_value["actions"]
+        self.iterations = 0
+        self.stats = dict((name, {"count": 0, "started": None,
+                                  "finished": None})
+                          for name in self.actions)
+
+    def _get_rate(self, name):
+        counters = self.stats[name]
+        if not counters["count"] or (
+                counters["finished"] <= counters["started"]):
+            return None
+        duration = counters["finished"] - counters["started"]
+        return counters["count"] / duration
+
+    def _check(self):
+        if self.iterations >= self.min_iterations:
+            self.success = all((self._get_rate(name) or 0) >= min_rate
+                               for name, min_rate in self.actions.items())
+        return self.success
+
+    @staticmethod
+    def _merge_stats(counters, other):
+        counters["count"] += other["count"]
+        for key, func in (("started", min), ("finished", max)):
+            values = [v for v in (counters[key], other[key])
+                      if v is not None]
+            if values:
+                counters[key] = func(values)
+
+    def add_iteration(self, iteration):
+        self.iterations += 1
+        for action in _walk(iteration["atomic_actions"]):
+            if action["name"] in self.stats:
+                self._merge_stats(
+                    self.stats[action["name"]],
+                    {"count": 0 if action.get("failed") else 1,
+                     "started": action["started_at"],
+                     "finished": action["finished_at"]})
+        return self._check()
+
+    def merge(self, other):
+        self.iterations += other.iterations
+        for name, counters in other.stats.items():
+            self._merge_stats(self.stats[name], counters)
+        return self._check()
+
+    def details(self):
+        strs = []
+        for name, min_rate in sorted(self.actions.items()):
+            rate = self._get_rate(name)
+            rate = "n/a" if rate is None else "%.2f" % rate
+            strs.append("Action: '%s'. %s >= %.2f per second"
+                        % (name, rate, min_rate))
+        head = "Rate of atomic actions:"
+        end = "Status: %s" % self.status()
+        if self.iterations < self.min_iterations:
+            end = ("Status: %s (less than %s iterations are finished)"
+                   % (self.status(), self.min_iterations))
+        return "\n".join([head] + strs + [end])
+
+
+@sla.configure(name="max_cleanup_duration", platform="docker")
+class MaxCleanupDuration(sla.SLA):
+    """Maximum time spent on deleting resources in one iteration in seconds.
+
+    Durations of all ``docker.delete_*`` atomic actions of an iteration
+    (containers, images, networks and volumes) are summed up. Iterations
+    with errors are skipped.
+    """
+
+    CONFIG_SCHEMA = {"type": "number", "minimum": 0.0}
+
+    def __init__(self, criterion_value):
+        super(MaxCleanupDuration, self).__init__(criterion_value)
+        self.max_duration = None
+
+    def _check(self):
+        self.success = (self.max_duration or 0) <= self.criterion_value
+        return self.success
+
+    def add_iteration(self, iteration):
+        if not iteration.get("error"):
+            duration = sum(
+                _duration(action)
+                for action in _walk(iteration["atomic_actions"])
+                if action["name"].startswith(CLEANUP_ACTION_PREFIX))
+            self.max_duration = max(self.max_duration or 0, duration)
+        return self._check()
+
+    def merge(self, other):
+        if other.max_duration is not None:
+            self.max_duration = max(self.max_duration or 0,
+                                    other.max_duration)
+        return self._check()
+
+    def details(self):
+        value = ("n/a" if self.max_duration is None
+                 else "%.2fs" % self.max_duration)
+        return ("Maximum cleanup duration of one iteration %s <= %.2fs - %s"
+                % (value, self.criterion_value, self.status()))
@@ -0,0 +1,75 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""SLA criteria based on samples of *daemon_monitor@docker* context."""
+
+from rally.task import sla
+
+from xrally_docker.common import daemon_stats
+
+
+@sla.configure(name="max_daemon_rss_growth", platform="docker")
+class MaxDaemonRSSGrowth(sla.SLA):
+    """Maximum growth of RSS of Docker daemon processes in MiB.
+
+    The growth is the difference between the peak RSS and the peak RSS
+    sampled during the first iteration. It requires
+    *daemon_monitor@docker* context, otherwise there is nothing to check.
+    """
+
+    CONFIG_SCHEMA = {"type": "number", "minimum": 0.0}
+
+    def __init__(self, criterion_value):
+        super(MaxDaemonRSSGrowth, self).__init__(criterion_value)
+        # process name -> {"first": (timestamp, rss), "max": rss}
+        self.processes = {}
+
+    def _get_growth(self):
+        return dict((name, stats["max"] - stats["first"][1])
+                    for name, stats in self.processes.items())
+
+    def _check(self):
+        self.success = all(growth <= self.criterion_value
+                           for growth in self._get_growth().values())
+        return self.success
+
+    def _add_stats(self, name, first, max_rss):
+        stats = self.processes.setdefault(name, {"first": first,
+                                                 "max": max_rss})
+        stats["first"] = min(stats["first"], first)
+        stats["max"] = max(stats["max"], max_rss)
+
+    def add_iteration(self, iteration):
+        for output in iteration["output"]["additive"]:
+            if output["title"] == daemon_stats.MEMORY_USAGE_TITLE:
+                for name, rss in output["data"]:
+                    self._add_stats(name, (iteration["timestamp"], rss), rss)
+        return self._check()
+
+    def merge(self, other):
+        for name, stats in other.processes.items():
+            self._add_stats(name, stats["first"], stats["max"])
+        return self._check()
+
+    def details(self):
+        growth = self._get_growth()
+        if not growth:
+            return ("RSS of Docker daemon processes is not sampled - %s"
+                    % self.status())
+        strs = ["Process '%s'. %.2f MiB <= %.2f MiB"
+                % (name, growth[name], self.criterion_value)
+                for name in sorted(growth)]
+        head = "Growth of RSS of Docker daemon processes:"
+        end = "Status: %s" % self.status()
+        return "\n".join([head] + strs + [end])
@@ -0,0 +1,49 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from rally.common import logging
+from rally.common.plugin import plugin
+from rally.task import types
+
+from xrally_docker import service
+from xrally_docker.task import scenario
+
+
+LOG = logging.getLogger(__name__)
+
+
+@plugin.configure(name="docker_image", platform="docker")
+class DockerImage(types.ResourceType):
+    """Pull the image required by the scenario before the load.
+
+    Images which are not loaded by images@docker context are pulled only if
+    ``pull_missing`` option of the context is enabled. Otherwise, they are
+    pulled by iterations, so the pull is a part of the first iterations.
+    """
+
+    def pre_process(self, resource_spec, config):
+        images_cfg = self._context["config"].get("images@docker", {})
+        if not images_cfg.get("pull_missing"):
+            return None
+        image_name = scenario.get_image_name(self._context, resource_spec)
+        if scenario.find_image(self._context, image_name):
+            return None
+
+        LOG.info("Pulling image %s before the load." % image_name)
+        # iterations may be run at any host of multi-host platform
+        spec = self._context["env"]["platforms"]["docker"]
+        for host_spec in spec.get("hosts") or [spec]:
+            image = service.Docker(host_spec).pull_image(image_name)
+        self._context["docker"]["images"].append(image)
+        return None